@@ -0,0 +1,3 @@
+"""
+Benchmarks for yapytools, run with: ``python -m benchmarks`` or ``invoke bench``.
+"""
@@ -0,0 +1,134 @@
+"""
+Runs the benchmarks and writes the results as JSON, so runs can be compared
+across versions.
+
+Example::
+
+    python -m benchmarks --output before.json
+    # ... make changes ...
+    python -m benchmarks --output after.json --compare before.json
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import time
+import timeit
+from typing import Dict, List
+
+import yapytools
+from benchmarks.cases import BENCHMARKS, Benchmark
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '-k', '--filter', default='*',
+        help='Only run benchmarks whose name matches this glob pattern.',
+    )
+    parser.add_argument(
+        '-s', '--sizes', default='100,10000,1000000', type=_int_list,
+        help='Comma-separated input sizes. Default: %(default)s',
+    )
+    parser.add_argument(
+        '-r', '--repeat', default=5, type=int,
+        help='Number of timing repetitions; the best is reported. Default: %(default)s',
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='Write the results to this JSON file.',
+    )
+    parser.add_argument(
+        '-c', '--compare',
+        help='Print the change in time relative to this previous JSON results file.',
+    )
+    args = parser.parse_args(argv)
+
+    benchmarks = [
+        benchmark for benchmark in BENCHMARKS
+        if fnmatch.fnmatch(benchmark.name, args.filter)
+    ]
+
+    previous = _load_results(args.compare) if args.compare else {}
+
+    results = []
+    for benchmark in benchmarks:
+        for result in run(benchmark, args.sizes, args.repeat):
+            results.append(result)
+            _print_result(result, previous.get(_result_key(result)))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(_report(results), file, indent=2)
+
+
+def run(benchmark: Benchmark, sizes: List[int], repeat: int) -> List[dict]:
+    """Times every implementation of the benchmark for each shape and size."""
+
+    results = []
+
+    for shape, setup in benchmark.shapes.items():
+        for size in sizes:
+            args = setup(size)
+
+            for implementation, function in benchmark.implementations.items():
+                timer = timeit.Timer(lambda: function(*args))
+                number, _ = timer.autorange()
+                times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+                results.append(dict(
+                    benchmark=benchmark.name,
+                    shape=shape,
+                    size=size,
+                    implementation=implementation,
+                    best_s=min(times),
+                    mean_s=sum(times) / len(times),
+                    number=number,
+                    repeat=repeat,
+                ))
+
+    return results
+
+
+def _report(results: List[dict]) -> dict:
+    return dict(
+        yapytools_version=yapytools.__version__,
+        python_version=platform.python_version(),
+        python_implementation=platform.python_implementation(),
+        platform=platform.platform(),
+        timestamp=time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        results=results,
+    )
+
+
+def _load_results(path: str) -> Dict[tuple, dict]:
+    with open(path) as file:
+        report = json.load(file)
+
+    return {_result_key(result): result for result in report['results']}
+
+
+def _result_key(result: dict) -> tuple:
+    return result['benchmark'], result['shape'], result['size'], result['implementation']
+
+
+def _print_result(result: dict, previous: dict = None) -> None:
+    line = (
+        f'{result["benchmark"]:<24} {result["shape"]:<10} {result["size"]:>9} '
+        f'{result["implementation"]:<14} {result["best_s"] * 1e6:>14.2f} us'
+    )
+
+    if previous is not None:
+        change = result['best_s'] / previous['best_s'] - 1
+        line += f' {change:>+8.1%}'
+
+    print(line, flush=True)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(it) for it in value.split(',')]
+
+
+if __name__ == '__main__':
+    main()
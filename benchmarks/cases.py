@@ -0,0 +1,463 @@
+"""
+Benchmark cases for each yapytools function and :class:`yapytools.Stream`
+operation, each compared against a plain stdlib/itertools equivalent.
+"""
+
+import itertools
+import operator
+import random
+from collections import Counter, deque
+from typing import Callable, Dict, List, NamedTuple
+
+import yapytools as yt
+from yapytools.aggregators import Sum
+from yapytools.predicates import is_even, is_not_none
+
+
+class Benchmark(NamedTuple):
+    name: str
+    """Name of the function or operation being benchmarked."""
+
+    shapes: Dict[str, Callable[[int], tuple]]
+    """Input shape names mapped to a function returning the args for a size."""
+
+    implementations: Dict[str, Callable]
+    """
+    Implementation names mapped to a function taking the args. The
+    ``'yapytools'`` implementation is the one under test; the others are
+    baselines.
+    """
+
+
+def consume(iterable) -> None:
+    """Exhausts the iterable as fast as possible."""
+    deque(iterable, maxlen=0)
+
+
+def _ints(size: int) -> tuple:
+    return list(range(size)),
+
+
+def _random_ints(size: int, distinct: int) -> List[int]:
+    rng = random.Random(0)
+    return [rng.randrange(distinct) for _ in range(size)]
+
+
+def _with_nones(size: int) -> tuple:
+    return [None if i % 3 == 0 else i for i in range(size)],
+
+
+def _zeros(size: int) -> tuple:
+    return [0] * size,
+
+
+def _few_keys(size: int) -> tuple:
+    return _random_ints(size, 10),
+
+
+def _many_keys(size: int) -> tuple:
+    return _random_ints(size, max(1, size // 2)),
+
+
+def _nested(size: int) -> tuple:
+    return [list(range(10))] * (size // 10),
+
+
+def _grid_2d(size: int) -> tuple:
+    side = max(1, int(size ** 0.5))
+    return (side, side),
+
+
+def _grid_4d(size: int) -> tuple:
+    side = max(1, int(size ** 0.25))
+    return (side, side, side, side),
+
+
+def _plus_one(it):
+    return it + 1
+
+
+def _is_big(it):
+    return it > 100
+
+
+def _is_even_baseline(it):
+    return it % 2 == 0
+
+
+def _group_by_baseline(values):
+    result = {}
+    for value in values:
+        result.setdefault(value % 7, []).append(value)
+    return result
+
+
+def _unique_baseline(values):
+    seen = set()
+    return [it for it in values if not (it in seen or seen.add(it))]
+
+
+def _find_last_baseline(values):
+    return next((it for it in reversed(values) if it < 0), None)
+
+
+def _stream_chain(values, stages: int):
+    stream = yt.Stream(values)
+    for _ in range(stages):
+        stream = stream.map(_plus_one).filter(is_not_none)
+    return stream.to_list()
+
+
+def _builtin_chain(values, stages: int):
+    iterable = values
+    for _ in range(stages):
+        iterable = filter(is_not_none, map(_plus_one, iterable))
+    return list(iterable)
+
+
+def _sum_by_baseline(values):
+    result = Counter()
+    for value in values:
+        result[value % 7] += value
+    return result
+
+
+BENCHMARKS = [
+    Benchmark(
+        'associate',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.associate(values, lambda it: (it, -it)),
+            'dict': lambda values: dict((it, -it) for it in values),
+        },
+    ),
+    Benchmark(
+        'associate_by',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.associate_by(values, str),
+            'dict': lambda values: {str(it): it for it in values},
+        },
+    ),
+    Benchmark(
+        'associate_with',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.associate_with(values, str),
+            'dict': lambda values: {it: str(it) for it in values},
+        },
+    ),
+    Benchmark(
+        'count',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.count(values, is_even),
+            'sum': lambda values: sum(map(is_even, values)),
+        },
+    ),
+    Benchmark(
+        'filter_not_none',
+        {'with_nones': _with_nones},
+        {
+            'yapytools': lambda values: consume(yt.filter_not_none(values)),
+            'filter': lambda values: consume(it for it in values if it is not None),
+        },
+    ),
+    Benchmark(
+        'filters',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: consume(yt.filters(values, is_even, _is_big, is_not_none)),
+            'filter': lambda values: consume(filter(is_not_none, filter(_is_big, filter(is_even, values)))),
+        },
+    ),
+    Benchmark(
+        'find',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.find(values, lambda it: it < 0),
+            'next': lambda values: next((it for it in values if it < 0), None),
+        },
+    ),
+    Benchmark(
+        'find_last',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.find_last(values, lambda it: it < 0),
+            'reversed': _find_last_baseline,
+        },
+    ),
+    Benchmark(
+        'find_last_iterator',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.find_last(iter(values), lambda it: it < 0),
+            'list_reversed': lambda values: _find_last_baseline(list(iter(values))),
+        },
+    ),
+    Benchmark(
+        'flatten',
+        {'nested': _nested},
+        {
+            'yapytools': lambda values: consume(yt.flatten(values)),
+            'chain': lambda values: consume(itertools.chain.from_iterable(values)),
+        },
+    ),
+    Benchmark(
+        'group_by',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: yt.group_by(values, lambda it: it % 7),
+            'setdefault': _group_by_baseline,
+        },
+    ),
+    Benchmark(
+        'group_by_to',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: yt.group_by_to(values, lambda it: it % 7, operator.neg),
+            'setdefault': _group_by_baseline,
+        },
+    ),
+    Benchmark(
+        'external_group_by',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: consume(yt.external_group_by(values, lambda it: it % 7)),
+            'setdefault': _group_by_baseline,
+        },
+    ),
+    Benchmark(
+        'aggregate_by',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: yt.aggregate_by(values, lambda it: it % 7, Sum()),
+            'counter': _sum_by_baseline,
+        },
+    ),
+    Benchmark(
+        'maps',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: consume(yt.maps(values, _plus_one, _plus_one, str)),
+            'map': lambda values: consume(map(str, map(_plus_one, map(_plus_one, values)))),
+        },
+    ),
+    Benchmark(
+        'pipe',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: consume(map(yt.pipe(_plus_one, _plus_one, str), values)),
+            'lambda': lambda values: consume(map(lambda it: str(_plus_one(_plus_one(it))), values)),
+        },
+    ),
+    Benchmark(
+        'pipe_compiled',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: consume(map(yt.pipe(_plus_one, _plus_one, str, compile=True), values)),
+            'lambda': lambda values: consume(map(lambda it: str(_plus_one(_plus_one(it))), values)),
+        },
+    ),
+    Benchmark(
+        'predicates',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: consume(filter(is_even, values)),
+            'function': lambda values: consume(filter(_is_even_baseline, values)),
+        },
+    ),
+    Benchmark(
+        'ranges',
+        {'2d': _grid_2d, '4d': _grid_4d},
+        {
+            'yapytools': lambda stops: consume(yt.ranges(*stops)),
+            'product': lambda stops: consume(itertools.product(*map(range, stops))),
+        },
+    ),
+    Benchmark(
+        'ranges_slice',
+        {'2d': _grid_2d, '4d': _grid_4d},
+        {
+            'yapytools': lambda stops: consume(yt.ranges(*stops)[1:]),
+            'islice': lambda stops: consume(itertools.islice(itertools.product(*map(range, stops)), 1, None)),
+        },
+    ),
+    Benchmark(
+        'unique',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: consume(yt.unique(values)),
+            'set': _unique_baseline,
+            'dict.fromkeys': lambda values: consume(dict.fromkeys(values)),
+        },
+    ),
+    Benchmark(
+        'unique_bloom',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: consume(yt.unique(values, strategy='bloom', max_size=len(values))),
+            'set': _unique_baseline,
+        },
+    ),
+    Benchmark(
+        'Stream.map_filter_2',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: _stream_chain(values, 1),
+            'builtins': lambda values: _builtin_chain(values, 1),
+        },
+    ),
+    Benchmark(
+        'Stream.map_filter_10',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: _stream_chain(values, 5),
+            'builtins': lambda values: _builtin_chain(values, 5),
+        },
+    ),
+    Benchmark(
+        'Stream.accumulate',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.Stream(values).accumulate().to_list(),
+            'itertools': lambda values: list(itertools.accumulate(values)),
+        },
+    ),
+    Benchmark(
+        'Stream.any',
+        {'zeros': _zeros},
+        {
+            'yapytools': lambda values: yt.Stream(values).any(),
+            'any': any,
+        },
+    ),
+    Benchmark(
+        'Stream.count',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.Stream(values).count(),
+            'len': lambda values: len(list(values)),
+        },
+    ),
+    Benchmark(
+        'Stream.enumerate',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.Stream(values).enumerate().to_list(),
+            'enumerate': lambda values: list(enumerate(values)),
+        },
+    ),
+    Benchmark(
+        'Stream.filter_not_none',
+        {'with_nones': _with_nones},
+        {
+            'yapytools': lambda values: yt.Stream(values).filter_not_none().to_list(),
+            'comprehension': lambda values: [it for it in values if it is not None],
+        },
+    ),
+    Benchmark(
+        'Stream.first',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.Stream(values).map(_plus_one).first(),
+            'next': lambda values: next(map(_plus_one, values), None),
+        },
+    ),
+    Benchmark(
+        'Stream.flatten',
+        {'nested': _nested},
+        {
+            'yapytools': lambda values: yt.Stream(values).flatten().to_list(),
+            'chain': lambda values: list(itertools.chain.from_iterable(values)),
+        },
+    ),
+    Benchmark(
+        'Stream.last',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.Stream(values).map(_plus_one).last(),
+            'deque': lambda values: deque(map(_plus_one, values), maxlen=1).pop(),
+        },
+    ),
+    Benchmark(
+        'Stream.max',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: yt.Stream(values).max(),
+            'max': max,
+        },
+    ),
+    Benchmark(
+        'Stream.min',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: yt.Stream(values).min(),
+            'min': min,
+        },
+    ),
+    Benchmark(
+        'Stream.reduce',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.Stream(values).reduce(),
+            'sum': sum,
+        },
+    ),
+    Benchmark(
+        'Stream.reversed',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.Stream(values).reversed().to_list(),
+            'reversed': lambda values: list(reversed(values)),
+        },
+    ),
+    Benchmark(
+        'Stream.sorted',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: yt.Stream(values).sorted().to_list(),
+            'sorted': sorted,
+        },
+    ),
+    Benchmark(
+        'Stream.sum',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.Stream(values).sum(),
+            'sum': sum,
+        },
+    ),
+    Benchmark(
+        'Stream.to_set',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: yt.Stream(values).to_set(),
+            'set': set,
+        },
+    ),
+    Benchmark(
+        'Stream.to_tuple',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.Stream(values).to_tuple(),
+            'tuple': tuple,
+        },
+    ),
+    Benchmark(
+        'Stream.unique',
+        {'few_keys': _few_keys, 'many_keys': _many_keys},
+        {
+            'yapytools': lambda values: yt.Stream(values).unique().to_list(),
+            'dict.fromkeys': lambda values: list(dict.fromkeys(values)),
+        },
+    ),
+    Benchmark(
+        'Stream.zip',
+        {'ints': _ints},
+        {
+            'yapytools': lambda values: yt.Stream(values).zip(values).to_list(),
+            'zip': lambda values: list(zip(values, values)),
+        },
+    ),
+]
@@ -0,0 +1,177 @@
+"""
+Incremental aggregators for use with :func:`yapytools.aggregate_by`.
+
+An aggregator folds values into a small state one at a time, so computing
+e.g. a per-key sum only keeps one number per key in memory rather than a
+list of every value.
+"""
+
+import operator
+from abc import ABC, abstractmethod
+from typing import Callable, Generic, List, TypeVar
+
+T = TypeVar('T')
+S = TypeVar('S')
+R = TypeVar('R')
+
+
+class Aggregator(ABC, Generic[T, S, R]):
+    """
+    Base class for aggregators. Subclasses implement :meth:`start` and
+    :meth:`add`, and optionally :meth:`merge` and :meth:`result`.
+    """
+
+    @abstractmethod
+    def start(self, value: T) -> S:
+        """Returns the state after seeing the first value."""
+
+    @abstractmethod
+    def add(self, state: S, value: T) -> S:
+        """Returns the state after seeing another value."""
+
+    def merge(self, state: S, other: S) -> S:
+        """
+        Returns the state combining two partial states, e.g. computed by
+        different workers over different parts of the input.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support merging.')
+
+    def result(self, state: S) -> R:
+        """Returns the final result for the given state."""
+        return state
+
+
+class Count(Aggregator[T, int, int]):
+    """Counts the values."""
+
+    def start(self, value: T) -> int:
+        return 1
+
+    def add(self, state: int, value: T) -> int:
+        return state + 1
+
+    def merge(self, state: int, other: int) -> int:
+        return state + other
+
+
+class Sum(Aggregator[T, T, T]):
+    """Sums the values."""
+
+    def start(self, value: T) -> T:
+        return value
+
+    def add(self, state: T, value: T) -> T:
+        return state + value
+
+    def merge(self, state: T, other: T) -> T:
+        return state + other
+
+
+class Min(Aggregator[T, T, T]):
+    """Keeps the smallest value."""
+
+    def start(self, value: T) -> T:
+        return value
+
+    def add(self, state: T, value: T) -> T:
+        return value if value < state else state
+
+    def merge(self, state: T, other: T) -> T:
+        return other if other < state else state
+
+
+class Max(Aggregator[T, T, T]):
+    """Keeps the largest value."""
+
+    def start(self, value: T) -> T:
+        return value
+
+    def add(self, state: T, value: T) -> T:
+        return value if value > state else state
+
+    def merge(self, state: T, other: T) -> T:
+        return other if other > state else state
+
+
+class Mean(Aggregator[T, List, float]):
+    """Computes the arithmetic mean of the values."""
+
+    def start(self, value: T) -> List:
+        return [value, 1]
+
+    def add(self, state: List, value: T) -> List:
+        state[0] += value
+        state[1] += 1
+        return state
+
+    def merge(self, state: List, other: List) -> List:
+        return [state[0] + other[0], state[1] + other[1]]
+
+    def result(self, state: List) -> float:
+        return state[0] / state[1]
+
+
+class First(Aggregator[T, T, T]):
+    """Keeps the first value."""
+
+    def start(self, value: T) -> T:
+        return value
+
+    def add(self, state: T, value: T) -> T:
+        return state
+
+    def merge(self, state: T, other: T) -> T:
+        return state
+
+
+class Last(Aggregator[T, T, T]):
+    """Keeps the last value."""
+
+    def start(self, value: T) -> T:
+        return value
+
+    def add(self, state: T, value: T) -> T:
+        return value
+
+    def merge(self, state: T, other: T) -> T:
+        return other
+
+
+class Fold(Aggregator[T, S, S]):
+    """
+    Folds the values with a user-defined ``function(state, value)``, starting
+    from ``initial``. If a ``combine(state, other)`` function is given, partial
+    states can also be merged.
+
+    ``initial`` is shared between all groups, so ``function`` should return a
+    new state rather than mutate it.
+
+    Example:
+        >>> longest = Fold(lambda state, it: max(state, len(it)), initial=0)
+    """
+
+    function: Callable[[S, T], S]
+    initial: S
+    combine: Callable[[S, S], S]
+
+    def __init__(
+            self,
+            function: Callable[[S, T], S] = operator.add,
+            initial: S = 0,
+            combine: Callable[[S, S], S] = None,
+    ):
+        self.function = function
+        self.initial = initial
+        self.combine = combine
+
+    def start(self, value: T) -> S:
+        return self.function(self.initial, value)
+
+    def add(self, state: S, value: T) -> S:
+        return self.function(state, value)
+
+    def merge(self, state: S, other: S) -> S:
+        if self.combine is None:
+            return super().merge(state, other)
+
+        return self.combine(state, other)
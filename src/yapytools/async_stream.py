@@ -0,0 +1,296 @@
+"""
+An asyncio counterpart to :class:`yapytools.Stream` that wraps async
+iterables.
+"""
+
+import asyncio
+import inspect
+import operator
+from collections import deque
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from yapytools.caching import Cache, memoize
+from yapytools.yapytools import _new_unique_predicate
+
+T = TypeVar('T')
+K = TypeVar('K')
+V = TypeVar('V')
+
+AnyIterable = Union[AsyncIterable[T], Iterable[T]]
+
+
+class AsyncStream(AsyncIterable):
+    """
+    Allows applying filtering, mapping, and accumulation functions to an
+    async iterable in a convenient way. Mirrors the :class:`yapytools.Stream`
+    API, but terminal operations are coroutines.
+
+    Functions passed to :meth:`map` and :meth:`filter` may be either plain or
+    async functions. Use :meth:`map_concurrent` to run several awaitables at
+    once.
+
+    Example:
+        >>> async def fetch(it):
+        >>>     await asyncio.sleep(0.1)
+        >>>     return it * 10
+        >>>
+        >>> result = await (
+        >>>     AsyncStream(range(10))
+        >>>     .filter(lambda it: it > 4)
+        >>>     .map_concurrent(fetch, limit=5)
+        >>>     .map(str)
+        >>>     .to_list()
+        >>> )
+        >>> print(result)
+        ['50', '60', '70', '80', '90']
+    """
+
+    iterable: AsyncIterable[T]
+
+    def __init__(self, iterable: AnyIterable[T]):
+        self.iterable = _to_async_iterable(iterable)
+
+    @classmethod
+    def of(cls, *items) -> 'AsyncStream':
+        """Returns an `AsyncStream` of the args passed to this function."""
+        return AsyncStream(items)
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self.iterable.__aiter__()
+
+    def filter(self, function: Callable[[T], Union[bool, Awaitable[bool]]]) -> 'AsyncStream':
+        """
+        Returns an :class:`AsyncStream` with the given filter applied to the
+        items.
+        """
+        return AsyncStream(_filter(function, self))
+
+    def flatten(self) -> 'AsyncStream':
+        """
+        Returns an :class:`AsyncStream` of all items from each iterable or async
+        iterable in the stream.
+        """
+        return AsyncStream(_flatten(self))
+
+    def map(self, function: Callable[[T], Union[V, Awaitable[V]]]) -> 'AsyncStream':
+        """
+        Returns an :class:`AsyncStream` with the given mapping applied to each
+        item. Awaitable results are awaited one at a time.
+        """
+        return AsyncStream(_map(function, self))
+
+    def map_cached(
+            self,
+            function: Callable[[T], Union[V, Awaitable[V]]],
+            cache: Cache = None,
+            key: Callable[[T], K] = None,
+    ) -> 'AsyncStream':
+        """
+        Like :meth:`map`, but caches the results by item, or by ``key(item)``
+        if given. See :meth:`yapytools.Stream.map_cached`.
+
+        To deduplicate concurrent calls for the same key, memoize the function
+        passed to :meth:`map_concurrent` with :func:`yapytools.caching.memoize`
+        instead.
+        """
+        return self.map(memoize(function, cache, key))
+
+    def map_concurrent(
+            self,
+            function: Callable[[T], Awaitable[V]],
+            limit: int = 10,
+            ordered: bool = True,
+    ) -> 'AsyncStream':
+        """
+        Returns an :class:`AsyncStream` with the given async function applied
+        to each item, with at most ``limit`` calls running concurrently.
+
+        If ``ordered`` is ``False``, results are yielded as soon as they are
+        ready instead of in input order.
+        """
+
+        if limit < 1:
+            raise ValueError(f'limit must be >= 1; got {limit}.')
+
+        return AsyncStream(_map_concurrent(function, self, limit, ordered))
+
+    def unique(
+            self,
+            key: Callable[[T], K] = None,
+            strategy: str = 'exact',
+            max_size: int = None,
+            error_rate: float = 0.01,
+    ) -> 'AsyncStream':
+        """
+        Returns an :class:`AsyncStream` of only the unique items in the stream,
+        in the order in which they occur. See :func:`yapytools.unique`.
+        """
+
+        is_unique = _new_unique_predicate(key, strategy, max_size, error_rate)
+        return self.filter(is_unique)
+
+    async def any(self) -> bool:
+        async for item in self:
+            if item:
+                return True
+
+        return False
+
+    async def count(self) -> int:
+        """Returns the number of items in the stream."""
+
+        result = 0
+        async for _ in self:
+            result += 1
+
+        return result
+
+    async def reduce(
+            self,
+            function: Callable[[T, T], T] = operator.add,
+            initial: T = None,
+            default: T = None,
+    ) -> Optional[T]:
+        """
+        Returns the result of cumulatively applying ``function`` to the items,
+        or ``default`` if there are no items and no ``initial`` value.
+        See :meth:`yapytools.Stream.reduce`.
+        """
+
+        iterator = self.__aiter__()
+
+        if initial is None:
+            try:
+                result = await iterator.__anext__()
+            except StopAsyncIteration:
+                return default
+        else:
+            result = initial
+
+        async for item in iterator:
+            result = function(result, item)
+
+        return result
+
+    async def to_list(self) -> List[T]:
+        """Returns a list of items in the stream."""
+        return [item async for item in self]
+
+    async def to_set(self) -> Set[T]:
+        """Returns a set of items in the stream."""
+        return {item async for item in self}
+
+    async def to_tuple(self) -> Tuple[T]:
+        """Returns a tuple of items in the stream."""
+        return tuple(await self.to_list())
+
+    async def first(self, default: T = None) -> Optional[T]:
+        """Returns the first item in the stream."""
+
+        async for item in self:
+            return item
+
+        return default
+
+    async def last(self, default: T = None) -> Optional[T]:
+        """Returns the last item in the stream."""
+
+        last = default
+        async for item in self:
+            last = item
+
+        return last
+
+
+def _to_async_iterable(iterable: AnyIterable[T]) -> AsyncIterable[T]:
+    if hasattr(iterable, '__aiter__'):
+        return iterable
+
+    return _from_iterable(iterable)
+
+
+async def _from_iterable(iterable: Iterable[T]) -> AsyncIterator[T]:
+    for item in iterable:
+        yield item
+
+
+async def _filter(function: Callable, iterable: AsyncIterable[T]) -> AsyncIterator[T]:
+    async for item in iterable:
+        keep = function(item)
+        if inspect.isawaitable(keep):
+            keep = await keep
+
+        if keep:
+            yield item
+
+
+async def _flatten(iterable: AsyncIterable[AnyIterable[T]]) -> AsyncIterator[T]:
+    async for items in iterable:
+        if hasattr(items, '__aiter__'):
+            async for item in items:
+                yield item
+        else:
+            for item in items:
+                yield item
+
+
+async def _map(function: Callable, iterable: AsyncIterable[T]) -> AsyncIterator:
+    async for item in iterable:
+        result = function(item)
+        if inspect.isawaitable(result):
+            result = await result
+
+        yield result
+
+
+async def _map_concurrent(
+        function: Callable[[T], Awaitable[V]],
+        iterable: AsyncIterable[T],
+        limit: int,
+        ordered: bool,
+) -> AsyncIterator[V]:
+    pending = deque()
+    try:
+        async for item in iterable:
+            pending.append(asyncio.ensure_future(function(item)))
+
+            if len(pending) >= limit:
+                if ordered:
+                    yield await pending.popleft()
+                else:
+                    for result in await _wait_first(pending):
+                        yield result
+
+        while pending:
+            if ordered:
+                yield await pending.popleft()
+            else:
+                for result in await _wait_first(pending):
+                    yield result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _wait_first(pending: deque) -> list:
+    """Waits for at least one task to complete, and removes all done tasks."""
+
+    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+    for task in done:
+        pending.remove(task)
+
+    return [task.result() for task in done]
+
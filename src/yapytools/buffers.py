@@ -0,0 +1,322 @@
+"""
+Buffering for one-shot iterables, so they can be consumed more than once or
+in reverse. See :meth:`yapytools.Stream.cache`, :meth:`yapytools.Stream.tee`
+and :meth:`yapytools.Stream.reversed`.
+"""
+
+import pickle
+import tempfile
+from array import array
+from collections import deque
+from collections.abc import Sequence
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+CACHE_POLICIES = ('memory', 'disk')
+
+
+class CachedIterable(Iterable[T]):
+    """
+    Wraps a one-shot iterable so it can be iterated any number of times.
+
+    Items are read from the source lazily, the first time any iterator needs
+    them, and cached for later iterators. Several iterators may be in
+    progress at once.
+
+    With ``policy='memory'``, items are cached in a list. If ``max_items`` is
+    given, only the first ``max_items`` items are kept in memory, and the rest
+    are pickled to a temporary file. ``policy='disk'`` caches every item in
+    the temporary file.
+
+    Example:
+        >>> squares = CachedIterable(it * it for it in range(4))
+        >>> print(sum(squares), list(squares))
+        14 [0, 1, 4, 9]
+    """
+
+    policy: str
+    max_items: Optional[int]
+    """Maximum number of items cached in memory, or ``None`` if unlimited."""
+
+    def __init__(self, iterable: Iterable[T], policy: str = 'memory', max_items: int = None):
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f'policy must be one of {CACHE_POLICIES}; got {policy!r}.')
+        if max_items is not None and max_items < 0:
+            raise ValueError(f'max_items must be >= 0; got {max_items}.')
+
+        self.policy = policy
+        self.max_items = 0 if policy == 'disk' else max_items
+        self._source = iter(iterable)
+        self._done = False
+        self._items: List[T] = []
+        self._file = None
+        self._offsets = array('q')
+
+    def __iter__(self) -> Iterator[T]:
+        if self._done and self._file is None:
+            return iter(self._items)
+
+        return self._iter()
+
+    def __len__(self) -> int:
+        """Returns the number of items cached so far."""
+        return len(self._items) + len(self._offsets)
+
+    def close(self) -> None:
+        """Deletes the temporary file, if any. The cache can not be used after."""
+
+        if self._file is not None:
+            self._file.close()
+
+    def _iter(self) -> Iterator[T]:
+        index = 0
+        while True:
+            if index < len(self):
+                yield self._get(index)
+            elif self._done:
+                return
+            else:
+                item = next(self._source, _END)
+                if item is _END:
+                    self._done = True
+                    return
+
+                self._append(item)
+                yield item
+
+            index += 1
+
+    def _append(self, item: T) -> None:
+        if self.max_items is None or len(self._items) < self.max_items:
+            self._items.append(item)
+            return
+
+        if self._file is None:
+            self._file = tempfile.TemporaryFile()
+
+        self._offsets.append(spill(self._file, item))
+
+    def _get(self, index: int) -> T:
+        items = self._items
+        if index < len(items):
+            return items[index]
+
+        return load_spilled(self._file, self._offsets[index - len(items)])
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Returns an iterator over lists of ``size`` consecutive items from the
+    iterable. The last list may be shorter.
+
+    Example:
+        >>> print(list(chunked(range(7), 3)))
+        [[0, 1, 2], [3, 4, 5], [6]]
+    """
+
+    if size < 1:
+        raise ValueError(f'size must be >= 1; got {size}.')
+
+    iterator = iter(iterable)
+    return iter(lambda: list(islice(iterator, size)), [])
+
+
+def is_reversible(iterable: Iterable) -> bool:
+    """
+    Returns whether ``reversed(iterable)`` works without reading the whole
+    iterable first, i.e. its type defines ``__reversed__`` (like dict views
+    and deques), or it is a :class:`~collections.abc.Sequence`.
+
+    Other types with ``__len__`` and ``__getitem__`` are not considered
+    reversible, since they may be indexed by label rather than position.
+    """
+
+    reversed_ = getattr(type(iterable), '__reversed__', _END)
+    if reversed_ is not _END:
+        return reversed_ is not None
+
+    return isinstance(iterable, Sequence)
+
+
+def reverse(iterable: Iterable[T], max_memory_items: int = None) -> Iterator[T]:
+    """
+    Returns an iterator over the items of the iterable in reverse order.
+
+    If the iterable :func:`is_reversible`, this is ``reversed(iterable)``.
+    Otherwise, the whole iterable is read when the first item is requested.
+    If ``max_memory_items`` is given, only the last ``max_memory_items``
+    items are kept in memory, and the rest are pickled to a temporary file in
+    batches, which are read back in reverse order.
+
+    Example:
+        >>> print(list(reverse((it * it for it in range(5)), max_memory_items=2)))
+        [16, 9, 4, 1, 0]
+    """
+
+    if max_memory_items is not None and max_memory_items < 1:
+        raise ValueError(f'max_memory_items must be >= 1; got {max_memory_items}.')
+
+    if is_reversible(iterable):
+        return reversed(iterable)
+
+    return _reverse(iterable, max_memory_items)
+
+
+def _reverse(iterable: Iterable[T], max_memory_items: Optional[int]) -> Iterator[T]:
+    if max_memory_items is None:
+        items = list(iterable)
+        items.reverse()
+        yield from items
+        return
+
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, max_memory_items))
+    item = next(iterator, _END)
+    if item is _END:
+        chunk.reverse()
+        yield from chunk
+        return
+
+    file = tempfile.TemporaryFile()
+    try:
+        offsets = array('q')
+        # Spill each full chunk once it is known not to be the last one
+        while item is not _END:
+            for start in range(0, len(chunk), SPILL_BATCH_SIZE):
+                offsets.append(spill(file, chunk[start:start + SPILL_BATCH_SIZE]))
+
+            chunk = [item]
+            chunk.extend(islice(iterator, max_memory_items - 1))
+            item = next(iterator, _END)
+
+        chunk.reverse()
+        yield from chunk
+        del chunk
+
+        for offset in reversed(offsets):
+            batch = load_spilled(file, offset)
+            batch.reverse()
+            yield from batch
+    finally:
+        file.close()
+
+
+def spill(file: BinaryIO, value) -> int:
+    """
+    Pickles the value to the end of the binary file, and returns the offset it
+    was written at, which can be passed to :func:`load_spilled`.
+    """
+
+    offset = file.seek(0, 2)
+    pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+    return offset
+
+
+def load_spilled(file: BinaryIO, offset: int):
+    """
+    Returns the value that :func:`spill` wrote to the file at the offset.
+    """
+
+    file.seek(offset)
+    return pickle.load(file)
+
+
+def unspill(file: BinaryIO) -> Iterator:
+    """
+    Returns an iterator over the values that :func:`spill` wrote to the file,
+    in the order they were written.
+    """
+
+    file.seek(0)
+    while True:
+        try:
+            yield pickle.load(file)
+        except EOFError:
+            return
+
+
+#: The number of items pickled together when spilling a run of items to disk.
+SPILL_BATCH_SIZE = 1024
+
+
+def tee(iterable: Iterable[T], n: int = 2, buffer_size: int = None) -> Tuple[Iterator[T], ...]:
+    """
+    Like ``itertools.tee``, returns ``n`` independent iterators over the items
+    of the iterable, but bounds how far apart the iterators may get.
+
+    Items read from the source but not yet consumed by every iterator are
+    buffered. If an iterator needs to read a new item while ``buffer_size``
+    items are already buffered, i.e. it is ``buffer_size`` items ahead of the
+    slowest iterator, ``BufferError`` is raised instead of buffering more.
+
+    Example:
+        >>> evens, odds = tee(range(6), buffer_size=1)
+        >>> print([(next(evens), next(odds)) for _ in range(3)])
+        [(0, 0), (1, 1), (2, 2)]
+    """
+
+    if n < 0:
+        raise ValueError(f'n must be >= 0; got {n}.')
+    if buffer_size is not None and buffer_size < 1:
+        raise ValueError(f'buffer_size must be >= 1; got {buffer_size}.')
+
+    buffer = _TeeBuffer(iterable, n, buffer_size)
+    return tuple(_TeeIterator(buffer, i) for i in range(n))
+
+
+class _TeeBuffer:
+    def __init__(self, iterable: Iterable[T], n: int, buffer_size: Optional[int]):
+        self.source = iter(iterable)
+        self.buffer_size = buffer_size
+        self.items = deque()
+        # Index in the source of items[0], and of each iterator's next item
+        self.start = 0
+        self.positions = [0] * n
+
+    def next(self, i: int) -> T:
+        items, positions = self.items, self.positions
+        position = positions[i]
+        offset = position - self.start
+
+        if offset < len(items):
+            item = items[offset]
+        else:
+            if self.buffer_size is not None and len(items) >= self.buffer_size:
+                raise BufferError(
+                    f'tee iterator {i} is {len(items)} items ahead of the slowest '
+                    f'iterator; buffer_size={self.buffer_size} exceeded.'
+                )
+
+            item = next(self.source)
+            items.append(item)
+
+        positions[i] = position + 1
+
+        if offset == 0:
+            # This iterator may have been the slowest; drop items all have seen
+            slowest = min(positions)
+            while self.start < slowest:
+                items.popleft()
+                self.start += 1
+
+        return item
+
+
+class _TeeIterator(Iterator[T]):
+    """
+    One of the iterators returned by :func:`tee`. Unlike a generator, it can
+    still be used after raising ``BufferError``, e.g. once the slower
+    iterators have caught up.
+    """
+
+    def __init__(self, buffer: _TeeBuffer, index: int):
+        self._buffer = buffer
+        self._index = index
+
+    def __next__(self) -> T:
+        return self._buffer.next(self._index)
+
+
+_END = object()
@@ -0,0 +1,533 @@
+"""
+Bounded caches for memoizing functions, e.g. with :func:`memoize`,
+``pipe(..., memoize=LRU(1024))`` or :meth:`yapytools.Stream.map_cached`.
+
+Each cache can be bounded by number of items (``maxsize``), by the total
+estimated size of its values (``max_bytes``), or both, and evicts items by its
+policy when full: :class:`LRU` evicts the least recently used item,
+:class:`LFU` the least frequently used one, and :class:`TTL` the oldest one,
+also expiring items after a fixed time. Every cache records
+:class:`CacheStats`.
+
+:meth:`Cache.get_or_compute` and :meth:`Cache.aget_or_compute` deduplicate
+concurrent computations of the same key ("single-flight"): while one thread
+or task computes a value, others asking for the same key wait for its result
+instead of computing it again.
+"""
+
+import asyncio
+import inspect
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial, update_wrapper
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+MISSING = object()
+"""Returned by :meth:`Cache.get` when the key is not cached."""
+
+
+class CacheStats:
+    """Statistics recorded by a cache."""
+
+    hits: int
+    """
+    Number of lookups that found a cached value, including calls to
+    :meth:`Cache.get_or_compute` that waited for another caller's
+    computation of the value.
+    """
+
+    misses: int
+    """Number of lookups that did not find a cached value."""
+
+    evictions: int
+    """Number of values removed to make room, or because they expired."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """Fraction of lookups that were hits, or ``None`` if there were none."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def to_dict(self) -> dict:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            hit_rate=self.hit_rate,
+        )
+
+    def __repr__(self) -> str:
+        return f'CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions})'
+
+
+class Cache(ABC, Generic[K, V]):
+    """
+    Base class for caches. Subclasses implement the eviction policy by
+    implementing :meth:`_victim`, and optionally the other ``_on_*`` hooks.
+    All methods are thread-safe.
+
+    Args:
+        maxsize: Maximum number of cached values, or ``None`` if unlimited.
+        max_bytes: Maximum total ``sizeof`` of the cached values, or ``None``
+            if unlimited. Values larger than this are not cached at all.
+        sizeof: Function estimating the size of a value in bytes.
+    """
+
+    maxsize: Optional[int]
+    max_bytes: Optional[int]
+    sizeof: Callable[[V], int]
+
+    stats: CacheStats
+
+    bytes: int
+    """Total estimated size of the cached values, if ``max_bytes`` is given."""
+
+    def __init__(
+            self,
+            maxsize: int = None,
+            max_bytes: int = None,
+            sizeof: Callable[[V], int] = sys.getsizeof,
+    ):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f'maxsize must be >= 1; got {maxsize}.')
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f'max_bytes must be >= 1; got {max_bytes}.')
+
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.stats = CacheStats()
+        self.bytes = 0
+        self._values: Dict[K, V] = {}
+        self._sizes: Dict[K, int] = {}
+        self._lock = threading.RLock()
+        self._flights: Dict[K, Future] = {}
+
+    def get(self, key: K, default=MISSING) -> V:
+        """Returns the value cached for the key, or ``default`` if none is."""
+
+        with self._lock:
+            value = self._lookup(key)
+            if value is MISSING:
+                self.stats.misses += 1
+                return default
+
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        """Caches the value for the key, evicting other values if needed."""
+
+        with self._lock:
+            if key in self._values:
+                self._remove(key)
+
+            size = 0
+            if self.max_bytes is not None:
+                size = self.sizeof(value)
+                if size > self.max_bytes:
+                    return
+
+            self._make_room(size)
+
+            self._values[key] = value
+            if self.max_bytes is not None:
+                self._sizes[key] = size
+                self.bytes += size
+            self._on_add(key)
+
+    def get_or_compute(self, key: K, function: Callable[[], V]) -> V:
+        """
+        Returns the value cached for the key, or else calls ``function`` to
+        compute it and caches the result.
+
+        If another thread or task is already computing the value for the key,
+        waits for its result instead, or re-raises its exception.
+        """
+
+        while True:
+            value, flight = self._join_flight(key)
+            if flight is None:
+                return value
+
+            if value is _WAIT:
+                value = flight.result()
+                if value is not _ABANDONED:
+                    return value
+                continue
+
+            try:
+                value = function()
+            except BaseException as e:
+                self._land(key, flight, error=e)
+                raise
+
+            self._land(key, flight, value)
+            return value
+
+    async def aget_or_compute(self, key: K, function: Callable[[], Awaitable[V]]) -> V:
+        """
+        Like :meth:`get_or_compute`, but ``function`` returns an awaitable.
+        Computations are shared with concurrent tasks, including tasks of
+        event loops in other threads, and with :meth:`get_or_compute`.
+
+        If the task computing the value is cancelled, a waiting task computes
+        it instead.
+        """
+
+        while True:
+            value, flight = self._join_flight(key)
+            if flight is None:
+                return value
+
+            if value is _WAIT:
+                value = await asyncio.wrap_future(flight)
+                if value is not _ABANDONED:
+                    return value
+                continue
+
+            try:
+                value = await function()
+            except asyncio.CancelledError:
+                self._land(key, flight, _ABANDONED)
+                raise
+            except BaseException as e:
+                self._land(key, flight, error=e)
+                raise
+
+            self._land(key, flight, value)
+            return value
+
+    def __contains__(self, key: K) -> bool:
+        with self._lock:
+            return key in self._values and not self._expired(key)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def clear(self) -> None:
+        """Removes all cached values. Does not reset the :attr:`stats`."""
+
+        with self._lock:
+            for key in list(self._values):
+                self._remove(key)
+
+    def _join_flight(self, key: K) -> Tuple[V, Optional[Future]]:
+        """
+        Returns the cached value for the key and no flight if there is one.
+        Otherwise, returns ``_WAIT`` and the flight computing the value if
+        there is one, or else starts a flight the caller must compute the
+        value for, and returns ``MISSING`` and the new flight.
+        """
+
+        with self._lock:
+            value = self._lookup(key)
+            if value is not MISSING:
+                self.stats.hits += 1
+                return value, None
+
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.stats.hits += 1
+                return _WAIT, flight
+
+            self.stats.misses += 1
+            flight = self._flights[key] = Future()
+            # Running futures can't be cancelled, e.g. by a waiting task
+            flight.set_running_or_notify_cancel()
+            return MISSING, flight
+
+    def _land(self, key: K, flight: Future, value=None, error: BaseException = None) -> None:
+        """Ends the flight for the key, caching the value unless it failed."""
+
+        with self._lock:
+            if error is None and value is not _ABANDONED:
+                self.set(key, value)
+            del self._flights[key]
+
+        if error is not None:
+            flight.set_exception(error)
+        else:
+            flight.set_result(value)
+
+    def _lookup(self, key: K) -> V:
+        value = self._values.get(key, MISSING)
+        if value is MISSING:
+            return MISSING
+
+        if self._expired(key):
+            self._remove(key)
+            self.stats.evictions += 1
+            return MISSING
+
+        self._on_get(key)
+        return value
+
+    def _make_room(self, size: int) -> None:
+        maxsize, max_bytes = self.maxsize, self.max_bytes
+        while self._values and (
+                (maxsize is not None and len(self._values) >= maxsize)
+                or (max_bytes is not None and self.bytes + size > max_bytes)
+        ):
+            self._remove(self._victim())
+            self.stats.evictions += 1
+
+    def _remove(self, key: K) -> None:
+        del self._values[key]
+        self.bytes -= self._sizes.pop(key, 0)
+        self._on_remove(key)
+
+    @abstractmethod
+    def _victim(self) -> K:
+        """Returns the key to evict next."""
+
+    def _expired(self, key: K) -> bool:
+        return False
+
+    def _on_add(self, key: K) -> None:
+        pass
+
+    def _on_get(self, key: K) -> None:
+        pass
+
+    def _on_remove(self, key: K) -> None:
+        pass
+
+
+class LRU(Cache[K, V]):
+    """
+    Caches up to ``maxsize`` values, evicting the least recently used one
+    when full. See :class:`Cache` for the args.
+
+    Example:
+        >>> cache = LRU(maxsize=2)
+        >>> cache.set('a', 1)
+        >>> cache.set('b', 2)
+        >>> cache.get('a')
+        1
+        >>> cache.set('c', 3)
+        >>> 'b' in cache
+        False
+    """
+
+    def __init__(
+            self,
+            maxsize: Optional[int] = 128,
+            max_bytes: int = None,
+            sizeof: Callable[[V], int] = sys.getsizeof,
+    ):
+        super().__init__(maxsize, max_bytes, sizeof)
+        self._values: OrderedDict = OrderedDict()
+
+    def _victim(self) -> K:
+        return next(iter(self._values))
+
+    def _on_get(self, key: K) -> None:
+        self._values.move_to_end(key)
+
+
+class LFU(Cache[K, V]):
+    """
+    Caches up to ``maxsize`` values, evicting the least frequently used one
+    when full, or the least recently used of those if there is a tie.
+    See :class:`Cache` for the args.
+
+    All operations take ``O(1)`` time.
+    """
+
+    def __init__(
+            self,
+            maxsize: Optional[int] = 128,
+            max_bytes: int = None,
+            sizeof: Callable[[V], int] = sys.getsizeof,
+    ):
+        super().__init__(maxsize, max_bytes, sizeof)
+        self._counts: Dict[K, int] = {}
+        # Keys by use count, each in least recently used order
+        self._buckets: Dict[int, OrderedDict] = {}
+        self._min_count = 0
+
+    def _victim(self) -> K:
+        if self._min_count not in self._buckets:
+            self._min_count = min(self._buckets)
+
+        return next(iter(self._buckets[self._min_count]))
+
+    def _on_add(self, key: K) -> None:
+        self._counts[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+
+    def _on_get(self, key: K) -> None:
+        count = self._counts[key]
+        self._discard(key, count)
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+        if self._min_count == count and count not in self._buckets:
+            self._min_count = count + 1
+
+    def _on_remove(self, key: K) -> None:
+        self._discard(key, self._counts.pop(key))
+
+    def _discard(self, key: K, count: int) -> None:
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+
+
+class TTL(Cache[K, V]):
+    """
+    Caches values for ``ttl`` seconds after they are set. If ``maxsize`` or
+    ``max_bytes`` is given, the oldest values are evicted when full.
+    See :class:`Cache` for the other args.
+
+    Example:
+        >>> cache = TTL(ttl=60, maxsize=10_000)
+    """
+
+    ttl: float
+
+    def __init__(
+            self,
+            ttl: float,
+            maxsize: int = None,
+            max_bytes: int = None,
+            sizeof: Callable[[V], int] = sys.getsizeof,
+            timer: Callable[[], float] = time.monotonic,
+    ):
+        if ttl <= 0:
+            raise ValueError(f'ttl must be > 0; got {ttl}.')
+
+        super().__init__(maxsize, max_bytes, sizeof)
+        self.ttl = ttl
+        self._timer = timer
+        # Values are always re-inserted when set, so the dicts are in the
+        # order the values expire
+        self._expires: Dict[K, float] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._values)
+
+    def _make_room(self, size: int) -> None:
+        self._expire()
+        super()._make_room(size)
+
+    def _expire(self) -> None:
+        now = self._timer()
+        expires = self._expires
+        while expires:
+            key, expires_at = next(iter(expires.items()))
+            if expires_at > now:
+                return
+
+            self._remove(key)
+            self.stats.evictions += 1
+
+    def _victim(self) -> K:
+        return next(iter(self._values))
+
+    def _expired(self, key: K) -> bool:
+        return self._expires[key] <= self._timer()
+
+    def _on_add(self, key: K) -> None:
+        self._expires[key] = self._timer() + self.ttl
+
+    def _on_remove(self, key: K) -> None:
+        del self._expires[key]
+
+
+def memoize(
+        function: Callable = None,
+        cache: Cache = None,
+        key: Callable[..., Hashable] = None,
+) -> Callable:
+    """
+    Decorator caching the results of a function, keyed by its args or by
+    ``key(*args, **kwargs)`` if given. Concurrent calls with the same key
+    are deduplicated with :meth:`Cache.get_or_compute`, or with
+    :meth:`Cache.aget_or_compute` if ``function`` is a coroutine function.
+    Calls with unhashable args are not cached.
+
+    The cache defaults to an :class:`LRU` of 128 values, and is available as
+    the ``cache`` attribute of the returned function.
+
+    Example:
+        >>> @memoize(cache=TTL(ttl=60))
+        >>> def fetch_user(user_id):
+        >>>     ...
+        >>> fetch_user.cache.stats
+        CacheStats(hits=0, misses=0, evictions=0)
+    """
+
+    if function is None:
+        return partial(memoize, cache=cache, key=key)
+
+    cache = LRU() if cache is None else cache
+    get_or_compute = cache.get_or_compute
+    key_function = _args_key if key is None else key
+
+    if inspect.iscoroutinefunction(function):
+        aget_or_compute = cache.aget_or_compute
+
+        async def memoized(*args, **kwargs):
+            cache_key = key_function(*args, **kwargs)
+            if not _is_hashable(cache_key):
+                return await function(*args, **kwargs)
+
+            return await aget_or_compute(cache_key, partial(function, *args, **kwargs))
+    else:
+        def memoized(*args, **kwargs):
+            cache_key = key_function(*args, **kwargs)
+            if not _is_hashable(cache_key):
+                return function(*args, **kwargs)
+
+            return get_or_compute(cache_key, partial(function, *args, **kwargs))
+
+    update_wrapper(memoized, function)
+    memoized.cache = cache
+    return memoized
+
+
+def _args_key(*args, **kwargs) -> Hashable:
+    if kwargs:
+        return args + (_KWARGS_MARK,) + tuple(kwargs.items())
+
+    # Like functools.lru_cache, use common single args as their own keys
+    if len(args) == 1 and type(args[0]) in (int, str):
+        return args[0]
+
+    return args
+
+
+_KWARGS_MARK = object()
+
+
+def _is_hashable(value) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+
+    return True
+
+
+_WAIT = object()
+
+_ABANDONED = object()
+"""Result of a flight whose computation was cancelled; waiters retry."""
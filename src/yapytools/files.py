@@ -0,0 +1,474 @@
+"""
+Fast line-oriented file sources and sinks for :class:`yapytools.Stream`, e.g.
+for huge log or JSONL files. See :meth:`yapytools.Stream.from_lines` and
+:meth:`yapytools.Stream.to_file`.
+
+Files are read in large blocks, either through ``mmap`` or buffered reads,
+and each block is decoded and split into lines at once, rather than reading
+one line at a time. Likewise, output is collected into large buffers that
+are encoded and written at once.
+
+A file can be split into byte-range shards with :func:`byte_ranges`, e.g. to
+read it with several workers. Each line belongs to the shard its first byte
+is in, so every line is read by exactly one shard.
+"""
+
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import mmap as _mmap
+import os
+from collections import OrderedDict
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Sequence, Tuple, TypeVar, Union
+
+T = TypeVar('T')
+K = TypeVar('K', bound=Hashable)
+
+PathLike = Union[str, os.PathLike]
+
+DEFAULT_CHUNK_BYTES = 1 << 20
+
+COMPRESSIONS = ('gzip', 'bz2', 'xz')
+
+
+def byte_ranges(path: PathLike, n: int) -> List[Tuple[int, int]]:
+    """
+    Splits the file into ``n`` byte ranges of about equal size, as
+    ``(start, end)`` tuples to pass to :func:`read_lines`.
+
+    Example:
+        >>> for start, end in byte_ranges('log.txt', 4):
+        >>>     pool.submit(count_errors, 'log.txt', start, end)
+    """
+
+    if n < 1:
+        raise ValueError(f'n must be >= 1; got {n}.')
+
+    size = os.path.getsize(path)
+    bounds = [size * i // n for i in range(n + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def read_csv(
+        path: PathLike,
+        header: bool = True,
+        start: int = 0,
+        end: int = None,
+        mmap: bool = True,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        encoding: str = 'utf-8',
+        **fmtparams,
+) -> Iterator[Union[Dict[str, str], List[str]]]:
+    """
+    Returns an iterator over the rows of a CSV file, as dicts keyed by the
+    column names in the first line if ``header`` is ``True``, or as lists
+    otherwise. ``fmtparams`` are passed to ``csv.reader``.
+
+    See :func:`read_lines` for the other args. When reading a byte range,
+    quoted values containing newlines may be split across shards.
+    """
+
+    lines = read_lines(path, start, end, mmap, chunk_bytes, encoding, keep_ends=True)
+
+    if not header:
+        return csv.reader(lines, **fmtparams)
+
+    if start == 0:
+        return csv.DictReader(lines, **fmtparams)
+
+    with open(path, encoding=encoding, newline='') as file:
+        fieldnames = next(csv.reader(file, **fmtparams), [])
+
+    return csv.DictReader(lines, fieldnames, **fmtparams)
+
+
+def read_jsonl(
+        path: PathLike,
+        start: int = 0,
+        end: int = None,
+        mmap: bool = True,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        encoding: str = 'utf-8',
+) -> Iterator[Any]:
+    """
+    Returns an iterator over the JSON values on each non-blank line of the
+    file. See :func:`read_lines` for the args.
+    """
+
+    lines = read_lines(path, start, end, mmap, chunk_bytes, encoding)
+    loads = json.loads
+    return (loads(line) for line in lines if line and not line.isspace())
+
+
+def read_lines(
+        path: PathLike,
+        start: int = 0,
+        end: int = None,
+        mmap: bool = True,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        encoding: str = 'utf-8',
+        keep_ends: bool = False,
+) -> Iterator[str]:
+    """
+    Returns an iterator over the lines of the file, without their line
+    endings unless ``keep_ends`` is ``True``. Lines are split on ``'\\n'``,
+    and a ``'\\r'`` before it is also removed.
+
+    Args:
+        path: The file to read.
+        start: Only read the lines starting at or after this byte offset.
+        end: Only read the lines starting before this byte offset.
+        mmap: Read the file through ``mmap`` rather than buffered reads.
+        chunk_bytes: How many bytes to decode and split at a time.
+        encoding: The encoding of the file.
+        keep_ends: Whether to keep the line endings.
+    """
+
+    if start < 0:
+        raise ValueError(f'start must be >= 0; got {start}.')
+    if end is not None and end < start:
+        raise ValueError(f'end must be >= start; got start={start}, end={end}.')
+    if chunk_bytes < 1:
+        raise ValueError(f'chunk_bytes must be >= 1; got {chunk_bytes}.')
+
+    # Lines are produced a block at a time, and flattened in C
+    return chain.from_iterable(_read_lines(path, start, end, mmap, chunk_bytes, encoding, keep_ends))
+
+
+def _read_lines(
+        path: PathLike,
+        start: int,
+        end: int,
+        mmap: bool,
+        chunk_bytes: int,
+        encoding: str,
+        keep_ends: bool,
+) -> Iterator[List[str]]:
+    with open(path, 'rb') as file:
+        start = _line_start(file, start)
+        end = _line_start(file, end)
+
+        if start >= end:
+            return
+
+        if mmap:
+            with _mmap.mmap(file.fileno(), 0, access=_mmap.ACCESS_READ) as mapped:
+                yield from _split_lines(
+                    _mapped_blocks(mapped, start, end, chunk_bytes),
+                    encoding,
+                    keep_ends,
+                )
+        else:
+            file.seek(start)
+            yield from _split_lines(
+                _read_blocks(file, end - start, chunk_bytes),
+                encoding,
+                keep_ends,
+            )
+
+
+def _line_start(file, offset: int = None) -> int:
+    """Returns the offset of the first line starting at or after the offset."""
+
+    size = os.fstat(file.fileno()).st_size
+    if offset is None or offset >= size:
+        return size
+    if offset == 0:
+        return 0
+
+    # Skip the rest of the line containing the byte before the offset
+    file.seek(offset - 1)
+    file.readline()
+    return file.tell()
+
+
+def _mapped_blocks(mapped: _mmap.mmap, start: int, end: int, chunk_bytes: int) -> Iterator[bytes]:
+    for offset in range(start, end, chunk_bytes):
+        yield mapped[offset:min(offset + chunk_bytes, end)]
+
+
+def _read_blocks(file, size: int, chunk_bytes: int) -> Iterator[bytes]:
+    while size > 0:
+        block = file.read(min(chunk_bytes, size))
+        if not block:
+            return
+
+        size -= len(block)
+        yield block
+
+
+def _split_lines(blocks: Iterator[bytes], encoding: str, keep_ends: bool) -> Iterator[List[str]]:
+    rest = b''
+
+    for block in blocks:
+        # Only decode complete lines, so multi-byte characters are never split
+        cut = block.rfind(b'\n') + 1
+        if not cut:
+            rest += block
+            continue
+
+        text = (rest + block[:cut] if rest else block[:cut]).decode(encoding)
+        rest = block[cut:]
+
+        yield _split_text(text, keep_ends)
+
+    if rest:
+        yield _split_text(rest.decode(encoding), keep_ends, final=True)
+
+
+def _split_text(text: str, keep_ends: bool, final: bool = False) -> List[str]:
+    """
+    Splits text on newlines. Unless ``final``, the text ends with a newline.
+    """
+
+    lines = text.split('\n')
+
+    if not final:
+        lines.pop()
+    if keep_ends:
+        lines = [line + '\n' for line in lines]
+        if final:
+            lines[-1] = lines[-1][:-1]
+    elif '\r' in text:
+        lines = [line[:-1] if line.endswith('\r') else line for line in lines]
+
+    return lines
+
+
+def write_csv(
+        iterable: Iterable[Union[Dict[str, Any], Sequence]],
+        path: PathLike,
+        fieldnames: Sequence[str] = None,
+        header: bool = True,
+        buffer_bytes: int = DEFAULT_CHUNK_BYTES,
+        compression: str = None,
+        encoding: str = 'utf-8',
+        **fmtparams,
+) -> int:
+    """
+    Writes each row to a CSV file, and returns the number of rows written.
+
+    Rows may be dicts or sequences. For dicts, ``fieldnames`` defaults to the
+    keys of the first row, and a header line is written unless ``header`` is
+    ``False``. ``fmtparams`` are passed to ``csv.writer``.
+    See :func:`write_file` for the other args.
+    """
+
+    iterator = iter(iterable)
+    first = next(iterator, _END)
+
+    with _BufferedWriter(path, buffer_bytes, compression, encoding) as file:
+        if first is _END:
+            return 0
+
+        if isinstance(first, dict):
+            fieldnames = list(first) if fieldnames is None else fieldnames
+            writer = csv.DictWriter(file, fieldnames, **fmtparams)
+            if header:
+                writer.writeheader()
+        else:
+            writer = csv.writer(file, **fmtparams)
+            if header and fieldnames is not None:
+                writer.writerow(fieldnames)
+
+        writer.writerow(first)
+        return 1 + _count_calls(writer.writerow, iterator)
+
+
+def write_file(
+        iterable: Iterable[T],
+        path: PathLike,
+        serializer: Callable[[T], str] = str,
+        buffer_bytes: int = DEFAULT_CHUNK_BYTES,
+        compression: str = None,
+        encoding: str = 'utf-8',
+) -> int:
+    """
+    Writes each item to the file on its own line, and returns the number of
+    items written.
+
+    Args:
+        iterable: The items to write.
+        path: The file to write. It is overwritten if it exists.
+        serializer: Function converting each item to the line to write.
+        buffer_bytes: About how many bytes to buffer before each write.
+        compression: ``'gzip'``, ``'bz2'``, ``'xz'``, or ``None``.
+        encoding: The encoding of the file.
+    """
+
+    with _BufferedWriter(path, buffer_bytes, compression, encoding) as file:
+        return file.write_lines(map(serializer, iterable))
+
+
+def write_jsonl(
+        iterable: Iterable[Any],
+        path: PathLike,
+        buffer_bytes: int = DEFAULT_CHUNK_BYTES,
+        compression: str = None,
+        encoding: str = 'utf-8',
+        **dumps_kwargs,
+) -> int:
+    """
+    Writes each item to the file as a line of JSON, and returns the number of
+    items written. ``dumps_kwargs`` are passed to ``json.dumps``.
+    See :func:`write_file` for the other args.
+    """
+
+    encoder = json.JSONEncoder(**dumps_kwargs)
+    return write_file(iterable, path, encoder.encode, buffer_bytes, compression, encoding)
+
+
+def write_partitioned(
+        iterable: Iterable[T],
+        key_selector: Callable[[T], K],
+        directory: PathLike,
+        serializer: Callable[[T], str] = str,
+        filename: str = '{key}.txt',
+        max_open_files: int = 64,
+        buffer_bytes: int = 64 * 1024,
+        compression: str = None,
+        encoding: str = 'utf-8',
+) -> int:
+    """
+    Writes each item on its own line to a file per key returned by
+    ``key_selector``, and returns the number of items written.
+
+    Each file is named by formatting ``filename`` with the key, in
+    ``directory``, which is created if needed. Existing files are overwritten.
+    At most ``max_open_files`` files are kept open, each with its own buffer of
+    ``buffer_bytes``; the least recently used file is closed when another one
+    is needed, and reopened for appending later.
+
+    Example:
+        >>> write_partitioned(events, lambda it: it.day, 'events', filename='{key}.log')
+
+    See :func:`write_file` for the other args.
+    """
+
+    if max_open_files < 1:
+        raise ValueError(f'max_open_files must be >= 1; got {max_open_files}.')
+
+    os.makedirs(directory, exist_ok=True)
+
+    files: OrderedDict = OrderedDict()
+    written = set()
+    count = 0
+
+    try:
+        for item in iterable:
+            key = key_selector(item)
+
+            file = files.get(key)
+            if file is None:
+                if len(files) >= max_open_files:
+                    files.popitem(last=False)[1].close()
+
+                path = os.path.join(directory, filename.format(key=key))
+                file = files[key] = _BufferedWriter(
+                    path, buffer_bytes, compression, encoding, append=key in written)
+                written.add(key)
+            else:
+                files.move_to_end(key)
+
+            file.write(serializer(item))
+            file.write('\n')
+            count += 1
+    finally:
+        for file in files.values():
+            file.close()
+
+    return count
+
+
+class _BufferedWriter:
+    """
+    A text file that collects writes in a list until about ``buffer_bytes``
+    characters are buffered, then encodes and writes them at once.
+    """
+
+    def __init__(
+            self,
+            path: PathLike,
+            buffer_bytes: int,
+            compression: str = None,
+            encoding: str = 'utf-8',
+            append: bool = False,
+    ):
+        if buffer_bytes < 1:
+            raise ValueError(f'buffer_bytes must be >= 1; got {buffer_bytes}.')
+
+        self._file = _open_binary(path, 'ab' if append else 'wb', compression)
+        self._encoding = encoding
+        self._buffer_bytes = buffer_bytes
+        self._parts: List[str] = []
+        self._size = 0
+
+    def __enter__(self) -> '_BufferedWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+
+        if self._size >= self._buffer_bytes:
+            self.flush()
+
+    def write_lines(self, lines: Iterable[str]) -> int:
+        """Writes each line followed by a newline, and returns how many were written."""
+
+        count = 0
+        iterator = iter(lines)
+
+        # Join lines in batches, so the per-line work happens in C
+        while True:
+            batch = list(islice(iterator, _LINES_PER_JOIN))
+            if not batch:
+                return count
+
+            batch.append('')
+            self.write('\n'.join(batch))
+            count += len(batch) - 1
+
+    def flush(self) -> None:
+        if self._parts:
+            self._file.write(''.join(self._parts).encode(self._encoding))
+            self._parts.clear()
+            self._size = 0
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+
+def _open_binary(path: PathLike, mode: str, compression: str = None):
+    if compression is None:
+        return open(path, mode)
+    if compression == 'gzip':
+        return gzip.open(path, mode)
+    if compression == 'bz2':
+        return bz2.open(path, mode)
+    if compression == 'xz':
+        return lzma.open(path, mode)
+
+    raise ValueError(f'compression must be one of {COMPRESSIONS} or None; got {compression!r}.')
+
+
+def _count_calls(function: Callable[[T], Any], iterable: Iterable[T]) -> int:
+    count = 0
+    for item in iterable:
+        function(item)
+        count += 1
+
+    return count
+
+
+_END = object()
+_LINES_PER_JOIN = 1024
@@ -0,0 +1,386 @@
+"""
+Tools for running per-item work across a pool of thread or process workers.
+
+Items are dispatched to the workers in chunks, and the number of chunks in
+flight at any one time is bounded, so memory use stays flat even when the
+input iterable is unbounded.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from yapytools.buffers import chunked, is_reversible
+from yapytools.plan import FILTER, MAP, Stage, fuse
+from yapytools.predicates import as_function
+
+T = TypeVar('T')
+V = TypeVar('V')
+
+BACKENDS = ('thread', 'process')
+
+
+class ParallelOptions(NamedTuple):
+    """Options controlling how work is spread across a worker pool."""
+
+    workers: Optional[int] = None
+    """Number of workers in the pool. Defaults to the number of CPUs."""
+
+    backend: str = 'thread'
+    """Either ``'thread'`` or ``'process'``."""
+
+    chunk_size: int = 256
+    """Number of items sent to a worker in a single task."""
+
+    ordered: bool = True
+    """
+    If ``True``, results are yielded in input order. Otherwise, results are
+    yielded as soon as each chunk completes.
+    """
+
+    max_in_flight: Optional[int] = None
+    """
+    Maximum number of chunks submitted but not yet yielded.
+    Defaults to twice the number of workers.
+    """
+
+
+def parallel_options(
+        workers: Optional[int] = None,
+        backend: str = 'thread',
+        chunk_size: int = 256,
+        ordered: bool = True,
+        max_in_flight: Optional[int] = None,
+) -> ParallelOptions:
+    """Returns validated :class:`ParallelOptions`."""
+
+    if backend not in BACKENDS:
+        raise ValueError(
+            f'Invalid backend {backend!r}; must be one of {BACKENDS}.')
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError(f'workers must be >= 1; got {workers}.')
+
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be >= 1; got {chunk_size}.')
+
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    elif max_in_flight < 1:
+        raise ValueError(f'max_in_flight must be >= 1; got {max_in_flight}.')
+
+    return ParallelOptions(
+        workers=workers,
+        backend=backend,
+        chunk_size=chunk_size,
+        ordered=ordered,
+        max_in_flight=max_in_flight,
+    )
+
+
+def parallel_filter(
+        function: Callable[[T], bool],
+        iterable: Iterable[T],
+        **options,
+) -> Iterator[T]:
+    """
+    Like the builtin ``filter``, but the predicate is evaluated across a
+    worker pool. See :func:`parallel_options` for the accepted options.
+
+    With the ``'process'`` backend, the predicate must be picklable,
+    i.e. a module-level function rather than a lambda.
+    """
+
+    return run_stages([(FILTER, function)], iterable, parallel_options(**options))
+
+
+def parallel_map(
+        function: Callable[[T], V],
+        iterable: Iterable[T],
+        **options,
+) -> Iterator[V]:
+    """
+    Like the builtin ``map``, but the function is applied across a worker
+    pool. See :func:`parallel_options` for the accepted options.
+
+    Example:
+        >>> values = parallel_map(
+        ...     lambda it: it * it,
+        ...     range(5),
+        ...     workers=4,
+        ... )
+        >>> print(list(values))
+        [0, 1, 4, 9, 16]
+
+    With the ``'process'`` backend, the function must be picklable,
+    i.e. a module-level function rather than a lambda.
+    """
+
+    return run_stages([(MAP, function)], iterable, parallel_options(**options))
+
+
+def parallel_count(
+        predicate: Callable[[T], bool],
+        iterable: Iterable[T],
+        **options,
+) -> int:
+    """
+    Returns the number of items matching the predicate, which is evaluated
+    across a worker pool. See :func:`parallel_options` for the accepted
+    options; ``ordered`` is ignored.
+    """
+
+    options = parallel_options(**options)._replace(ordered=False)
+    return sum(run_chunks(partial(_count_in_chunk, predicate), iterable, options))
+
+
+def parallel_find(
+        predicate: Callable[[T], bool],
+        iterable: Iterable[T],
+        **options,
+) -> Optional[T]:
+    """
+    Returns the first item matching the predicate, or ``None`` if there is
+    none, like :func:`yapytools.find`, but the predicate is evaluated across
+    a worker pool. See :func:`first_result` and :func:`parallel_options`.
+
+    Example:
+        >>> print(parallel_find(lambda it: it % 7 == 6, range(10_000), workers=4, chunk_size=100))
+        6
+    """
+
+    found = first_result(partial(_find_in_chunk, predicate), iterable, parallel_options(**options))
+    return found[0] if found else None
+
+
+def parallel_find_last(
+        predicate: Callable[[T], bool],
+        iterable: Iterable[T],
+        **options,
+) -> Optional[T]:
+    """
+    Returns the last item matching the predicate, or ``None`` if there is
+    none, like :func:`yapytools.find_last`, but the predicate is evaluated
+    across a worker pool.
+
+    If the iterable is reversible, it is searched backwards like with
+    :func:`parallel_find`. Otherwise, every item has to be checked.
+    """
+
+    options = parallel_options(**options)
+    if is_reversible(iterable):
+        found = first_result(partial(_find_in_chunk, predicate), reversed(iterable), options)
+    else:
+        task = partial(_find_last_in_chunk, predicate)
+        found = None
+        for result in run_chunks(task, iterable, options._replace(ordered=True)):
+            found = result or found
+
+    return found[0] if found else None
+
+
+def run_stages(
+        stages: Sequence[Stage],
+        iterable: Iterable,
+        options: ParallelOptions,
+) -> Iterator:
+    """
+    Applies the given map and filter stages to every item in the iterable,
+    one chunk of items per worker task. The stages are fused into a single
+    loop in the worker; see :func:`yapytools.plan.fuse`.
+    """
+
+    task = partial(_run_stages, tuple(stages))
+
+    for results in run_chunks(task, iterable, options):
+        yield from results
+
+
+def run_any(
+        stages: Sequence[Stage],
+        iterable: Iterable,
+        options: ParallelOptions,
+) -> bool:
+    """
+    Returns whether any item left after applying the given map and filter
+    stages is truthy. The stages run in the worker pool like with
+    :func:`run_stages`, and no more chunks are processed once one has a
+    truthy item. See :func:`first_result`.
+    """
+    return bool(first_result(partial(_any_in_chunk, tuple(stages)), iterable, options))
+
+
+def run_chunks(
+        task: Callable[[List[T]], V],
+        iterable: Iterable[T],
+        options: ParallelOptions,
+) -> Iterator[V]:
+    """
+    Splits the iterable into chunks, calls ``task`` on each chunk in the worker
+    pool, and yields the result for each chunk.
+
+    At most ``options.max_in_flight`` chunks are pending at any time.
+    """
+
+    executor = _new_executor(options)
+    try:
+        chunks = chunked(iterable, options.chunk_size)
+
+        if options.ordered:
+            yield from _run_ordered(executor, task, chunks, options.max_in_flight)
+        else:
+            yield from _run_unordered(executor, task, chunks, options.max_in_flight)
+    finally:
+        executor.shutdown(wait=True)
+
+
+def first_result(
+        task: Callable[[List[T]], Optional[V]],
+        iterable: Iterable[T],
+        options: ParallelOptions,
+) -> Optional[V]:
+    """
+    Calls ``task`` on chunks of the iterable in the worker pool, and returns
+    the result for the first chunk, in input order, for which it is not
+    ``None``, or ``None`` if there is no such chunk. An error raised for an
+    earlier chunk is raised instead.
+
+    Once a chunk has a result, no more chunks are read from the iterable, and
+    the tasks for any later chunks are cancelled or abandoned. Only the
+    earlier chunks, which could still have a result, are waited for.
+    """
+
+    executor = _new_executor(options)
+    pending = {}
+    try:
+        chunks = enumerate(chunked(iterable, options.chunk_size))
+        first: Optional[Tuple[int, Future]] = None
+
+        while True:
+            # Later chunks can not matter once a result is known
+            while first is None and len(pending) < options.max_in_flight:
+                index, chunk = next(chunks, (None, None))
+                if chunk is None:
+                    break
+                pending[executor.submit(task, chunk)] = index
+
+            if not pending:
+                return first[1].result() if first is not None else None
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                if future.exception() is not None or future.result() is not None:
+                    if first is None or index < first[0]:
+                        first = index, future
+
+            if first is not None:
+                later = [future for future, index in pending.items() if index > first[0]]
+                _cancel(later)
+                for future in later:
+                    del pending[future]
+    finally:
+        _cancel(pending)
+        # Return without waiting for abandoned tasks that are still running
+        executor.shutdown(wait=False)
+
+
+def _new_executor(options: ParallelOptions) -> Executor:
+    if options.backend == 'process':
+        return ProcessPoolExecutor(max_workers=options.workers)
+    return ThreadPoolExecutor(max_workers=options.workers)
+
+
+def _run_ordered(
+        executor: Executor,
+        task: Callable,
+        chunks: Iterator[list],
+        max_in_flight: int,
+) -> Iterator:
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(task, chunk))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        _cancel(pending)
+
+
+def _run_unordered(
+        executor: Executor,
+        task: Callable,
+        chunks: Iterator[list],
+        max_in_flight: int,
+) -> Iterator:
+    pending = set()
+    try:
+        for chunk in chunks:
+            pending.add(executor.submit(task, chunk))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        _cancel(pending)
+
+
+def _cancel(futures: Iterable[Future]) -> None:
+    for future in futures:
+        future.cancel()
+
+
+# The chunk tasks below run in the workers, so must be module-level
+# functions to be picklable. Found items are wrapped in a tuple, to tell a
+# found ``None`` from no result.
+
+def _run_stages(stages: Tuple[Stage, ...], chunk: list) -> list:
+    return list(fuse(stages)(chunk))
+
+
+def _any_in_chunk(stages: Tuple[Stage, ...], chunk: list) -> Optional[bool]:
+    return True if any(fuse(stages)(chunk)) else None
+
+
+def _count_in_chunk(predicate: Callable[[T], bool], chunk: List[T]) -> int:
+    return sum(1 for _ in filter(as_function(predicate), chunk))
+
+
+def _find_in_chunk(predicate: Callable[[T], bool], chunk: List[T]) -> Optional[Tuple[T]]:
+    for item in filter(as_function(predicate), chunk):
+        return item,
+
+    return None
+
+
+def _find_last_in_chunk(predicate: Callable[[T], bool], chunk: List[T]) -> Optional[Tuple[T]]:
+    return _find_in_chunk(predicate, chunk[::-1])
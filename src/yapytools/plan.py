@@ -0,0 +1,165 @@
+"""
+Fusion of consecutive map and filter stages into a single per-item loop.
+
+Chaining the builtin ``map`` and ``filter`` adds one layer of iterator
+dispatch per stage for every item. :func:`fuse` instead generates one
+function whose loop body calls each stage function in turn, so adding a
+stage costs little more than the call to its function.
+"""
+
+from functools import lru_cache, partial
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple
+
+from yapytools.predicates import Condition, as_function
+
+MAP = 'map'
+FILTER = 'filter'
+
+Stage = Tuple[str, Callable]
+"""A ``(kind, function)`` pair, where ``kind`` is :data:`MAP` or :data:`FILTER`."""
+
+
+def fuse(stages: Sequence[Stage]) -> Callable[[Iterable], Iterator]:
+    """
+    Returns a function that applies all the given stages, in order, to each
+    item of an iterable in a single loop.
+
+    Example:
+        >>> run = fuse([
+        ...     (FILTER, lambda it: it > 4),
+        ...     (MAP, lambda it: it * 10),
+        ...     (MAP, str),
+        ... ])
+        >>> print(list(run(range(8))))
+        ['50', '60', '70']
+    """
+
+    if not stages:
+        return iter
+
+    if len(stages) == 1 and not _is_combined(stages[0]):
+        kind, function = stages[0]
+        return partial(map, function) if kind == MAP else partial(filter, as_function(function))
+
+    functions = []
+    shape = tuple(_stage_expression(stage, functions) for stage in stages)
+    loop = _compile(shape)
+
+    return lambda iterable: loop(iterable, *functions)
+
+
+def describe(stages: Sequence[Stage]) -> str:
+    """Returns a one-line description of the given stages."""
+    return ' -> '.join(
+        f'{kind}({_name(function)})'
+        for kind, function in stages
+    )
+
+
+def _name(function: Callable) -> str:
+    return getattr(function, '__name__', None) or repr(function)
+
+
+def _is_combined(stage: Stage) -> bool:
+    kind, function = stage
+    return kind == FILTER and isinstance(function, Condition) and function.function is None
+
+
+def _stage_expression(stage: Stage, functions: list) -> Tuple[str, str]:
+    """
+    Returns the stage kind and the expression calling its function on
+    ``item``, and appends the functions it calls to ``functions``.
+
+    Combined conditions are inlined, so e.g. ``Condition(is_even) & is_positive`` costs
+    one call per predicate rather than another call to their compiled check.
+    """
+
+    kind, function = stage
+    if _is_combined(stage):
+        return kind, function._expression(functions, 'item')
+
+    functions.append(function if kind == MAP else as_function(function))
+    return kind, f'f{len(functions) - 1}(item)'
+
+
+def compile_function(lines: Sequence[str], name: str) -> Callable:
+    """
+    Compiles generated Python source, given as lines, and returns the
+    function named ``name`` that it defines.
+
+    The generated code should depend only on the shape of what it computes,
+    e.g. the kinds of the stages, with the functions it calls passed in as
+    arguments. Callers can then cache it by shape and share it.
+    """
+
+    namespace = {}
+    exec(compile('\n'.join(lines), f'<yapytools.{name}>', 'exec'), namespace)
+    return namespace[name]
+
+
+def nest_calls(expressions: Iterable[str], value: str, variable: str) -> Tuple[List[str], str]:
+    """
+    Nests expressions that each call a function on ``(item)``, like
+    ``'f0(item)'``, into one expression applying them in turn to ``value``.
+
+    Every :data:`NESTING_LIMIT` calls, the expression so far is assigned to
+    ``variable``, so the parser's limit on nested parentheses is not reached.
+    Returns the assignment statements and the final expression.
+    """
+
+    statements = []
+    depth = 0
+    for expression in expressions:
+        if depth == NESTING_LIMIT:
+            statements.append(f'{variable} = {value}')
+            value, depth = variable, 0
+
+        value = expression.replace('(item)', f'({value})')
+        depth += 1
+
+    return statements, value
+
+
+NESTING_LIMIT = 50
+"""Maximum number of calls :func:`nest_calls` nests in one expression."""
+
+
+@lru_cache(maxsize=256)
+def _compile(shape: Tuple[Tuple[str, str], ...]) -> Callable:
+    """
+    Generates a generator function taking the iterable followed by the
+    functions called by the stage expressions.
+    """
+
+    params = [f'f{i}' for i in range(sum(expression.count('(item)') for _, expression in shape))]
+    lines = [
+        f'def fused(iterable, {", ".join(params)}):',
+        '    for item in iterable:',
+    ]
+
+    # Consecutive maps are nested into a single expression
+    value = 'item'
+    for kind, stages in groupby(shape, key=itemgetter(0)):
+        expressions = [expression for _, expression in stages]
+
+        if kind == MAP:
+            statements, value = nest_calls(expressions, value, 'item')
+            lines.extend(f'        {statement}' for statement in statements)
+            continue
+
+        if value != 'item':
+            lines.append(f'        item = {value}')
+            value = 'item'
+
+        if kind != FILTER:
+            raise ValueError(f'Unknown stage kind {kind!r}.')
+
+        for expression in expressions:
+            lines.append(f'        if not {expression}:')
+            lines.append('            continue')
+
+    lines.append(f'        yield {value}')
+
+    return compile_function(lines, 'fused')
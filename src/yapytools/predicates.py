@@ -1,14 +1,316 @@
-from typing import Callable, TypeVar
+"""
+Predicates for filtering, and composable :class:`Condition` objects.
+
+The predicates in this module are plain functions, so calling them or
+passing them to ``filter`` costs no more than any other function. Wrap a
+predicate in a :class:`Condition` to combine it with others using ``&``,
+``|`` and ``~``, e.g. ``Condition(is_even) & ~Condition(is_zero)``. A
+combined condition is compiled into a single function that short-circuits
+like ``and``/``or``/``not``, so filtering with it costs one call per item
+rather than one per predicate.
+
+Conditions can also be evaluated over a whole NumPy array at once with
+:meth:`Condition.mask`, or used to filter a batch of items with
+:func:`filter_batch`.
+"""
+
+import sys
+from functools import lru_cache
+from typing import Any, Callable, List, Sequence, TypeVar, Union
 
 T = TypeVar('T')
 
 Predicate = Callable[[T], bool]
 
 
+class Condition:
+    """
+    A predicate that can be combined with other predicates using ``&``, ``|``
+    and ``~``. Plain functions are converted to conditions when combined with
+    one.
+
+    If ``vectorized`` is given, it is a function taking a NumPy array and
+    returning a boolean mask, used by :meth:`mask`. ``vectorized=True`` means
+    ``function`` itself works elementwise on arrays. It defaults to the
+    ``vectorized`` attribute of ``function``, which the predicates in this
+    module have where they can be vectorized.
+
+    Example:
+        >>> is_small = Condition(lambda it: abs(it) < 10, vectorized=lambda values: abs(values) < 10)
+        >>> check = is_small & is_even & ~Condition(is_zero)
+        >>> print(list(filter(check, range(-12, 12, 3))))
+        [-6, 6]
+    """
+
+    function: Predicate
+    vectorized: Callable[[Any], Any]
+
+    def __init__(self, function: Predicate, vectorized: Union[bool, Callable[[Any], Any]] = None):
+        if vectorized is None:
+            vectorized = getattr(function, 'vectorized', None)
+
+        self.function = function
+        self.vectorized = function if vectorized is True else vectorized or None
+        self.__name__ = getattr(function, '__name__', None) or repr(function)
+        self.__module__ = getattr(function, '__module__', None)
+        self.__doc__ = getattr(function, '__doc__', None)
+        self._check = None
+
+    def __call__(self, value) -> bool:
+        return self.function(value)
+
+    def __and__(self, other: Predicate) -> 'Condition':
+        return _And(self, _to_condition(other))
+
+    def __rand__(self, other: Predicate) -> 'Condition':
+        return _And(_to_condition(other), self)
+
+    def __or__(self, other: Predicate) -> 'Condition':
+        return _Or(self, _to_condition(other))
+
+    def __ror__(self, other: Predicate) -> 'Condition':
+        return _Or(_to_condition(other), self)
+
+    def __invert__(self) -> 'Condition':
+        return _Not(self)
+
+    def __repr__(self) -> str:
+        return self.__name__
+
+    def __reduce__(self):
+        # Module-level conditions are pickled by reference, like functions
+        module = sys.modules.get(self.__module__)
+        if getattr(module, self.__name__, None) is self:
+            return self.__name__
+
+        if self.vectorized is getattr(self.function, 'vectorized', None):
+            return type(self), (self.function,)
+
+        return type(self), (self.function, self.vectorized)
+
+    @property
+    def check(self) -> Predicate:
+        """
+        The plain function equivalent to this condition, with any combined
+        conditions compiled into a single expression.
+        """
+
+        if self.function is not None:
+            return self.function
+
+        if self._check is None:
+            functions = []
+            expression = self._expression(functions, 'value')
+            self._check = _compile(expression)(*functions)
+            self._check.__name__ = self.__name__
+
+        return self._check
+
+    def mask(self, values):
+        """
+        Returns a NumPy boolean array that is true where the condition holds
+        for ``values``, which may be an array or any sequence.
+
+        Uses the ``vectorized`` functions where given, and otherwise calls
+        :attr:`check` on each value. Unlike :attr:`check`, all operands of
+        ``&`` and ``|`` are evaluated for every value.
+
+        This requires NumPy, which can be installed with ``pip install yapytools[numpy]``.
+        """
+
+        np = _import_numpy()
+        values = np.asarray(values) if not isinstance(values, np.ndarray) else values
+
+        if self.vectorized is not None:
+            return np.asarray(self.vectorized(values), dtype=bool)
+
+        return np.fromiter(map(self.check, values), dtype=bool, count=len(values))
+
+    def _expression(self, functions: List[Predicate], argument: str) -> str:
+        """
+        Returns a Python expression evaluating this condition for the variable
+        named ``argument``, calling ``f0``, ``f1``, etc. Appends the functions
+        it calls to ``functions``, so they are numbered after any already in it.
+        """
+
+        functions.append(self.function)
+        return f'f{len(functions) - 1}({argument})'
+
+
+class _And(Condition):
+    _operator = 'and'
+
+    def __init__(self, left: Condition, right: Condition):
+        self.left, self.right = left, right
+        super().__init__(None)
+        self.__name__ = f'({left.__name__} & {right.__name__})'
+
+    def __call__(self, value) -> bool:
+        return self.check(value)
+
+    def __reduce__(self):
+        return type(self), (self.left, self.right)
+
+    def mask(self, values):
+        return self.left.mask(values) & self.right.mask(values)
+
+    def _expression(self, functions: List[Predicate], argument: str) -> str:
+        operands = [operand._expression(functions, argument) for operand in self._operands()]
+        return '(' + f' {self._operator} '.join(operands) + ')'
+
+    def _operands(self) -> List[Condition]:
+        """
+        Returns the operands of this condition, with directly nested
+        conditions of the same type flattened, so e.g. a long chain of ``&``
+        compiles to ``(f0(value) and f1(value) and ...)`` rather than deeply
+        nested parentheses, which the parser limits.
+        """
+
+        operands = []
+        stack = [self]
+        while stack:
+            condition_ = stack.pop()
+            if type(condition_) is type(self):
+                stack.append(condition_.right)
+                stack.append(condition_.left)
+            else:
+                operands.append(condition_)
+
+        return operands
+
+
+class _Or(_And):
+    _operator = 'or'
+
+    def __init__(self, left: Condition, right: Condition):
+        super().__init__(left, right)
+        self.__name__ = f'({left.__name__} | {right.__name__})'
+
+    def mask(self, values):
+        return self.left.mask(values) | self.right.mask(values)
+
+
+class _Not(Condition):
+    def __init__(self, operand: Condition):
+        self.operand = operand
+        super().__init__(None)
+        self.__name__ = f'~{operand.__name__}'
+
+    def __call__(self, value) -> bool:
+        return self.check(value)
+
+    def __reduce__(self):
+        return type(self), (self.operand,)
+
+    def mask(self, values):
+        return ~self.operand.mask(values)
+
+    def _expression(self, functions: List[Predicate], argument: str) -> str:
+        return f'(not {self.operand._expression(functions, argument)})'
+
+
+def as_function(predicate: Predicate) -> Predicate:
+    """
+    Returns the plain function to call for the predicate, i.e. the compiled
+    :attr:`Condition.check` of a condition, or the predicate itself.
+    """
+    return predicate.check if isinstance(predicate, Condition) else predicate
+
+
+def condition(function: Predicate = None, *, vectorized: Union[bool, Callable[[Any], Any]] = None):
+    """
+    Decorator turning a function into a :class:`Condition`.
+
+    Example:
+        >>> @condition(vectorized=True)
+        >>> def is_small(value) -> bool:
+        >>>     return abs(value) < 10
+    """
+
+    if function is None:
+        return lambda function_: Condition(function_, vectorized)
+
+    return Condition(function, vectorized)
+
+
+def filter_batch(predicate: Predicate, batch: Sequence[T]) -> Sequence[T]:
+    """
+    Returns the items of the batch for which the predicate holds.
+
+    If the batch is a NumPy array and the predicate a :class:`Condition` or
+    a function with a ``vectorized`` attribute, the result is the array
+    indexed by :meth:`Condition.mask`. Otherwise, the result is a list.
+    """
+
+    if _is_array(batch) and (isinstance(predicate, Condition) or hasattr(predicate, 'vectorized')):
+        return batch[_to_condition(predicate).mask(batch)]
+
+    return list(filter(as_function(predicate), batch))
+
+
+@lru_cache(maxsize=256)
+def _compile(expression: str) -> Callable[..., Predicate]:
+    """
+    Generates a factory taking the functions called by the expression and
+    returning a function evaluating it.
+    """
+
+    # plan imports this module, so import it when first needed
+    from yapytools.plan import compile_function
+
+    count = expression.count('(value)')
+    params = ', '.join(f'f{i}' for i in range(count))
+    return compile_function(
+        [
+            f'def factory({params}):',
+            '    def check(value):',
+            f'        return {expression}',
+            '    return check',
+        ],
+        'factory',
+    )
+
+
+def _vectorized(mask: Union[bool, Callable[[Any], Any]]) -> Callable[[Predicate], Predicate]:
+    """
+    Decorator setting the ``vectorized`` attribute that :class:`Condition`
+    uses by default, while keeping the predicate a plain function.
+    """
+
+    def decorator(function: Predicate) -> Predicate:
+        function.vectorized = function if mask is True else mask
+        return function
+
+    return decorator
+
+
+def _to_condition(predicate: Predicate) -> Condition:
+    return predicate if isinstance(predicate, Condition) else Condition(predicate)
+
+
+def _is_array(value) -> bool:
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            'Condition.mask() requires NumPy; '
+            'install it with: pip install yapytools[numpy]'
+        ) from e
+
+    return numpy
+
+
+@_vectorized(lambda values: ~values.astype(bool))
 def is_false(value) -> bool:
     return not bool(value)
 
 
+@_vectorized(lambda values: values.astype(bool))
 def is_true(value) -> bool:
     return bool(value)
 
@@ -21,33 +323,41 @@ def is_not_none(value) -> bool:
     return value is not None
 
 
+@_vectorized(True)
 def is_zero(value) -> bool:
     return value == 0
 
 
+@_vectorized(True)
 def is_not_zero(value) -> bool:
     return value != 0
 
 
+@_vectorized(True)
 def is_positive(value) -> bool:
     return value > 0
 
 
+@_vectorized(True)
 def is_negative(value) -> bool:
     return value < 0
 
 
+@_vectorized(True)
 def is_not_positive(value) -> bool:
     return value <= 0
 
 
+@_vectorized(True)
 def is_not_negative(value) -> bool:
     return value >= 0
 
 
+@_vectorized(True)
 def is_even(value: int) -> bool:
     return value % 2 == 0
 
 
+@_vectorized(True)
 def is_odd(value: int) -> bool:
     return value % 2 == 1
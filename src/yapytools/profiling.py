@@ -0,0 +1,191 @@
+"""
+Per-stage instrumentation for :class:`yapytools.Stream` pipelines.
+See :meth:`yapytools.Stream.instrument`.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from yapytools.plan import FILTER, MAP, Stage, describe
+
+
+class StageStats:
+    """Statistics recorded for a single map or filter stage."""
+
+    name: str
+    """Description of the stage, e.g. ``'filter(is_even)'``."""
+
+    items_in: int
+    """Number of items passed to the stage function."""
+
+    items_out: int
+    """Number of items the stage passed on to the next stage."""
+
+    wall_time: float
+    """Total wall-clock seconds spent in the stage function."""
+
+    cpu_time: float
+    """Total CPU seconds spent in the stage function, by the calling threads."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+    @property
+    def selectivity(self) -> Optional[float]:
+        """Fraction of items passed on, or ``None`` if no items were seen."""
+        return self.items_out / self.items_in if self.items_in else None
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Items processed per second of wall time, or ``None`` if unknown."""
+        return self.items_in / self.wall_time if self.wall_time else None
+
+    def to_dict(self) -> dict:
+        return dict(
+            name=self.name,
+            items_in=self.items_in,
+            items_out=self.items_out,
+            selectivity=self.selectivity,
+            wall_time=self.wall_time,
+            cpu_time=self.cpu_time,
+            throughput=self.throughput,
+        )
+
+
+class StreamProfile:
+    """
+    Statistics for each map and filter stage of an instrumented stream.
+
+    If a ``hook`` is given, it is called with :meth:`to_dict` every time the
+    instrumented stream has been consumed, e.g. to ship the metrics somewhere.
+    """
+
+    stages: List[StageStats]
+    """Statistics for each stage, in the order the stages were added."""
+
+    hook: Optional[Callable[[dict], None]]
+
+    def __init__(self, hook: Callable[[dict], None] = None):
+        self.stages = []
+        self.hook = hook
+        self._stats_by_stage: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+        self._running = 0
+
+    def register(self, stages: Sequence[Stage]) -> None:
+        """Adds statistics for any of the given stages not yet in this profile."""
+        for stage in stages:
+            self._stats(stage)
+
+    def instrument(self, stages: Sequence[Stage]) -> List[Stage]:
+        """
+        Returns the given stages with their functions wrapped to record
+        statistics in this profile.
+        """
+        return [self._instrument(stage) for stage in stages]
+
+    def started(self) -> None:
+        """Called when iteration over an instrumented stream starts."""
+        self._running += 1
+
+    def stopped(self) -> None:
+        """
+        Called when iteration over an instrumented stream stops. Calls the
+        hook once the outermost instrumented stream is done.
+        """
+
+        self._running -= 1
+        if self._running == 0 and self.hook is not None:
+            self.hook(self.to_dict())
+
+    def to_dict(self) -> dict:
+        """Returns the statistics as a dict, e.g. for serializing to JSON."""
+        return dict(stages=[stats.to_dict() for stats in self.stages])
+
+    def to_table(self) -> str:
+        """Returns the statistics as a human-readable table."""
+
+        header = ('stage', 'in', 'out', 'selectivity', 'wall s', 'cpu s', 'items/s')
+        rows = [header] + [
+            (
+                stats.name,
+                str(stats.items_in),
+                str(stats.items_out),
+                _format(stats.selectivity, '.1%'),
+                f'{stats.wall_time:.6f}',
+                f'{stats.cpu_time:.6f}',
+                _format(stats.throughput, ',.0f'),
+            )
+            for stats in self.stages
+        ]
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+
+        return '\n'.join(
+            '  '.join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in rows
+        )
+
+    def __str__(self) -> str:
+        return self.to_table()
+
+    def _stats(self, stage: Stage) -> StageStats:
+        # Keep the stage itself alive so its id is not reused
+        entry = self._stats_by_stage.get(id(stage))
+        if entry is None:
+            entry = (stage, StageStats(describe([stage])))
+            self._stats_by_stage[id(stage)] = entry
+            self.stages.append(entry[1])
+
+        return entry[1]
+
+    def _instrument(self, stage: Stage) -> Stage:
+        kind, function = stage
+        stats = self._stats(stage)
+        lock = self._lock
+        perf_counter = time.perf_counter
+        thread_time = time.thread_time
+
+        if kind == MAP:
+            def timed(item):
+                wall_start, cpu_start = perf_counter(), thread_time()
+                result = function(item)
+                wall, cpu = perf_counter() - wall_start, thread_time() - cpu_start
+
+                with lock:
+                    stats.items_in += 1
+                    stats.items_out += 1
+                    stats.wall_time += wall
+                    stats.cpu_time += cpu
+
+                return result
+        elif kind == FILTER:
+            def timed(item):
+                wall_start, cpu_start = perf_counter(), thread_time()
+                result = function(item)
+                wall, cpu = perf_counter() - wall_start, thread_time() - cpu_start
+
+                with lock:
+                    stats.items_in += 1
+                    stats.items_out += 1 if result else 0
+                    stats.wall_time += wall
+                    stats.cpu_time += cpu
+
+                return result
+        else:
+            raise ValueError(f'Unknown stage kind {kind!r}.')
+
+        timed.__name__ = getattr(function, '__name__', repr(function))
+        return kind, timed
+
+
+def _format(value: Optional[float], spec: str) -> str:
+    return '-' if value is None else format(value, spec)
@@ -0,0 +1,194 @@
+"""
+Single-pass random sampling of iterables whose size is not known up front,
+e.g. for monitoring huge streams. Memory stays ``O(k)`` regardless of the
+length of the input.
+"""
+
+import math
+import random
+import sys
+from itertools import islice
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+K = TypeVar('K', bound=Hashable)
+
+
+def sample(iterable: Iterable[T], k: int, seed=None) -> List[T]:
+    """
+    Returns a uniform random sample of ``k`` items from the iterable, or all of
+    the items if there are fewer than ``k``. The sample is not in any
+    particular order.
+
+    Uses reservoir sampling with Algorithm L, which jumps over the items that
+    will not be sampled instead of drawing a random number for each one, so
+    only ``O(k log(n / k))`` random numbers are drawn for ``n`` items.
+
+    Args:
+        iterable: The items to sample.
+        k: The number of items to sample.
+        seed: Seed for the random number generator, for reproducible samples.
+
+    Example:
+        >>> print(len(sample(range(1_000_000), 10, seed=0)))
+        10
+    """
+
+    _check_k(k)
+
+    rng = random.Random(seed)
+    iterator = iter(iterable)
+    reservoir = list(islice(iterator, k))
+    if len(reservoir) < k or not k:
+        return reservoir
+
+    w = _next_weight(rng, 1.0, k)
+    while True:
+        skip = _skip(rng, w)
+        item = next(islice(iterator, skip, None), _MISSING)
+        if item is _MISSING:
+            return reservoir
+
+        reservoir[rng.randrange(k)] = item
+        w = _next_weight(rng, w, k)
+
+
+def sample_by(
+        iterable: Iterable[T],
+        key_selector: Callable[[T], K],
+        k: int,
+        seed=None,
+) -> Dict[K, List[T]]:
+    """
+    Returns a stratified random sample of the iterable: a dict of each key
+    returned by ``key_selector`` mapped to a uniform random sample of up to
+    ``k`` items with that key.
+
+    Keeps a separate Algorithm L reservoir per key, so memory is ``O(k)`` per
+    distinct key.
+
+    Example:
+        >>> result = sample_by(range(100), lambda it: it % 2, 3, seed=0)
+        >>> print({key: len(items) for key, items in result.items()})
+        {0: 3, 1: 3}
+    """
+
+    _check_k(k)
+
+    if not k:
+        return {key_selector(item): [] for item in iterable}
+
+    rng = random.Random(seed)
+    reservoirs: Dict[K, _Reservoir] = {}
+
+    for item in iterable:
+        key = key_selector(item)
+        reservoir = reservoirs.get(key)
+        if reservoir is None:
+            reservoir = reservoirs[key] = _Reservoir(k, rng)
+
+        reservoir.add(item)
+
+    return {key: reservoir.items for key, reservoir in reservoirs.items()}
+
+
+def sample_fraction(iterable: Iterable[T], p: float, seed=None) -> Iterator[T]:
+    """
+    Returns an iterator over a random sample of the items, where each item is
+    included independently with probability ``p``. Items stay in their
+    original order.
+
+    The number of items to skip between samples is drawn from a geometric
+    distribution, so one random number is drawn per sampled item rather than
+    per input item.
+
+    Example:
+        >>> print(len(list(sample_fraction(range(1_000_000), 0.001, seed=0))))
+        960
+    """
+
+    if not 0 <= p <= 1:
+        raise ValueError(f'p must be between 0 and 1; got {p}.')
+
+    return _sample_fraction(iterable, p, random.Random(seed))
+
+
+class _Reservoir:
+    """An Algorithm L reservoir that is fed one item at a time."""
+
+    __slots__ = ('items', '_k', '_rng', '_w', '_skip')
+
+    def __init__(self, k: int, rng: random.Random):
+        self.items = []
+        self._k = k
+        self._rng = rng
+        self._w = 1.0
+        self._skip = 0
+
+    def add(self, item: T) -> None:
+        if len(self.items) < self._k:
+            self.items.append(item)
+            if len(self.items) == self._k:
+                self._next()
+        elif self._skip:
+            self._skip -= 1
+        else:
+            self.items[self._rng.randrange(self._k)] = item
+            self._next()
+
+    def _next(self) -> None:
+        self._w = _next_weight(self._rng, self._w, self._k)
+        self._skip = _skip(self._rng, self._w)
+
+
+def _sample_fraction(iterable: Iterable[T], p: float, rng: random.Random) -> Iterator[T]:
+    if p == 0:
+        return
+    if p == 1:
+        yield from iterable
+        return
+
+    iterator = iter(iterable)
+    log_q = math.log1p(-p)
+    while True:
+        skip = _to_count(math.log(_uniform(rng)) / log_q)
+        item = next(islice(iterator, skip, None), _MISSING)
+        if item is _MISSING:
+            return
+
+        yield item
+
+
+def _next_weight(rng: random.Random, w: float, k: int) -> float:
+    return w * math.exp(math.log(_uniform(rng)) / k)
+
+
+def _skip(rng: random.Random, w: float) -> int:
+    """Returns how many items to skip before the next one enters the reservoir."""
+
+    if w >= 1.0:
+        return 0
+
+    return _to_count(math.log(_uniform(rng)) / math.log1p(-w))
+
+
+def _to_count(value: float) -> int:
+    # islice() does not accept counts larger than sys.maxsize
+    return int(min(value, sys.maxsize))
+
+
+def _uniform(rng: random.Random) -> float:
+    """Returns a random float in the open interval (0, 1)."""
+
+    while True:
+        value = rng.random()
+        if value:
+            return value
+
+
+def _check_k(k: int) -> None:
+    if k < 0:
+        raise ValueError(f'k must be >= 0; got {k}.')
+
+
+_MISSING = object()
@@ -0,0 +1,437 @@
+"""
+Probabilistic data structures that summarize huge streams in fixed memory.
+"""
+
+import hashlib
+import heapq
+import itertools
+import math
+from array import array
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Tuple
+
+HashPair = Callable[[Any], Tuple[int, int]]
+
+
+class BloomFilter:
+    """
+    A set-like structure backed by a compact bit array that answers
+    membership queries approximately: it never reports a false negative, and
+    reports a false positive with probability of about ``error_rate`` once
+    ``capacity`` items have been added.
+
+    Example:
+        >>> bloom = BloomFilter(capacity=1_000_000, error_rate=0.001)
+        >>> bloom.add('foo')
+        True
+        >>> 'foo' in bloom
+        True
+        >>> 'bar' in bloom
+        False
+
+    Two filters with the same ``capacity``, ``error_rate`` and
+    ``hash_function`` can be combined with ``|`` to get a filter containing
+    the items of both.
+
+    Items are hashed with :func:`hash_pair` by default, so filters built in
+    different processes can be combined. For a filter used within a single
+    process, :func:`builtin_hash_pair` is much faster and matches ``==`` for
+    any hashable item.
+    """
+
+    capacity: int
+    error_rate: float
+    num_bits: int
+    num_hashes: int
+    hash_function: HashPair
+
+    def __init__(self, capacity: int, error_rate: float = 0.01, hash_function: HashPair = None):
+        if capacity < 1:
+            raise ValueError(f'capacity must be >= 1; got {capacity}.')
+        if not 0 < error_rate < 1:
+            raise ValueError(f'error_rate must be between 0 and 1; got {error_rate}.')
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.hash_function = hash_pair if hash_function is None else hash_function
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def __contains__(self, item) -> bool:
+        bits = self._bits
+        num_bits = self.num_bits
+        h1, h2 = self.hash_function(item)
+
+        for _ in range(self.num_hashes):
+            i = h1 % num_bits
+            if not bits[i >> 3] & (1 << (i & 7)):
+                return False
+            h1 += h2
+
+        return True
+
+    def __len__(self) -> int:
+        """Returns the number of items added that were not already present."""
+        return self._count
+
+    def __or__(self, other: 'BloomFilter') -> 'BloomFilter':
+        if (self.num_bits, self.num_hashes, self.hash_function) != (
+                other.num_bits, other.num_hashes, other.hash_function):
+            raise ValueError('Can only combine Bloom filters with the same capacity, error rate and hash function.')
+
+        result = BloomFilter(self.capacity, self.error_rate, self.hash_function)
+        result._bits = bytearray(a | b for a, b in zip(self._bits, other._bits))
+        result._count = self._count + other._count
+        return result
+
+    def add(self, item) -> bool:
+        """
+        Adds the item to the filter.
+        Returns ``True`` if the item was not (probably) already present.
+        """
+
+        bits = self._bits
+        num_bits = self.num_bits
+        h1, h2 = self.hash_function(item)
+        added = False
+
+        # Double hashing: derive all k indices from two hashes. Inlined
+        # rather than shared with __contains__, since this is the hot path
+        for _ in range(self.num_hashes):
+            i = h1 % num_bits
+            byte, mask = i >> 3, 1 << (i & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+            h1 += h2
+
+        if added:
+            self._count += 1
+
+        return added
+
+    def update(self, items: Iterable) -> None:
+        """Adds all the given items to the filter."""
+        for item in items:
+            self.add(item)
+
+
+class CountMinSketch:
+    """
+    Estimates how many times each item has been added, in fixed memory.
+    Estimates never undercount, and overcount by at most ``e / width`` of the
+    total count with probability ``1 - exp(-depth)``.
+
+    Example:
+        >>> sketch = CountMinSketch()
+        >>> sketch.update(['foo', 'bar', 'foo'])
+        >>> sketch['foo']
+        2
+
+    Two sketches with the same ``width`` and ``depth`` can be combined with
+    ``|`` to get a sketch of the items of both.
+    """
+
+    width: int
+    depth: int
+    total: int
+    """The sum of all counts added."""
+
+    def __init__(self, width: int = 2048, depth: int = 5):
+        if width < 1:
+            raise ValueError(f'width must be >= 1; got {width}.')
+        if depth < 1:
+            raise ValueError(f'depth must be >= 1; got {depth}.')
+
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows = [array('q', bytes(8 * width)) for _ in range(depth)]
+
+    def __getitem__(self, item) -> int:
+        """Returns the estimated count of the item."""
+        return min(row[i] for row, i in zip(self._rows, self._indices(item)))
+
+    def __or__(self, other: 'CountMinSketch') -> 'CountMinSketch':
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError('Can only combine Count-Min sketches with the same width and depth.')
+
+        result = CountMinSketch(self.width, self.depth)
+        result._rows = [
+            array('q', map(sum, zip(a, b)))
+            for a, b in zip(self._rows, other._rows)
+        ]
+        result.total = self.total + other.total
+        return result
+
+    def add(self, item, count: int = 1) -> None:
+        """Adds ``count`` occurrences of the item."""
+
+        for row, i in zip(self._rows, self._indices(item)):
+            row[i] += count
+
+        self.total += count
+
+    def update(self, items: Iterable) -> None:
+        """Adds one occurrence of each of the given items."""
+        for item in items:
+            self.add(item)
+
+    def _indices(self, item) -> Iterator[int]:
+        h1, h2 = hash_pair(item)
+        width = self.width
+        return ((h1 + i * h2) % width for i in range(self.depth))
+
+
+class HyperLogLog:
+    """
+    Estimates the number of distinct items added, in fixed memory.
+
+    Uses ``2 ** precision`` one-byte registers, and has a relative standard
+    error of about ``1.04 / sqrt(2 ** precision)``, e.g. 0.8% for the default
+    precision of 14, which takes 16 KiB.
+
+    Example:
+        >>> hll = HyperLogLog()
+        >>> hll.update(range(1_000_000))
+        >>> hll.count()
+        1005305
+
+    Two sketches with the same ``precision`` can be combined with ``|`` to get
+    a sketch of the items of both.
+    """
+
+    precision: int
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError(f'precision must be between 4 and 18; got {precision}.')
+
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def __or__(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        if self.precision != other.precision:
+            raise ValueError('Can only combine HyperLogLog sketches with the same precision.')
+
+        result = HyperLogLog(self.precision)
+        result._registers = bytearray(map(max, self._registers, other._registers))
+        return result
+
+    def add(self, item) -> None:
+        """Adds the item to the sketch."""
+
+        h, _ = hash_pair(item)
+        precision = self.precision
+        index = h & ((1 << precision) - 1)
+        # Position of the lowest set bit of the remaining hash bits
+        rest = h >> precision
+        rank = (rest & -rest).bit_length() if rest else 64 - precision + 1
+
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def count(self) -> int:
+        """Returns the estimated number of distinct items added."""
+
+        registers = self._registers
+        m = len(registers)
+        estimate = _hll_alpha(m) * m * m / sum(2.0 ** -r for r in registers)
+
+        zeros = registers.count(0)
+        if zeros and estimate <= 2.5 * m:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+
+        return round(estimate)
+
+    def update(self, items: Iterable) -> None:
+        """Adds all the given items to the sketch."""
+        for item in items:
+            self.add(item)
+
+
+class SpaceSaving:
+    """
+    Tracks the approximately most frequent items, keeping counters for at most
+    ``capacity`` items.
+
+    Every item occurring more than ``total / capacity`` times is guaranteed to
+    be tracked, and each tracked count overestimates the true count by at most
+    the item's :meth:`error`.
+
+    Example:
+        >>> top = SpaceSaving(capacity=100)
+        >>> top.update('abracadabra')
+        >>> top.top(2)
+        [('a', 5), ('b', 2)]
+
+    Two summaries can be combined with ``|`` to get a summary of the items of
+    both, with the capacity of the larger one.
+    """
+
+    capacity: int
+    total: int
+    """The sum of all counts added."""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f'capacity must be >= 1; got {capacity}.')
+
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        # Min-heap of (count, tiebreak, item), which may hold outdated entries
+        self._heap: List[tuple] = []
+        self._tiebreak = itertools.count()
+
+    def __getitem__(self, item) -> int:
+        """Returns the estimated count of the item, or 0 if it is not tracked."""
+        return self._counts.get(item, 0)
+
+    def __len__(self) -> int:
+        """Returns the number of tracked items."""
+        return len(self._counts)
+
+    def __or__(self, other: 'SpaceSaving') -> 'SpaceSaving':
+        counts, errors = {}, {}
+        self_min, other_min = self._min_count(), other._min_count()
+
+        for item in self._counts.keys() | other._counts.keys():
+            # An untracked item may have occurred up to the minimum count times
+            counts[item] = self._counts.get(item, self_min) + other._counts.get(item, other_min)
+            errors[item] = (
+                self._errors.get(item, self_min)
+                + other._errors.get(item, other_min)
+            )
+
+        result = SpaceSaving(max(self.capacity, other.capacity))
+        result.total = self.total + other.total
+        for item in heapq.nlargest(result.capacity, counts, key=counts.__getitem__):
+            result._counts[item] = counts[item]
+            result._errors[item] = errors[item]
+
+        result._rebuild_heap()
+        return result
+
+    def add(self, item, count: int = 1) -> None:
+        """Adds ``count`` occurrences of the item."""
+
+        counts = self._counts
+        self.total += count
+
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self._errors[item] = 0
+        else:
+            # Replace the least frequent item, inheriting its count as error
+            min_count, min_item = self._pop_min()
+            del counts[min_item]
+            del self._errors[min_item]
+            counts[item] = min_count + count
+            self._errors[item] = min_count
+
+        heapq.heappush(self._heap, (counts[item], next(self._tiebreak), item))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def error(self, item) -> int:
+        """
+        Returns how much the item's count may be overestimated by, or 0 if it
+        is not tracked.
+        """
+        return self._errors.get(item, 0)
+
+    def top(self, n: int = None) -> List[Tuple[Any, int]]:
+        """
+        Returns up to ``n`` (default all) tracked items and their estimated
+        counts, most frequent first.
+        """
+
+        n = len(self._counts) if n is None else n
+        return heapq.nlargest(n, self._counts.items(), key=lambda entry: entry[1])
+
+    def update(self, items: Iterable) -> None:
+        """Adds one occurrence of each of the given items."""
+        for item in items:
+            self.add(item)
+
+    def _min_count(self) -> int:
+        if len(self._counts) < self.capacity:
+            return 0
+
+        return min(self._counts.values())
+
+    def _pop_min(self) -> Tuple[int, Any]:
+        heap, counts = self._heap, self._counts
+        while True:
+            count, _, item = heapq.heappop(heap)
+            if counts.get(item) == count:
+                return count, item
+
+    def _rebuild_heap(self) -> None:
+        tiebreak = self._tiebreak
+        self._heap = [(count, next(tiebreak), item) for item, count in self._counts.items()]
+        heapq.heapify(self._heap)
+
+
+def _hll_alpha(m: int) -> float:
+    if m == 16:
+        return 0.673
+    if m == 32:
+        return 0.697
+    if m == 64:
+        return 0.709
+    return 0.7213 / (1 + 1.079 / m)
+
+
+def builtin_hash_pair(value: Hashable) -> Tuple[int, int]:
+    """
+    Returns two hashes of the value derived from the builtin ``hash``, for
+    sketches used within a single process. Values that are equal, like ``1``
+    and ``1.0``, get the same hashes.
+
+    The builtin ``hash`` of strings and bytes depends on ``PYTHONHASHSEED``,
+    so unlike :func:`hash_pair`, the result may differ between processes.
+    """
+
+    h = hash(value)
+    # Hashing a tuple mixes the bits, so the second hash is independent of
+    # the first even for small ints, whose hash is the int itself
+    return h, hash((h, _SECOND_HASH_SALT))
+
+
+def hash_pair(value: Any) -> Tuple[int, int]:
+    """
+    Returns two independent 64-bit hashes of the value.
+
+    Unlike the builtin ``hash``, the result does not depend on
+    ``PYTHONHASHSEED``, so sketches built in different processes agree.
+
+    Strings, bytes and ints are hashed by value; anything else is hashed by
+    its ``repr``. So unlike the builtin ``hash``, this does not match ``==``
+    for other types: equal values with different reprs, like ``1.0`` and
+    ``1``, get different hashes, and distinct values with the same repr get
+    the same hashes. Objects with the default ``repr`` are hashed by their
+    memory address, which can be reused once they are garbage collected.
+    """
+
+    digest = hashlib.blake2b(_to_bytes(value), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+
+
+def _to_bytes(value: Any) -> bytes:
+    if isinstance(value, str):
+        return b's' + value.encode('utf-8', 'surrogatepass')
+    if isinstance(value, bytes):
+        return b'b' + value
+    if isinstance(value, int):
+        return b'i' + value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+    return b'r' + repr(value).encode('utf-8', 'surrogatepass')
+
+
+_SECOND_HASH_SALT = 0x9E3779B97F4A7C15
@@ -0,0 +1,168 @@
+"""
+Sliding window operators over iterables, e.g. for rolling computations over
+time series.
+
+The rolling aggregations update their result incrementally as the window
+slides, so each item costs ``O(1)`` amortized time regardless of the window
+size.
+"""
+
+import operator
+from collections import deque
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+def pairwise(iterable: Iterable[T]) -> Iterator[Tuple[T, T]]:
+    """
+    Returns an iterator over successive overlapping pairs of items.
+
+    Example:
+        >>> print(list(pairwise('abcd')))
+        [('a', 'b'), ('b', 'c'), ('c', 'd')]
+    """
+
+    iterator = iter(iterable)
+    prev = next(iterator, _EMPTY)
+    if prev is _EMPTY:
+        return
+
+    for item in iterator:
+        yield prev, item
+        prev = item
+
+
+def rolling_max(iterable: Iterable[T], size: int) -> Iterator[T]:
+    """
+    Returns an iterator over the largest item in each window of ``size``
+    consecutive items, starting with the first full window.
+    """
+    _check_size(size)
+    return _rolling_extreme(iterable, size, operator.le)
+
+
+def rolling_mean(iterable: Iterable[T], size: int) -> Iterator[float]:
+    """
+    Returns an iterator over the mean of each window of ``size`` consecutive
+    items, starting with the first full window.
+    """
+    return (total / size for total in rolling_sum(iterable, size))
+
+
+def rolling_min(iterable: Iterable[T], size: int) -> Iterator[T]:
+    """
+    Returns an iterator over the smallest item in each window of ``size``
+    consecutive items, starting with the first full window.
+
+    Example:
+        >>> print(list(rolling_min([4, 2, 3, 5, 1], 3)))
+        [2, 2, 1]
+    """
+    _check_size(size)
+    return _rolling_extreme(iterable, size, operator.ge)
+
+
+def rolling_sum(iterable: Iterable[T], size: int) -> Iterator[T]:
+    """
+    Returns an iterator over the sum of each window of ``size`` consecutive
+    items, starting with the first full window.
+
+    The sum is updated by adding the new item and subtracting the one leaving
+    the window, so float sums may slowly accumulate rounding error.
+
+    Example:
+        >>> print(list(rolling_sum([1, 2, 3, 4, 5], 3)))
+        [6, 9, 12]
+    """
+    _check_size(size)
+    return _rolling_sum(iterable, size)
+
+
+def windowed(iterable: Iterable[T], size: int, step: int = 1) -> Iterator[Tuple[T, ...]]:
+    """
+    Returns an iterator over tuples of ``size`` consecutive items, starting a
+    new window every ``step`` items. Trailing items that do not fill a whole
+    window are dropped.
+
+    Use ``step=size`` for non-overlapping (tumbling) windows.
+
+    Example:
+        >>> print(list(windowed(range(6), 3)))
+        [(0, 1, 2), (1, 2, 3), (2, 3, 4), (3, 4, 5)]
+        >>> print(list(windowed(range(6), 2, step=3)))
+        [(0, 1), (3, 4)]
+    """
+
+    _check_size(size)
+    if step < 1:
+        raise ValueError(f'step must be >= 1; got {step}.')
+
+    return _windowed(iterable, size, step)
+
+
+def _windowed(iterable: Iterable[T], size: int, step: int) -> Iterator[Tuple[T, ...]]:
+    iterator = iter(iterable)
+    window = deque(islice(iterator, size), maxlen=size)
+    if len(window) < size:
+        return
+
+    yield tuple(window)
+
+    append = window.append
+    while True:
+        appended = 0
+        for item in islice(iterator, step):
+            append(item)
+            appended += 1
+
+        if appended < step:
+            return
+
+        yield tuple(window)
+
+
+def _rolling_sum(iterable: Iterable[T], size: int) -> Iterator[T]:
+    window = deque()
+    total = 0
+
+    for item in iterable:
+        window.append(item)
+        total += item
+
+        if len(window) > size:
+            total -= window.popleft()
+
+        if len(window) == size:
+            yield total
+
+
+def _rolling_extreme(
+        iterable: Iterable[T],
+        size: int,
+        is_dominated: Callable[[T, T], bool],
+) -> Iterator[T]:
+    # Monotonic deque of (index, item): items that can never be the extreme
+    # of a later window, because a newer item beats them, are dropped
+    candidates = deque()
+
+    for index, item in enumerate(iterable):
+        while candidates and is_dominated(candidates[-1][1], item):
+            candidates.pop()
+
+        candidates.append((index, item))
+
+        if candidates[0][0] <= index - size:
+            candidates.popleft()
+
+        if index >= size - 1:
+            yield candidates[0][1]
+
+
+def _check_size(size: int) -> None:
+    if size < 1:
+        raise ValueError(f'size must be >= 1; got {size}.')
+
+
+_EMPTY = object()
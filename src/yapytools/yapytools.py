@@ -3,25 +3,118 @@ Yet Another Python Tools Library (yapytools) is a collection of useful Python
 utilities not found in the standard library.
 """
 
+import heapq
 import itertools
+import math
 import operator
+import queue
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache, partial
 from typing import (
+    Any,
     Callable,
     Dict,
+    Hashable,
     Iterable,
+    Iterator,
     List,
     Optional,
     Sequence,
+    Sized,
     Tuple,
     TypeVar,
     Union, Set,
 )
 
-from yapytools.predicates import is_not_none, Predicate
+from yapytools import buffers as _buffers
+from yapytools import caching as _caching
+from yapytools import files as _files
+from yapytools import parallel as _parallel
+from yapytools import sampling as _sampling
+from yapytools import windows as _windows
+from yapytools.aggregators import Aggregator
+from yapytools.buffers import chunked
+from yapytools.caching import Cache
+from yapytools.plan import FILTER, MAP, Stage, compile_function, describe, fuse, nest_calls
+from yapytools.predicates import as_function, filter_batch, is_not_none, Predicate
+from yapytools.profiling import StreamProfile
+from yapytools.sketches import BloomFilter, HyperLogLog, SpaceSaving, builtin_hash_pair
 
 T = TypeVar('T')
 K = TypeVar('K')
 V = TypeVar('V')
+R = TypeVar('R')
+
+
+def aggregate_by(
+        iterable: Iterable[T],
+        key_selector: Callable[[T], K],
+        aggregator: Aggregator[V, Any, R],
+        value_transform: Callable[[T], V] = None,
+) -> Dict[K, R]:
+    """
+    Groups elements of the iterable by the key returned by the given
+    ``key_selector`` function, and returns a dict of each group key associated
+    with the result of the ``aggregator`` applied to the group's values.
+
+    Values are folded into the aggregator state as they arrive, so only one
+    state per key is kept in memory instead of a list per key as in
+    :func:`group_by_to`. Values are the elements themselves, or the results
+    of ``value_transform`` applied to them if given.
+
+    Example:
+        >>> from yapytools.aggregators import Sum
+        >>> from yapytools.predicates import is_even
+        >>> aggregate_by(
+        ...     range(10),
+        ...     lambda it: 'even' if is_even(it) else 'odd',
+        ...     Sum(),
+        ... )
+        {'even': 20, 'odd': 25}
+
+    See :mod:`yapytools.aggregators` for the built-in aggregators.
+    """
+
+    start = aggregator.start
+    add = aggregator.add
+    states = {}
+
+    for item in iterable:
+        key = key_selector(item)
+        value = item if value_transform is None else value_transform(item)
+
+        state = states.get(key, _MISSING)
+        states[key] = start(value) if state is _MISSING else add(state, value)
+
+    result = aggregator.result
+    return {key: result(state) for key, state in states.items()}
+
+
+_MISSING = object()
+_NO_DEFAULT = object()
+
+
+def anti_join(
+        left: Iterable[T],
+        right: Iterable[V],
+        left_key: Callable[[T], K],
+        right_key: Callable[[V], K] = None,
+) -> Iterator[T]:
+    """
+    Returns an iterator over the items of ``left`` whose key does not match the
+    key of any item in ``right``. See :func:`semi_join`.
+    """
+
+    right_key = left_key if right_key is None else right_key
+
+    keys = set(map(right_key, right))
+    for item in left:
+        if left_key(item) not in keys:
+            yield item
 
 
 def associate(
@@ -81,30 +174,328 @@ def associate_with(
     )
 
 
+def batched(
+        iterable: Iterable[T],
+        size: int,
+        max_wait: float = None,
+) -> Iterator[List[T]]:
+    """
+    Like :func:`chunked`, but if ``max_wait`` seconds is given, a partial batch
+    is also yielded once that much time has passed since its first item
+    arrived, so slow inputs do not hold items back indefinitely.
+
+    With ``max_wait``, the iterable is consumed in a background thread.
+
+    Example:
+        >>> for batch in batched(socket_messages, 100, max_wait=0.5):
+        >>>     database.insert_many(batch)
+    """
+
+    if max_wait is None:
+        return chunked(iterable, size)
+
+    if size < 1:
+        raise ValueError(f'size must be >= 1; got {size}.')
+
+    return _batched_with_timeout(iterable, size, max_wait)
+
+
+def _batched_with_timeout(iterable: Iterable[T], size: int, max_wait: float) -> Iterator[List[T]]:
+    items = queue.Queue(maxsize=2 * size)
+    stopped = threading.Event()
+
+    def produce() -> None:
+        message = _END
+        try:
+            for item in iterable:
+                if not _put_until_stopped(items, item, stopped):
+                    return
+        except BaseException as e:
+            message = _Error(e)
+
+        _put_until_stopped(items, message, stopped)
+
+    threading.Thread(target=produce, daemon=True).start()
+
+    batch = []
+    deadline = None
+    try:
+        while True:
+            try:
+                timeout = None if not batch else max(0.0, deadline - time.monotonic())
+                item = items.get(timeout=timeout)
+            except queue.Empty:
+                yield batch
+                batch = []
+                continue
+
+            if item is _END:
+                break
+            if isinstance(item, _Error):
+                raise item.error
+
+            if not batch:
+                deadline = time.monotonic() + max_wait
+
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+    finally:
+        stopped.set()
+
+
+def _put_until_stopped(items: queue.Queue, item, stopped: threading.Event) -> bool:
+    while not stopped.is_set():
+        try:
+            items.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+
+    return False
+
+
+class _Error:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_END = object()
+
+
+def cogroup(
+        left: Iterable[T],
+        right: Iterable[V],
+        left_key: Callable[[T], K],
+        right_key: Callable[[V], K] = None,
+) -> Iterator[Tuple[K, List[T], List[V]]]:
+    """
+    Groups both iterables by key, and yields ``(key, left_items, right_items)``
+    for every key in either iterable. Keys only in ``left`` are yielded first,
+    in the order they first occur in ``left``, followed by keys only in
+    ``right``.
+
+    ``right_key`` defaults to ``left_key``.
+
+    Example:
+        >>> for key, lefts, rights in cogroup(
+        ...         [1, 2, 3, 4],
+        ...         [10, 30, 50],
+        ...         left_key=lambda it: it % 2,
+        ...         right_key=lambda it: it // 10 % 2,
+        ... ):
+        ...     print(key, lefts, rights)
+        1 [1, 3] [10, 30, 50]
+        0 [2, 4] []
+    """
+
+    right_key = left_key if right_key is None else right_key
+
+    left_groups = group_by(left, left_key)
+    right_groups = group_by(right, right_key)
+
+    for key, left_items in left_groups.items():
+        yield key, left_items, right_groups.pop(key, [])
+
+    for key, right_items in right_groups.items():
+        yield key, [], right_items
+
+
 def count(
         iterable: Iterable[K],
         predicate: Callable[[K], bool],
+        workers: int = None,
+        **options,
 ) -> int:
     """
     Returns the number of elements matching the given predicate.
 
+    If ``workers`` is given, the predicate is evaluated across a pool of that
+    many workers, configured by ``options``. See
+    :func:`yapytools.parallel.parallel_count`.
+
     Inspired by Kotlin's `count <https://kotlinlang.org/api/latest/jvm/stdlib/kotlin.collections/count.html>`_
     function.
     """
 
+    if workers is not None:
+        return _parallel.parallel_count(predicate, iterable, workers=workers, **options)
+
+    predicate = as_function(predicate)
+
     return sum(
         1 for item in iterable if predicate(item)
     )
 
 
+def external_group_by(
+        iterable: Iterable[T],
+        key_selector: Callable[[T], K],
+        value_transform: Callable[[T], V] = None,
+        max_memory_bytes: int = 256 * 1024 * 1024,
+        partitions: int = 64,
+) -> Iterator[Tuple[K, Iterator[V]]]:
+    """
+    Like :func:`group_by_to`, but for inputs whose groups do not fit in
+    memory. Yields ``(key, values)`` pairs, where ``values`` is an iterator
+    over the values of that group in the order they occurred.
+
+    Groups are built in memory until their estimated size exceeds
+    ``max_memory_bytes``, at which point they are spilled to one of
+    ``partitions`` temporary files chosen by the hash of the key. Once the
+    input is exhausted, each partition is read back and grouped in turn, so
+    only one partition needs to fit in memory at a time.
+
+    The memory estimate uses ``sys.getsizeof``, so it does not account for
+    objects referenced by the keys and values.
+
+    If nothing was spilled, groups are yielded in the order their keys first
+    occurred; otherwise the order of the keys is unspecified.
+
+    Example:
+        >>> from yapytools.predicates import is_even
+        >>> for key, values in external_group_by(
+        ...         range(10),
+        ...         lambda it: 'even' if is_even(it) else 'odd',
+        ...         max_memory_bytes=1024,
+        ... ):
+        ...     print(key, list(values))
+        even [0, 2, 4, 6, 8]
+        odd [1, 3, 5, 7, 9]
+    """
+
+    if partitions < 1:
+        raise ValueError(f'partitions must be >= 1; got {partitions}.')
+
+    groups = {}
+    memory_used = 0
+    files = []
+
+    try:
+        for item in iterable:
+            key = key_selector(item)
+            value = item if value_transform is None else value_transform(item)
+
+            values = groups.get(key)
+            if values is None:
+                groups[key] = [value]
+                memory_used += sys.getsizeof(key) + _GROUP_OVERHEAD_BYTES
+            else:
+                values.append(value)
+
+            memory_used += sys.getsizeof(value) + _LIST_SLOT_BYTES
+
+            if memory_used > max_memory_bytes:
+                if not files:
+                    files = [tempfile.TemporaryFile() for _ in range(partitions)]
+
+                for key, values in groups.items():
+                    _buffers.spill(files[hash(key) % partitions], (key, values))
+
+                groups.clear()
+                memory_used = 0
+
+        if not files:
+            for key, values in groups.items():
+                yield key, iter(values)
+
+            return
+
+        for key, values in groups.items():
+            _buffers.spill(files[hash(key) % partitions], (key, values))
+
+        groups.clear()
+
+        for file in files:
+            for key, values in _buffers.unspill(file):
+                if key in groups:
+                    groups[key].extend(values)
+                else:
+                    groups[key] = values
+
+            file.close()
+
+            for key, values in groups.items():
+                yield key, iter(values)
+
+            groups.clear()
+    finally:
+        for file in files:
+            file.close()
+
+
+_GROUP_OVERHEAD_BYTES = 128
+_LIST_SLOT_BYTES = 8
+
+
+def external_sorted(
+        iterable: Iterable[T],
+        key: Callable[[T], Any] = None,
+        reverse: bool = False,
+        max_memory_items: int = 1_000_000,
+) -> Iterator[T]:
+    """
+    Like the builtin ``sorted``, but for inputs that do not fit in memory,
+    and lazy: nothing is read until the first item is requested.
+
+    The input is read in runs of ``max_memory_items``, and each run is sorted
+    and spilled to a temporary file. The sorted runs are then merged lazily
+    with ``heapq.merge``. If the input fits in a single run, nothing is
+    written to disk.
+
+    While merging, a small buffer of items from every run is kept in memory.
+    Like ``sorted``, the sort is stable.
+    """
+
+    if max_memory_items < 1:
+        raise ValueError(f'max_memory_items must be >= 1; got {max_memory_items}.')
+
+    runs = chunked(iterable, max_memory_items)
+
+    first_run = next(runs, [])
+    second_run = next(runs, None)
+    if second_run is None:
+        first_run.sort(key=key, reverse=reverse)
+        yield from first_run
+        return
+
+    files = []
+    try:
+        for run in itertools.chain([first_run, second_run], runs):
+            run.sort(key=key, reverse=reverse)
+
+            file = tempfile.TemporaryFile()
+            files.append(file)
+
+            for batch in chunked(run, _buffers.SPILL_BATCH_SIZE):
+                _buffers.spill(file, batch)
+
+        # Free the in-memory runs before merging
+        del first_run, second_run, run
+
+        yield from heapq.merge(
+            *(flatten(_buffers.unspill(file)) for file in files),
+            key=key,
+            reverse=reverse,
+        )
+    finally:
+        for file in files:
+            file.close()
+
+
 def filter_not_none(iterable: Iterable[T]) -> Iterable[T]:
     """Filter out None values from iterable."""
-    return filter(is_not_none, iterable)
+    return filter(as_function(is_not_none), iterable)
 
 
 def filters(iterable: Iterable, *functions: Callable) -> Iterable:
     """
     Returns an iterator that applies the given filters to the iterable.
+    Like the builtin ``filter``, ``None`` keeps the truthy items.
 
     Example:
         >>> from yapytools.predicates import is_even
@@ -117,21 +508,33 @@ def filters(iterable: Iterable, *functions: Callable) -> Iterable:
         [4, 6, 8]
     """
 
-    for function in functions:
-        iterable = filter(function, iterable)
-
-    yield from iterable
+    return fuse([(FILTER, bool if function is None else function) for function in functions])(iterable)
 
 
-def find(iterable: Iterable[T], predicate: Callable[[T], bool]) -> Optional[T]:
+def find(
+        iterable: Iterable[T],
+        predicate: Callable[[T], bool],
+        workers: int = None,
+        **options,
+) -> Optional[T]:
     """
     Returns the first element matching the given predicate,
     or ``None`` if no such element was found.
 
+    If ``workers`` is given, the predicate is evaluated across a pool of that
+    many workers, configured by ``options``, and the same element is returned.
+    Outstanding work is cancelled once the first match is known. See
+    :func:`yapytools.parallel.parallel_find`.
+
     Inspired by Kotlin's `find <https://kotlinlang.org/api/latest/jvm/stdlib/kotlin.collections/find.html>`_
     function.
     """
 
+    if workers is not None:
+        return _parallel.parallel_find(predicate, iterable, workers=workers, **options)
+
+    predicate = as_function(predicate)
+
     for item in iterable:
         if predicate(item):
             return item
@@ -142,30 +545,36 @@ def find(iterable: Iterable[T], predicate: Callable[[T], bool]) -> Optional[T]:
 def find_last(
         iterable: Iterable[T],
         predicate: Callable[[T], bool],
+        workers: int = None,
+        **options,
 ) -> Optional[T]:
     """
     Returns the last element matching the given predicate,
     or ``None`` if no such element was found.
 
+    Inputs that can be reversed, e.g. sequences, dict views and deques, are
+    traversed backwards. See :func:`yapytools.buffers.is_reversible`.
+
+    If ``workers`` is given, the predicate is evaluated across a pool of that
+    many workers, configured by ``options``. See
+    :func:`yapytools.parallel.parallel_find_last`.
+
     Inspired by Kotlin's `findLast <https://kotlinlang.org/api/latest/jvm/stdlib/kotlin.collections/find-last.html>`_
     function.
     """
 
-    last_item = None
+    if workers is not None:
+        return _parallel.parallel_find_last(predicate, iterable, workers=workers, **options)
 
-    # Traverse sequences backwards and return first matching item
-    if isinstance(iterable, Sequence):
-        for i in range(len(iterable) - 1, -1, -1):
-            item = iterable[i]
-            if predicate(item):
-                return item
-    # Otherwise, have to iterate over all items
-    else:
-        for item in iterable:
-            if predicate(item):
-                last_item = item
+    predicate = as_function(predicate)
+
+    # Traverse reversible inputs backwards and return the first matching item
+    if _buffers.is_reversible(iterable):
+        return next(filter(predicate, reversed(iterable)), None)
 
-    return last_item
+    # Otherwise, have to iterate over all items, keeping only the last match
+    last_items = deque(filter(predicate, iterable), maxlen=1)
+    return last_items[0] if last_items else None
 
 
 def flatten(iterable: Iterable[Iterable[T]]) -> Iterable[T]:
@@ -249,6 +658,176 @@ def identity(value: T) -> T:
     return value
 
 
+def join(
+        left: Iterable[T],
+        right: Iterable[V],
+        left_key: Callable[[T], K],
+        right_key: Callable[[V], K] = None,
+        how: str = 'inner',
+        method: str = 'hash',
+) -> Iterator[Tuple[Optional[T], Optional[V]]]:
+    """
+    Returns an iterator over ``(left_item, right_item)`` pairs whose keys match.
+    ``right_key`` defaults to ``left_key``.
+
+    ``how`` is one of:
+
+    - ``'inner'``: Only matching pairs are yielded.
+    - ``'left'``: Left items with no match are also yielded as ``(left_item, None)``.
+    - ``'outer'``: Like ``'left'``, and right items with no match are also
+      yielded as ``(None, right_item)``, at the end.
+
+    ``method`` is one of:
+
+    - ``'hash'``: A hash table is built on one side with :func:`group_by`,
+      and the other side is streamed. The table is built on ``right``, unless
+      it is an inner join and both sides have a known length and ``left`` is
+      smaller, in which case pairs are yielded in the order of ``right``.
+    - ``'merge'``: Both sides must already be sorted by key, in ascending
+      order. Matching groups are found by stepping through both sides
+      together, so only one group of right items is kept in memory.
+
+    Example:
+        >>> users = [{'id': 1, 'name': 'Ann'}, {'id': 2, 'name': 'Bob'}]
+        >>> orders = [{'user_id': 1, 'item': 'hat'}, {'user_id': 1, 'item': 'cat'}]
+        >>> for user, order in join(
+        ...         users,
+        ...         orders,
+        ...         left_key=lambda it: it['id'],
+        ...         right_key=lambda it: it['user_id'],
+        ...         how='left',
+        ... ):
+        ...     print(user['name'], order and order['item'])
+        Ann hat
+        Ann cat
+        Bob None
+    """
+
+    if how not in JOIN_HOWS:
+        raise ValueError(f'Invalid how {how!r}; must be one of {JOIN_HOWS}.')
+
+    if method not in JOIN_METHODS:
+        raise ValueError(f'Invalid method {method!r}; must be one of {JOIN_METHODS}.')
+
+    right_key = left_key if right_key is None else right_key
+
+    if method == 'merge':
+        return _merge_join(left, right, left_key, right_key, how)
+
+    return _hash_join(left, right, left_key, right_key, how)
+
+
+JOIN_HOWS = ('inner', 'left', 'outer')
+JOIN_METHODS = ('hash', 'merge')
+
+
+def _hash_join(
+        left: Iterable[T],
+        right: Iterable[V],
+        left_key: Callable[[T], K],
+        right_key: Callable[[V], K],
+        how: str,
+) -> Iterator[Tuple[Optional[T], Optional[V]]]:
+    left_size, right_size = _size_hint(left), _size_hint(right)
+
+    if how == 'inner' and left_size is not None and right_size is not None and left_size < right_size:
+        left_groups = group_by(left, left_key)
+
+        for right_item in right:
+            for left_item in left_groups.get(right_key(right_item), ()):
+                yield left_item, right_item
+
+        return
+
+    right_groups = group_by(right, right_key)
+    matched_keys = set() if how == 'outer' else None
+
+    for left_item in left:
+        key = left_key(left_item)
+        right_items = right_groups.get(key)
+
+        if right_items is None:
+            if how != 'inner':
+                yield left_item, None
+            continue
+
+        if matched_keys is not None:
+            matched_keys.add(key)
+
+        for right_item in right_items:
+            yield left_item, right_item
+
+    if matched_keys is not None:
+        for key, right_items in right_groups.items():
+            if key not in matched_keys:
+                for right_item in right_items:
+                    yield None, right_item
+
+
+def _merge_join(
+        left: Iterable[T],
+        right: Iterable[V],
+        left_key: Callable[[T], K],
+        right_key: Callable[[V], K],
+        how: str,
+) -> Iterator[Tuple[Optional[T], Optional[V]]]:
+    left_groups = itertools.groupby(left, left_key)
+    right_groups = itertools.groupby(right, right_key)
+
+    left_group = next(left_groups, None)
+    right_group = next(right_groups, None)
+
+    while left_group is not None and right_group is not None:
+        left_group_key, left_items = left_group
+        right_group_key, right_items = right_group
+
+        # Equal keys are matched first, so keys like None that can not be
+        # ordered only need to be comparable with different keys
+        if left_group_key == right_group_key:
+            right_items = list(right_items)
+            for left_item in left_items:
+                for right_item in right_items:
+                    yield left_item, right_item
+
+            left_group = next(left_groups, None)
+            right_group = next(right_groups, None)
+        elif left_group_key < right_group_key:
+            if how != 'inner':
+                for left_item in left_items:
+                    yield left_item, None
+
+            left_group = next(left_groups, None)
+        else:
+            if how == 'outer':
+                for right_item in right_items:
+                    yield None, right_item
+
+            right_group = next(right_groups, None)
+
+    if how != 'inner':
+        while left_group is not None:
+            for left_item in left_group[1]:
+                yield left_item, None
+
+            left_group = next(left_groups, None)
+
+    if how == 'outer':
+        while right_group is not None:
+            for right_item in right_group[1]:
+                yield None, right_item
+
+            right_group = next(right_groups, None)
+
+
+def _size_hint(iterable: Iterable) -> Optional[int]:
+    """Returns the length of the iterable if it is known without iterating it."""
+
+    while isinstance(iterable, Stream) and not iterable._stages:
+        iterable = iterable.iterable
+
+    return len(iterable) if isinstance(iterable, Sized) else None
+
+
 def maps(iterable: Iterable, *functions: Callable) -> Iterable:
     """
     Returns an iterator that applies the given functions to each item in the
@@ -264,29 +843,121 @@ def maps(iterable: Iterable, *functions: Callable) -> Iterable:
         [20, 22, 24, 26, 28]
     """
 
-    for function in functions:
-        iterable = map(function, iterable)
+    return fuse([(MAP, function) for function in functions])(iterable)
 
-    yield from iterable
 
-
-def pipe(function0: Callable, *functions: Callable) -> Callable:
+def pipe(
+        function0: Callable,
+        *functions: Callable,
+        compile: bool = False,
+        memoize: Cache = None,
+) -> Callable:
     """
     Create a function that pipes the given functions together.
+
+    Args:
+        function0: The first function, which is called with all the args.
+        functions: The other functions, each called with the previous result.
+        compile: Whether to generate a straight-line function calling each
+            function in turn, instead of looping over them on every call.
+        memoize: A cache, e.g. :class:`yapytools.caching.LRU` or
+            :class:`yapytools.caching.TTL`, for the results keyed by the args.
+            Calls with unhashable args are not cached.
+
+    The returned function has a ``stages`` attribute with the functions, and a
+    ``profile()`` method returning an uncached copy of it that records how
+    long each function takes, in its ``stats`` attribute.
+
+    Example:
+        >>> parse = pipe(str.strip, int, lambda it: it * 2, compile=True, memoize=LRU(1024))
+        >>> parse(' 21 ')
+        42
+        >>> timed = parse.profile()
+        >>> timed(' 1 ')
+        2
+        >>> print(timed.stats)  # Table of timings per function
     """
 
-    def pipe_(*args, **kwargs):
-        result = function0(*args, **kwargs)
-        for function in functions:
+    stages = (function0,) + functions
+
+    if compile:
+        pipe_ = _compile_pipe(len(stages))(*stages)
+    else:
+        def pipe_(*args, **kwargs):
+            result = function0(*args, **kwargs)
+            for function in functions:
+                result = function(result)
+            return result
+
+    if memoize is not None:
+        pipe_ = _caching.memoize(pipe_, memoize)
+
+    pipe_.stages = stages
+    pipe_.profile = partial(_profiled_pipe, stages)
+    return pipe_
+
+
+@lru_cache(maxsize=64)
+def _compile_pipe(size: int) -> Callable[..., Callable]:
+    """
+    Generates a factory taking ``size`` functions and returning a function
+    piping them together.
+    """
+
+    params = [f'f{i}' for i in range(size)]
+    statements, result = nest_calls((f'{param}(item)' for param in params), '*args, **kwargs', 'result')
+
+    return compile_function(
+        [
+            f'def factory({", ".join(params)}):',
+            '    def pipe_(*args, **kwargs):',
+            *(f'        {statement}' for statement in statements),
+            f'        return {result}',
+            '    return pipe_',
+        ],
+        'factory',
+    )
+
+
+def _profiled_pipe(stages: Tuple[Callable, ...]) -> Callable:
+    profile = StreamProfile()
+    profile.register([(MAP, function) for function in stages])
+    stats = list(zip(stages, profile.stages))
+    first_function, first_stats = stats[0]
+    perf_counter = time.perf_counter
+    thread_time = time.thread_time
+
+    def profiled(*args, **kwargs):
+        wall_start, cpu_start = perf_counter(), thread_time()
+        result = first_function(*args, **kwargs)
+        first_stats.wall_time += perf_counter() - wall_start
+        first_stats.cpu_time += thread_time() - cpu_start
+        first_stats.items_in += 1
+        first_stats.items_out += 1
+
+        for function, stage_stats in stats[1:]:
+            wall_start, cpu_start = perf_counter(), thread_time()
             result = function(result)
+            stage_stats.wall_time += perf_counter() - wall_start
+            stage_stats.cpu_time += thread_time() - cpu_start
+            stage_stats.items_in += 1
+            stage_stats.items_out += 1
+
         return result
 
-    return pipe_
+    profiled.stages = stages
+    profiled.stats = profile
+    return profiled
 
 
-def ranges(*stops: Union[int, Tuple[int, ...]]) -> Iterable[Tuple[int, ...]]:
+def ranges(
+        *stops: Union[int, Tuple[int, ...]],
+        as_array: bool = False,
+        chunk_size: int = 65536,
+) -> Union['Ranges', Iterator]:
     """
-    Yield all possible combinations of values for the given ranges.
+    Returns all possible combinations of values for the given ranges,
+    as a :class:`Ranges` sequence.
 
     Each range can be specified as either a ``stop`` index,
     or as ``(start, stop)`` or ``(start, stop, step)`` tuples.
@@ -302,46 +973,311 @@ def ranges(*stops: Union[int, Tuple[int, ...]]) -> Iterable[Tuple[int, ...]]:
         >>>     ...
 
     because it does not keep a list of prviously used values in memory.
+
+    The combinations can also be looked up by index or sliced without
+    enumerating them, e.g. to shard a grid across workers:
+
+        >>> grid = ranges(800, (0, 600, 2), 3)
+        >>> len(grid)
+        720000
+        >>> grid[1000]
+        (1, 66, 1)
+        >>> shards = grid.split(4)
+
+    If ``as_array`` is ``True``, an iterator over the combinations in blocks of
+    up to ``chunk_size`` is returned instead. See :meth:`Ranges.arrays`.
     """
 
     if len(stops) == 0:
         raise ValueError(f'No stop values given; must provide at least one stop value.')
 
-    stops = [
-        (stop,) if isinstance(stop, int) else stop
+    result = Ranges([
+        range(stop) if isinstance(stop, int) else range(*stop)
         for stop in stops
-    ]
+    ])
+
+    return result.arrays(chunk_size) if as_array else result
 
-    yield from _ranges(stops)
 
+def semi_join(
+        left: Iterable[T],
+        right: Iterable[V],
+        left_key: Callable[[T], K],
+        right_key: Callable[[V], K] = None,
+) -> Iterator[T]:
+    """
+    Returns an iterator over the items of ``left`` whose key matches the key of
+    at least one item in ``right``. Only the set of keys of ``right`` is kept
+    in memory. ``right_key`` defaults to ``left_key``.
 
-def _ranges(stops: Sequence[Tuple[int, ...]]) -> Iterable[Tuple[int, ...]]:
-    stop = stops[-1]
+    Example:
+        >>> print(list(semi_join(range(10), [3, 5, 30], left_key=lambda it: it)))
+        [3, 5]
+    """
 
-    if len(stops) == 1:
-        yield from ((it,) for it in range(*stop))
-    else:
-        for prefix in _ranges(stops[:-1]):
-            for suffix in range(*stop):
-                yield prefix + (suffix,)
+    right_key = left_key if right_key is None else right_key
 
+    keys = set(map(right_key, right))
+    for item in left:
+        if left_key(item) in keys:
+            yield item
 
-def unique(iterable: Iterable[T]) -> Iterable[T]:
+
+def unique(
+        iterable: Iterable[T],
+        key: Callable[[T], K] = None,
+        strategy: str = 'exact',
+        max_size: int = None,
+        error_rate: float = 0.01,
+) -> Iterable[T]:
     """
     Returns an iterable of only the unique items in the given iterable,
     in the same order in which they appear.
-    """
 
-    prev_values = set()
+    If ``key`` is given, items are considered duplicates when the keys
+    returned by ``key`` applied to them are equal.
+
+    The ``strategy`` controls how much memory is used to remember previously
+    seen keys:
 
-    def is_unique(value_: T) -> bool:
-        value_is_unique_ = value_ not in prev_values
-        prev_values.add(value_)
-        return value_is_unique_
+    - ``'exact'``: Every key is kept in a set. Memory grows with the number
+      of unique keys.
+    - ``'window'``: Only the ``max_size`` most recently seen keys are kept, so
+      duplicates further apart than that are not removed.
+    - ``'bloom'``: Keys are kept in a :class:`yapytools.sketches.BloomFilter`
+      sized for ``max_size`` unique keys, so memory is fixed. Roughly an
+      ``error_rate`` fraction of unique items are wrongly dropped as
+      duplicates. Keys are hashed with the builtin ``hash``, like in a set.
 
+    Example:
+        >>> values = unique(
+        ...     ['a', 'B', 'b', 'A', 'c'],
+        ...     key=str.lower,
+        ... )
+        >>> print(list(values))
+        ['a', 'B', 'c']
+    """
+
+    is_unique = _new_unique_predicate(key, strategy, max_size, error_rate)
     return filter(is_unique, iterable)
 
 
+UNIQUE_STRATEGIES = ('exact', 'window', 'bloom')
+
+
+def _new_unique_predicate(
+        key: Optional[Callable[[T], K]],
+        strategy: str,
+        max_size: Optional[int],
+        error_rate: float,
+) -> Callable[[T], bool]:
+    """Returns a stateful predicate that is true the first time a key is seen."""
+
+    if strategy not in UNIQUE_STRATEGIES:
+        raise ValueError(
+            f'Invalid strategy {strategy!r}; must be one of {UNIQUE_STRATEGIES}.')
+
+    if strategy != 'exact' and (max_size is None or max_size < 1):
+        raise ValueError(f'max_size must be >= 1 for the {strategy!r} strategy; got {max_size}.')
+
+    if strategy == 'exact':
+        prev_values = set()
+
+        def is_new(value_: K) -> bool:
+            value_is_unique_ = value_ not in prev_values
+            prev_values.add(value_)
+            return value_is_unique_
+    elif strategy == 'window':
+        recent_values = OrderedDict()
+
+        def is_new(value_: K) -> bool:
+            if value_ in recent_values:
+                recent_values.move_to_end(value_)
+                return False
+
+            recent_values[value_] = None
+            if len(recent_values) > max_size:
+                recent_values.popitem(last=False)
+
+            return True
+    else:
+        is_new = BloomFilter(max_size, error_rate, builtin_hash_pair).add
+
+    if key is None:
+        return is_new
+
+    return lambda value_: is_new(key(value_))
+
+
+class Ranges(Sequence[Tuple[int, ...]]):
+    """
+    A sequence of all combinations of values from the given ranges, in the
+    same order as ``itertools.product(*ranges)``, that is never materialized.
+
+    Length, indexing, slicing and ``in`` checks are computed arithmetically in
+    ``O(len(ranges))`` time. Slicing returns a new :class:`Ranges` over a subset
+    of the combinations. See :func:`ranges`.
+    """
+
+    ranges: Tuple[range, ...]
+    """The ranges combined by this sequence."""
+
+    indices: range
+    """The flat indices of the combinations in this sequence."""
+
+    def __init__(self, ranges_: Iterable[range], indices: range = None):
+        self.ranges = tuple(ranges_)
+        self._shape = tuple(len(range_) for range_ in self.ranges)
+        self.indices = range(math.prod(self._shape)) if indices is None else indices
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """The length of each range."""
+        return self._shape
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Tuple[int, ...], 'Ranges']:
+        if isinstance(index, slice):
+            return Ranges(self.ranges, self.indices[index])
+
+        return self._combination(self.indices[index])
+
+    def __contains__(self, value) -> bool:
+        flat_index = self._flat_index(value)
+        return flat_index is not None and flat_index in self.indices
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        indices = self.indices
+
+        if indices.step != 1:
+            return map(self._combination, indices)
+
+        if len(indices) == math.prod(self._shape):
+            return itertools.product(*self.ranges)
+
+        return self._odometer(indices.start, len(indices))
+
+    def __repr__(self) -> str:
+        ranges_ = ', '.join(map(repr, self.ranges))
+        return f'Ranges([{ranges_}], indices={self.indices!r})'
+
+    def arrays(self, chunk_size: int = 65536) -> Iterator:
+        """
+        Yields the combinations in blocks of up to ``chunk_size`` as NumPy
+        integer arrays of shape ``(chunk_size, len(ranges))``, so they can be
+        used for vectorized indexing:
+
+            >>> for xyc in ranges(800, (0, 600, 2), 3).arrays():
+            >>>     values = image[xyc[:, 0], xyc[:, 1], xyc[:, 2]]
+
+        This requires NumPy, which can be installed with ``pip install yapytools[numpy]``.
+        """
+
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError(
+                'Ranges.arrays() requires NumPy; '
+                'install it with: pip install yapytools[numpy]'
+            ) from e
+
+        if chunk_size < 1:
+            raise ValueError(f'chunk_size must be >= 1; got {chunk_size}.')
+
+        return self._arrays(np, chunk_size)
+
+    def _arrays(self, np, chunk_size: int) -> Iterator:
+        starts = np.array([range_.start for range_ in self.ranges], dtype=np.int64)
+        steps = np.array([range_.step for range_ in self.ranges], dtype=np.int64)
+
+        for chunk_start in range(0, len(self.indices), chunk_size):
+            chunk = self.indices[chunk_start:chunk_start + chunk_size]
+            flat_indices = np.arange(chunk.start, chunk.stop, chunk.step, dtype=np.int64)
+            indices = np.stack(np.unravel_index(flat_indices, self._shape), axis=1)
+            yield indices * steps + starts
+
+    def index(self, value: Tuple[int, ...], start: int = 0, stop: int = None) -> int:
+        """Returns the index of the given combination."""
+
+        flat_index = self._flat_index(value)
+        if flat_index is None or flat_index not in self.indices:
+            raise ValueError(f'{value!r} is not in ranges')
+
+        start, stop, _ = slice(start, stop).indices(len(self))
+        index = self.indices.index(flat_index)
+        if not start <= index < stop:
+            raise ValueError(f'{value!r} is not in ranges')
+
+        return index
+
+    def count(self, value: Tuple[int, ...]) -> int:
+        return 1 if value in self else 0
+
+    def split(self, n: int) -> List['Ranges']:
+        """
+        Returns ``n`` contiguous, nearly equal-size slices covering this
+        sequence, e.g. one per worker.
+        """
+
+        if n < 1:
+            raise ValueError(f'n must be >= 1; got {n}.')
+
+        size, remainder = divmod(len(self), n)
+        bounds = [i * size + min(i, remainder) for i in range(n + 1)]
+
+        return [self[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+    def _combination(self, flat_index: int) -> Tuple[int, ...]:
+        values = []
+
+        for range_, length in zip(reversed(self.ranges), reversed(self._shape)):
+            flat_index, i = divmod(flat_index, length)
+            values.append(range_[i])
+
+        values.reverse()
+        return tuple(values)
+
+    def _flat_index(self, value) -> Optional[int]:
+        """Returns the flat index of the combination, or None if invalid."""
+
+        if not isinstance(value, tuple) or len(value) != len(self.ranges):
+            return None
+
+        flat_index = 0
+        for item, range_, length in zip(value, self.ranges, self._shape):
+            if not isinstance(item, int) or item not in range_:
+                return None
+
+            flat_index = flat_index * length + range_.index(item)
+
+        return flat_index
+
+    def _odometer(self, flat_index: int, count_: int) -> Iterator[Tuple[int, ...]]:
+        ranges_ = self.ranges
+        shape = self._shape
+        values = list(self._combination(flat_index))
+        digits = [range_.index(value) for range_, value in zip(ranges_, values)]
+        last = len(digits) - 1
+
+        for _ in range(count_):
+            yield tuple(values)
+
+            # Advance the last digit, carrying into the previous ones as needed
+            i = last
+            while i >= 0:
+                digit = digits[i] + 1
+                if digit < shape[i]:
+                    digits[i] = digit
+                    values[i] = ranges_[i][digit]
+                    break
+
+                digits[i] = 0
+                values[i] = ranges_[i].start
+                i -= 1
+
+
 class Stream(Iterable):
     """
     Allows applying filtering, mapping, and accumulation functions to an
@@ -358,21 +1294,112 @@ class Stream(Iterable):
         >>> print(result)
         ['50', '60', '70', '80', '90']
 
+    Consecutive :meth:`map` and :meth:`filter` stages are recorded lazily and
+    fused into a single loop when the stream is iterated, so each stage adds
+    little overhead per item. See :meth:`explain`, and :meth:`instrument` to
+    find out how much time each stage takes.
+
     Inspired by Java's `Stream API <https://docs.oracle.com/javase/8/docs/api/java/util/stream/Stream.html>`_.
     """
 
     iterable: Iterable[T]
 
+    profile: Optional[StreamProfile]
+    """Per-stage statistics, if the stream is instrumented. See :meth:`instrument`."""
+
     def __init__(self, iterable: Iterable[T]):
         self.iterable = iterable
+        self.profile = None
+        self._parallel: Optional[_parallel.ParallelOptions] = None
+        self._stages: Tuple[Stage, ...] = ()
 
     @classmethod
     def of(cls, *items) -> 'Stream':
         """Returns a `Stream` of the args passed to this function."""
         return Stream(items)
 
+    @classmethod
+    def from_csv(
+            cls,
+            path: _files.PathLike,
+            header: bool = True,
+            start: int = 0,
+            end: int = None,
+            **kwargs,
+    ) -> 'Stream':
+        """
+        Returns a `Stream` of the rows of a CSV file, as dicts if ``header`` is
+        ``True``, or as lists otherwise. See :func:`yapytools.files.read_csv`.
+        """
+        return Stream(_files.read_csv(path, header, start, end, **kwargs))
+
+    @classmethod
+    def from_jsonl(cls, path: _files.PathLike, start: int = 0, end: int = None, **kwargs) -> 'Stream':
+        """
+        Returns a `Stream` of the JSON values on each line of the file.
+        See :func:`yapytools.files.read_jsonl`.
+        """
+        return Stream(_files.read_jsonl(path, start, end, **kwargs))
+
+    @classmethod
+    def from_lines(
+            cls,
+            path: _files.PathLike,
+            start: int = 0,
+            end: int = None,
+            mmap: bool = True,
+            chunk_bytes: int = _files.DEFAULT_CHUNK_BYTES,
+            **kwargs,
+    ) -> 'Stream':
+        """
+        Returns a `Stream` of the lines of the file, without line endings.
+
+        The file is read in blocks of ``chunk_bytes``, through ``mmap`` unless
+        ``mmap`` is ``False``. Pass ``start`` and ``end`` byte offsets, e.g.
+        from :func:`yapytools.files.byte_ranges`, to only read the lines
+        starting in that range. See :func:`yapytools.files.read_lines`.
+
+        Example:
+            >>> errors = Stream.from_lines('app.log').filter(lambda it: 'ERROR' in it).to_list()
+        """
+        return Stream(_files.read_lines(path, start, end, mmap, chunk_bytes, **kwargs))
+
     def __iter__(self):
-        return iter(self.iterable)
+        if self.profile is not None:
+            return self._iter_instrumented()
+
+        return self._run(self._stages)
+
+    def _run(self, stages: Sequence[Stage]) -> Iterator[T]:
+        if self._parallel is not None and stages:
+            return _parallel.run_stages(stages, self.iterable, self._parallel)
+
+        return fuse(stages)(self.iterable)
+
+    def _iter_instrumented(self) -> Iterator[T]:
+        if self._parallel is not None and self._parallel.backend == 'process' and self._stages:
+            raise ValueError("Instrumented streams do not support the 'process' backend.")
+
+        self.profile.started()
+        try:
+            yield from self._run(self.profile.instrument(self._stages))
+        finally:
+            self.profile.stopped()
+
+    def _derive(self, iterable: Iterable) -> 'Stream':
+        stream = Stream(iterable)
+        stream.profile = self.profile
+        return stream
+
+    def _with_stages(self, stages: Tuple[Stage, ...]) -> 'Stream':
+        stream = self._derive(self.iterable)
+        stream._parallel = self._parallel
+        stream._stages = stages
+
+        if stream.profile is not None:
+            stream.profile.register(stages)
+
+        return stream
 
     def accumulate(
             self,
@@ -380,66 +1407,569 @@ class Stream(Iterable):
             initial: T = None,
     ) -> 'Stream':
         """See `itertools.accumulate <https://docs.python.org/3/library/itertools.html#itertools.accumulate>`_."""
-        return Stream(itertools.accumulate(
+        return self._derive(itertools.accumulate(
             self,
             func=function,
             initial=initial,
         ))
 
+    def anti_join(
+            self,
+            other: Iterable[V],
+            left_key: Callable[[T], K],
+            right_key: Callable[[V], K] = None,
+    ) -> 'Stream':
+        """
+        Returns a :class:`Stream` of the items whose key does not match any
+        item in ``other``. See :func:`anti_join`.
+        """
+        return self._derive(anti_join(self, other, left_key, right_key))
+
+    def batched(self, size: int, max_wait: float = None) -> 'Stream':
+        """
+        Returns a :class:`Stream` of lists of up to ``size`` items, also
+        yielding partial lists after ``max_wait`` seconds. See :func:`batched`.
+        """
+        return self._derive(batched(self, size, max_wait=max_wait))
+
+    def cache(self, policy: str = 'memory', max_items: int = None) -> 'Stream':
+        """
+        Returns a :class:`Stream` that can be iterated any number of times, e.g.
+        to call several terminal operations without recomputing the stream.
+
+        Items are computed lazily, the first time they are needed, and cached.
+        With ``policy='disk'``, or beyond ``max_items`` items in memory, they
+        are cached in a temporary file instead.
+        See :class:`yapytools.buffers.CachedIterable`.
+
+        Example:
+            >>> squares = Stream(range(4)).map(lambda it: it * it).cache()
+            >>> print(squares.sum(), squares.to_list())
+            14 [0, 1, 4, 9]
+        """
+        return self._derive(_buffers.CachedIterable(self, policy, max_items))
+
+    def chunked(self, size: int) -> 'Stream':
+        """
+        Returns a :class:`Stream` of lists of ``size`` consecutive items.
+        See :func:`chunked`.
+        """
+        return self._derive(chunked(self, size))
+
+    def cogroup(
+            self,
+            other: Iterable[V],
+            left_key: Callable[[T], K],
+            right_key: Callable[[V], K] = None,
+    ) -> 'Stream':
+        """
+        Returns a :class:`Stream` of ``(key, items, other_items)`` for every key
+        in this stream or ``other``. See :func:`cogroup`.
+        """
+        return self._derive(cogroup(self, other, left_key, right_key))
+
     def enumerate(self, start: int = 0) -> 'Stream':
-        return Stream(enumerate(self, start=start))
+        return self._derive(enumerate(self, start=start))
+
+    def explain(self) -> str:
+        """
+        Returns a description of how the stream will be executed, with one
+        line per source, parallel mode, and group of fused stages.
+
+        Example:
+            >>> print(
+            >>>     Stream(range(20))
+            >>>     .filter(is_even)
+            >>>     .map(str)
+            >>>     .explain()
+            >>> )
+            source: range(0, 20)
+            fused: filter(is_even) -> map(str)
+        """
+        return '\n'.join(self._explain())
+
+    def _explain(self) -> List[str]:
+        if isinstance(self.iterable, Stream):
+            lines = self.iterable._explain()
+        else:
+            source = repr(self.iterable)
+            if len(source) > 60:
+                source = source[:57] + '...'
+            lines = [f'source: {source}']
+
+        if self._parallel is not None:
+            options = ', '.join(
+                f'{name}={value!r}'
+                for name, value in self._parallel._asdict().items()
+            )
+            lines.append(f'parallel: {options}')
+
+        if self._stages:
+            lines.append(f'fused: {describe(self._stages)}')
+
+        return lines
 
     def filter(self, function: Predicate) -> 'Stream':
         """
         Returns a :class:`Stream` with the given filter applied to the items.
+
+        Combined :class:`yapytools.predicates.Condition` objects, e.g.
+        ``Condition(is_even) & is_positive``, are compiled into a single call per item.
+        """
+        return self._with_stages(self._stages + ((FILTER, bool if function is None else function),))
+
+    def filter_batches(self, function: Predicate) -> 'Stream':
+        """
+        Returns a :class:`Stream` of the batches in this stream, e.g. from
+        :meth:`batched`, with the given filter applied to the items of each
+        batch. NumPy array batches filtered by a
+        :class:`yapytools.predicates.Condition` or a vectorized predicate,
+        e.g. ``is_even``, are filtered with a single mask. See :func:`yapytools.predicates.filter_batch`.
+
+        Example:
+            >>> result = (
+            >>>     Stream(range(10))
+            >>>     .chunked(4)
+            >>>     .map(np.array)
+            >>>     .filter_batches(Condition(is_even) & ~Condition(is_zero))
+            >>>     .map(np.ndarray.tolist)
+            >>>     .to_list()
+            >>> )
+            >>> print(result)
+            [[2], [4, 6], [8]]
         """
-        return Stream(filter(function, self))
+        return self.map(partial(filter_batch, function))
 
     def filter_not_none(self) -> 'Stream':
         """
         Returns a :class:`Stream` with the `None` items removed.
         See :func:`filter_not_none`.
         """
-        return Stream(filter_not_none(self))
+        return self._derive(filter_not_none(self))
 
     def flatten(self) -> 'Stream':
         """See :func:`flatten`."""
-        return Stream(flatten(self))
+        return self._derive(flatten(self))
+
+    def instrument(self, hook: Callable[[dict], None] = None) -> 'Stream':
+        """
+        Returns a :class:`Stream` that records, for its map and filter stages
+        and those added after it, the number of items in and out of each
+        stage and the wall and CPU time spent in each stage function.
+
+        The statistics are available from :attr:`profile` on this and any
+        derived stream. If ``hook`` is given, it is called with
+        :meth:`yapytools.profiling.StreamProfile.to_dict` once the stream has
+        been consumed.
+
+        Example:
+            >>> stream = (
+            >>>     Stream(range(100))
+            >>>     .instrument()
+            >>>     .filter(is_even)
+            >>>     .map(str)
+            >>> )
+            >>> result = stream.to_list()
+            >>> print(stream.profile.to_table())
+            stage            in  out  selectivity    wall s     cpu s     items/s
+            filter(is_even)  100   50        50.0%  0.000017  0.000017  5,882,353
+            map(str)          50   50       100.0%  0.000010  0.000010  5,000,000
+
+        Streams that are not instrumented have no per-item overhead.
+        Instrumenting is not supported with the ``'process'`` parallel backend.
+        """
+
+        stream = self._with_stages(self._stages)
+        stream.profile = StreamProfile(hook)
+        stream.profile.register(self._stages)
+        return stream
+
+    def join(
+            self,
+            other: Iterable[V],
+            left_key: Callable[[T], K],
+            right_key: Callable[[V], K] = None,
+            how: str = 'inner',
+            method: str = 'hash',
+    ) -> 'Stream':
+        """
+        Returns a :class:`Stream` of ``(item, other_item)`` pairs whose keys
+        match. See :func:`join`.
+
+        Example:
+            >>> result = (
+            >>>     Stream.of(1, 2, 3)
+            >>>     .join(['1', '3', '3'], left_key=str)
+            >>>     .to_list()
+            >>> )
+            >>> print(result)
+            [(1, '1'), (3, '3'), (3, '3')]
+        """
+        return self._derive(join(self, other, left_key, right_key, how=how, method=method))
 
     def map(self, function: Callable[[T], V]) -> 'Stream':
         """
         Returns a :class:`Stream` with the given mapping applied to each item.
         """
-        return Stream(map(function, self))
+        return self._with_stages(self._stages + ((MAP, function),))
 
-    def reversed(self) -> 'Stream':
-        return Stream(reversed(self.iterable))
+    def map_cached(
+            self,
+            function: Callable[[T], V],
+            cache: Cache = None,
+            key: Callable[[T], Hashable] = None,
+    ) -> 'Stream':
+        """
+        Returns a :class:`Stream` with the given mapping applied to each item,
+        caching the results by item, or by ``key(item)`` if given. This avoids
+        recomputing expensive results for repeated items.
+
+        ``cache`` defaults to a :class:`yapytools.caching.LRU` of 128 values.
+        In :meth:`parallel` mode with the thread backend, workers share the
+        cache, and only one computes the result for each key at a time.
+        See :func:`yapytools.caching.memoize`.
+
+        Example:
+            >>> users = (
+            >>>     Stream(events)
+            >>>     .map_cached(lambda it: fetch_user(it.user_id), LFU(10_000), key=lambda it: it.user_id)
+            >>>     .to_list()
+            >>> )
+        """
+        return self.map(_caching.memoize(function, cache, key))
+
+    def map_batches(self, function: Callable[[List[T]], Iterable[V]], size: int) -> 'Stream':
+        """
+        Returns a :class:`Stream` of the items returned by ``function`` called on
+        lists of up to ``size`` items at a time. This is useful when a function
+        is much cheaper to call on many items at once, e.g. a database lookup.
+
+        In :meth:`parallel` mode, the batches are processed across the worker
+        pool.
+
+        Example:
+            >>> result = (
+            >>>     Stream(range(5))
+            >>>     .map_batches(lambda batch: [sum(batch)] * len(batch), size=2)
+            >>>     .to_list()
+            >>> )
+            >>> print(result)
+            [1, 1, 5, 5, 4]
+        """
 
-    def sorted(self, key=None, reverse=False) -> 'Stream':
-        return Stream(sorted(self, key=key, reverse=reverse))
+        if self._parallel is None:
+            results = map(function, chunked(self, size))
+        else:
+            if size < 1:
+                raise ValueError(f'size must be >= 1; got {size}.')
+
+            options = self._parallel._replace(chunk_size=size)
+            results = _parallel.run_chunks(function, self, options)
 
-    def unique(self) -> 'Stream':
+        return self._derive(flatten(results))
+
+    def pairwise(self) -> 'Stream':
+        """
+        Returns a :class:`Stream` of successive overlapping pairs of items.
+        See :func:`yapytools.windows.pairwise`.
+        """
+        return self._derive(_windows.pairwise(self))
+
+    def parallel(
+            self,
+            workers: Optional[int] = None,
+            backend: str = 'thread',
+            chunk_size: int = 256,
+            ordered: bool = True,
+            max_in_flight: Optional[int] = None,
+    ) -> 'Stream':
+        """
+        Returns a :class:`Stream` whose subsequent :meth:`map` and
+        :meth:`filter` stages run across a pool of ``workers`` threads or
+        processes, depending on ``backend``.
+
+        Items are sent to the workers ``chunk_size`` at a time, and at most
+        ``max_in_flight`` chunks are pending at once, so memory stays bounded
+        on unbounded inputs. If ``ordered`` is ``False``, chunks are yielded
+        as soon as they complete instead of in input order.
+
+        Consecutive map and filter stages are run together in the same worker
+        task. Any other operation returns a sequential stream again.
+
+        Example:
+            >>> result = (
+            >>>     Stream(range(10))
+            >>>     .parallel(workers=4)
+            >>>     .map(lambda it: it * it)
+            >>>     .filter(lambda it: it > 10)
+            >>>     .to_list()
+            >>> )
+            >>> print(result)
+            [16, 25, 36, 49, 64, 81]
+
+        With the ``'process'`` backend, the map and filter functions must be
+        picklable, i.e. module-level functions rather than lambdas.
+        See :func:`yapytools.parallel.parallel_options`.
+        """
+
+        stream = self._derive(self)
+        stream._parallel = _parallel.parallel_options(
+            workers=workers,
+            backend=backend,
+            chunk_size=chunk_size,
+            ordered=ordered,
+            max_in_flight=max_in_flight,
+        )
+        return stream
+
+    def reversed(self, max_memory_items: int = None) -> 'Stream':
+        """
+        Returns a :class:`Stream` of the items in reverse order.
+
+        If the source iterable can be reversed, e.g. a sequence, dict view or
+        deque, it is traversed backwards and the :meth:`map` and :meth:`filter`
+        stages are applied to it as usual, so nothing is buffered. Otherwise,
+        the items are buffered, keeping at most ``max_memory_items`` in memory
+        if given. See :func:`yapytools.buffers.reverse`.
+        """
+
+        if _buffers.is_reversible(self.iterable):
+            stream = self._with_stages(self._stages)
+            stream.iterable = reversed(self.iterable)
+            return stream
+
+        return self._derive(_buffers.reverse(self, max_memory_items))
+
+    def rolling_max(self, size: int) -> 'Stream':
+        """
+        Returns a :class:`Stream` of the largest item in each window of ``size``
+        items. See :func:`yapytools.windows.rolling_max`.
+        """
+        return self._derive(_windows.rolling_max(self, size))
+
+    def rolling_mean(self, size: int) -> 'Stream':
+        """
+        Returns a :class:`Stream` of the mean of each window of ``size`` items.
+        See :func:`yapytools.windows.rolling_mean`.
+        """
+        return self._derive(_windows.rolling_mean(self, size))
+
+    def rolling_min(self, size: int) -> 'Stream':
+        """
+        Returns a :class:`Stream` of the smallest item in each window of
+        ``size`` items. See :func:`yapytools.windows.rolling_min`.
+        """
+        return self._derive(_windows.rolling_min(self, size))
+
+    def rolling_sum(self, size: int) -> 'Stream':
+        """
+        Returns a :class:`Stream` of the sum of each window of ``size`` items.
+        See :func:`yapytools.windows.rolling_sum`.
+        """
+        return self._derive(_windows.rolling_sum(self, size))
+
+    def sample_fraction(self, p: float, seed=None) -> 'Stream':
+        """
+        Returns a :class:`Stream` of a random sample of the items, each included
+        with probability ``p``. See :func:`yapytools.sampling.sample_fraction`.
+        """
+        return self._derive(_sampling.sample_fraction(self, p, seed))
+
+    def semi_join(
+            self,
+            other: Iterable[V],
+            left_key: Callable[[T], K],
+            right_key: Callable[[V], K] = None,
+    ) -> 'Stream':
+        """
+        Returns a :class:`Stream` of the items whose key matches at least one
+        item in ``other``. See :func:`semi_join`.
+        """
+        return self._derive(semi_join(self, other, left_key, right_key))
+
+    def sequential(self) -> 'Stream':
+        """
+        Returns a :class:`Stream` whose subsequent stages run in the calling
+        thread again. See :meth:`parallel`.
+        """
+        return self._derive(self)
+
+    def sorted(self, key=None, reverse=False, max_memory_items: int = None) -> 'Stream':
+        """
+        Returns a :class:`Stream` of the items in sorted order.
+
+        If ``max_memory_items`` is given, the items are sorted lazily with an
+        external merge sort that keeps at most about that many items in memory
+        at once. See :func:`external_sorted`.
+        """
+
+        if max_memory_items is None:
+            return self._derive(sorted(self, key=key, reverse=reverse))
+
+        return self._derive(external_sorted(
+            self,
+            key=key,
+            reverse=reverse,
+            max_memory_items=max_memory_items,
+        ))
+
+    def tee(self, n: int = 2, buffer_size: int = None) -> Tuple['Stream', ...]:
+        """
+        Returns ``n`` streams over the items of this stream, each of which can
+        be consumed independently, while this stream is only computed once.
+
+        If ``buffer_size`` is given, a stream that gets more than
+        ``buffer_size`` items ahead of the slowest one raises ``BufferError``.
+        See :func:`yapytools.buffers.tee`.
+        """
+        return tuple(self._derive(it) for it in _buffers.tee(self, n, buffer_size))
+
+    def unique(
+            self,
+            key: Callable[[T], K] = None,
+            strategy: str = 'exact',
+            max_size: int = None,
+            error_rate: float = 0.01,
+    ) -> 'Stream':
         """
         Returns a :class:`Stream` of only the unique items in the stream,
         in the order in which they occur. See :func:`unique`.
         """
-        return Stream(unique(self))
+        return self._derive(unique(
+            self,
+            key=key,
+            strategy=strategy,
+            max_size=max_size,
+            error_rate=error_rate,
+        ))
+
+    def windowed(self, size: int, step: int = 1) -> 'Stream':
+        """
+        Returns a :class:`Stream` of tuples of ``size`` consecutive items,
+        starting a new window every ``step`` items.
+        See :func:`yapytools.windows.windowed`.
+        """
+        return self._derive(_windows.windowed(self, size, step))
 
     def zip(self, *iterables: Iterable, strict: bool = False) -> 'Stream':
-        return Stream(zip(self, *iterables, strict=strict))
+        return self._derive(zip(self, *iterables, strict=strict))
+
+    def aggregate_by(
+            self,
+            key_selector: Callable[[T], K],
+            aggregator: Aggregator[V, Any, R],
+            value_transform: Callable[[T], V] = None,
+    ) -> Dict[K, R]:
+        """See :func:`aggregate_by`."""
+        return aggregate_by(self, key_selector, aggregator, value_transform)
+
+    def any(self, workers: int = None) -> bool:
+        """
+        Returns whether any item in the stream is truthy.
+
+        If ``workers`` is given, or the stream is :meth:`parallel`, the
+        :meth:`map` and :meth:`filter` stages run across a worker pool, and no
+        more items are processed once a truthy one is found. See
+        :func:`yapytools.parallel.run_any`.
+
+        Instrumented streams do not support ``workers``.
+        """
+
+        if self.profile is not None:
+            if workers is not None:
+                raise ValueError('Instrumented streams do not support workers.')
+            return any(self)
 
-    def any(self) -> bool:
-        return any(self)
+        if workers is None and self._parallel is None:
+            return any(self)
+
+        options = self._parallel._asdict() if self._parallel is not None else {}
+        if workers is not None:
+            # Let max_in_flight default to twice the new number of workers
+            options.pop('max_in_flight', None)
+            options['workers'] = workers
+
+        return _parallel.run_any(self._stages, self.iterable, _parallel.parallel_options(**options))
+
+    def approx_count_distinct(self, precision: int = 14) -> int:
+        """
+        Returns an estimate of the number of distinct items, using a
+        :class:`yapytools.sketches.HyperLogLog` sketch of ``2 ** precision``
+        bytes instead of a set of every item.
+        """
+
+        sketch = HyperLogLog(precision)
+        sketch.update(self)
+        return sketch.count()
+
+    def bottom_k(self, k: int, key: Callable[[T], Any] = None) -> List[T]:
+        """
+        Returns a list of the ``k`` smallest items, smallest first.
+
+        Uses a bounded heap, so this takes ``O(n log k)`` time and ``O(k)``
+        memory instead of sorting the whole stream.
+        """
+        return heapq.nsmallest(k, self, key=key)
 
     def count(self) -> int:
         """Returns the number of items in the stream."""
-        return count(self, identity)
+        return sum(1 for _ in self)
+
+    def heavy_hitters(self, k: int, capacity: int = None) -> List[Tuple[T, int]]:
+        """
+        Returns up to ``k`` of the approximately most frequent items and their
+        estimated counts, most frequent first.
+
+        Uses a :class:`yapytools.sketches.SpaceSaving` summary tracking
+        ``capacity`` items (default ``10 * k``), so memory does not grow with
+        the number of distinct items.
+        """
+
+        if k < 1:
+            raise ValueError(f'k must be >= 1; got {k}.')
+
+        summary = SpaceSaving(10 * k if capacity is None else capacity)
+        summary.update(self)
+        return summary.top(k)
+
+    def max(self, key: Callable[[T], Any] = None, default: T = _NO_DEFAULT) -> T:
+        """
+        Returns the largest item, as determined by ``key`` if given.
+        If the stream is empty, returns ``default`` if given, or raises
+        ``ValueError``.
+        """
+
+        if default is _NO_DEFAULT:
+            return max(self, key=key)
+
+        return max(self, key=key, default=default)
+
+    def min(self, key: Callable[[T], Any] = None, default: T = _NO_DEFAULT) -> T:
+        """
+        Returns the smallest item, as determined by ``key`` if given.
+        If the stream is empty, returns ``default`` if given, or raises
+        ``ValueError``.
+        """
+
+        if default is _NO_DEFAULT:
+            return min(self, key=key)
+
+        return min(self, key=key, default=default)
+
+    def nth_smallest(self, n: int, key: Callable[[T], Any] = None, default: T = None) -> Optional[T]:
+        """
+        Returns the item that would be at index ``n`` if the stream were
+        sorted, or ``default`` if there are not that many items. ``n`` is
+        zero-based, so ``nth_smallest(0)`` is the smallest item.
+
+        Takes ``O(n log k)`` time and ``O(k)`` memory, where ``k = n + 1``.
+        """
 
-    def max(self) -> T:
-        return max(self)
+        if n < 0:
+            raise ValueError(f'n must be >= 0; got {n}.')
 
-    def min(self) -> T:
-        return min(self)
+        smallest = heapq.nsmallest(n + 1, self, key=key)
+        return smallest[n] if len(smallest) > n else default
 
     def reduce(
             self,
@@ -450,13 +1980,87 @@ class Stream(Iterable):
         """Returns the last result of :func:`Stream.accumulate`."""
         return self.accumulate(function=function, initial=initial).last(default=default)
 
+    def sample(self, k: int, seed=None) -> List[T]:
+        """
+        Returns a uniform random sample of ``k`` items, using ``O(k)`` memory.
+        See :func:`yapytools.sampling.sample`.
+        """
+        return _sampling.sample(self, k, seed)
+
+    def sample_by(self, key_selector: Callable[[T], K], k: int, seed=None) -> Dict[K, List[T]]:
+        """
+        Returns a dict of each key mapped to a uniform random sample of up to
+        ``k`` items with that key. See :func:`yapytools.sampling.sample_by`.
+        """
+        return _sampling.sample_by(self, key_selector, k, seed)
+
     def sum(self) -> T:
         return sum(self)
 
+    def top_k(self, k: int, key: Callable[[T], Any] = None) -> List[T]:
+        """
+        Returns a list of the ``k`` largest items, largest first.
+
+        Uses a bounded heap, so this takes ``O(n log k)`` time and ``O(k)``
+        memory instead of sorting the whole stream.
+        """
+        return heapq.nlargest(k, self, key=key)
+
+    def to_csv(self, path: _files.PathLike, fieldnames: Sequence[str] = None, **kwargs) -> int:
+        """
+        Writes each item, a dict or sequence, as a row of a CSV file, and
+        returns the number of rows written. See :func:`yapytools.files.write_csv`.
+        """
+        return _files.write_csv(self, path, fieldnames, **kwargs)
+
+    def to_file(
+            self,
+            path: _files.PathLike,
+            serializer: Callable[[T], str] = str,
+            buffer_bytes: int = _files.DEFAULT_CHUNK_BYTES,
+            compression: str = None,
+            **kwargs,
+    ) -> int:
+        """
+        Writes each item to the file on its own line, and returns the number of
+        items written.
+
+        Lines are collected into a buffer of about ``buffer_bytes``, which is
+        encoded and written at once, so the stream is never held in memory.
+        ``compression`` may be ``'gzip'``, ``'bz2'`` or ``'xz'``.
+        See :func:`yapytools.files.write_file`.
+
+        Example:
+            >>> Stream(range(3)).map(lambda it: it * 10).to_file('out.txt.gz', compression='gzip')
+            3
+        """
+        return _files.write_file(self, path, serializer, buffer_bytes, compression, **kwargs)
+
+    def to_jsonl(self, path: _files.PathLike, **kwargs) -> int:
+        """
+        Writes each item to the file as a line of JSON, and returns the number
+        of items written. See :func:`yapytools.files.write_jsonl`.
+        """
+        return _files.write_jsonl(self, path, **kwargs)
+
     def to_list(self) -> List[T]:
         """Returns a list of items in the stream."""
         return list(self)
 
+    def to_partitioned_files(
+            self,
+            key_selector: Callable[[T], K],
+            directory: _files.PathLike,
+            serializer: Callable[[T], str] = str,
+            **kwargs,
+    ) -> int:
+        """
+        Writes each item on its own line to a file per key in ``directory``, and
+        returns the number of items written.
+        See :func:`yapytools.files.write_partitioned`.
+        """
+        return _files.write_partitioned(self, key_selector, directory, serializer, **kwargs)
+
     def to_set(self) -> Set[T]:
         """Returns a set of items in the stream."""
         return set(self)
@@ -470,10 +2074,15 @@ class Stream(Iterable):
         return next(iter(self), default)
 
     def last(self, default: T = None) -> Optional[T]:
-        """Returns the last item in the stream."""
+        """
+        Returns the last item in the stream.
+
+        If the source iterable can be reversed, the stages are only applied to
+        items from the end until one passes every filter. See :meth:`reversed`.
+        """
 
-        last = default
-        for item in self:
-            last = item
+        if _buffers.is_reversible(self.iterable):
+            return self.reversed().first(default)
 
-        return last
+        last_items = deque(self, maxlen=1)
+        return last_items[0] if last_items else default
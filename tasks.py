@@ -15,6 +15,19 @@ def cov(c):
     c.run('coverage report -m')
 
 
+@task
+def bench(c, filter_: str = '*', sizes: str = '100,10000,1000000', output: str = None, compare: str = None):
+    """Run benchmarks, optionally saving JSON results and comparing to a previous run."""
+
+    command = f"python -m benchmarks --filter '{filter_}' --sizes {sizes}"
+    if output:
+        command += f' --output {output}'
+    if compare:
+        command += f' --compare {compare}'
+
+    c.run(command)
+
+
 @task
 def clean(c, cov: bool = False):
     """Remove auto-generated files."""
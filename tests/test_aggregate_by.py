@@ -0,0 +1,74 @@
+import unittest
+
+from parameterized import parameterized
+
+from yapytools import aggregate_by
+from yapytools.aggregators import Aggregator, Count, First, Fold, Last, Max, Mean, Min, Sum
+
+
+class AggregateByTest(unittest.TestCase):
+    @parameterized.expand([
+        (Count(), {'even': 5, 'odd': 5}),
+        (Sum(), {'even': 20, 'odd': 25}),
+        (Min(), {'even': 0, 'odd': 1}),
+        (Max(), {'even': 8, 'odd': 9}),
+        (Mean(), {'even': 4.0, 'odd': 5.0}),
+        (First(), {'even': 0, 'odd': 1}),
+        (Last(), {'even': 8, 'odd': 9}),
+        (Fold(lambda state, it: state + [it], initial=[]), {'even': [0, 2, 4, 6, 8], 'odd': [1, 3, 5, 7, 9]}),
+    ])
+    def test(self, aggregator, expected):
+        result = aggregate_by(
+            range(10),
+            lambda it: 'odd' if it % 2 else 'even',
+            aggregator,
+        )
+
+        self.assertDictEqual(result, expected)
+
+    def test_with_value_transform(self):
+        result = aggregate_by(
+            ['a', 'bb', 'ccc', 'dd'],
+            len,
+            Count(),
+            value_transform=str.upper,
+        )
+
+        self.assertDictEqual(result, {1: 1, 2: 2, 3: 1})
+
+    def test_empty_iterable_returns_empty_dict(self):
+        result = aggregate_by([], lambda it: it, Sum())
+        self.assertDictEqual(result, {})
+
+
+class AggregatorMergeTest(unittest.TestCase):
+    @parameterized.expand([
+        (Count(), 5),
+        (Sum(), 15),
+        (Min(), 1),
+        (Max(), 5),
+        (Mean(), 3.0),
+        (First(), 1),
+        (Last(), 5),
+        (Fold(combine=lambda a, b: a + b), 15),
+    ])
+    def test(self, aggregator, expected):
+        def fold(values):
+            state = aggregator.start(values[0])
+            for value in values[1:]:
+                state = aggregator.add(state, value)
+            return state
+
+        state = aggregator.merge(fold([1, 2]), fold([3, 4, 5]))
+
+        self.assertEqual(aggregator.result(state), expected)
+
+    def test_fold_without_combine_raises_NotImplementedError(self):
+        with self.assertRaises(NotImplementedError):
+            Fold().merge(1, 2)
+
+
+class AggregatorTest(unittest.TestCase):
+    def test_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Aggregator()
@@ -0,0 +1,144 @@
+import asyncio
+import unittest
+
+from yapytools.async_stream import AsyncStream
+from yapytools.predicates import is_even
+
+
+async def arange(stop: int):
+    for i in range(stop):
+        await asyncio.sleep(0)
+        yield i
+
+
+async def times_ten(value: int) -> int:
+    await asyncio.sleep(0)
+    return value * 10
+
+
+class AsyncStreamTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.stream = (
+            AsyncStream(arange(20))
+            .filter(is_even)
+            .filter(lambda it: it > 4)
+            .map(times_ten)
+            .map(str)
+        )
+
+    async def test_wraps_sync_iterable(self):
+        result = await AsyncStream(range(3)).to_list()
+        self.assertListEqual(result, [0, 1, 2])
+
+    async def test_filter_with_async_function(self):
+        async def is_odd(value):
+            return value % 2 == 1
+
+        result = await AsyncStream(arange(6)).filter(is_odd).to_list()
+        self.assertListEqual(result, [1, 3, 5])
+
+    async def test_flatten(self):
+        result = await (
+            AsyncStream.of([1, 2, 3], arange(2), [6])
+            .flatten()
+            .to_list()
+        )
+
+        self.assertListEqual(result, [1, 2, 3, 0, 1, 6])
+
+    async def test_map_cached(self):
+        calls = []
+
+        async def record(value):
+            calls.append(value)
+            return await times_ten(value)
+
+        result = await AsyncStream([1, 2, 1, 2]).map_cached(record).to_list()
+
+        self.assertListEqual(result, [10, 20, 10, 20])
+        self.assertListEqual(calls, [1, 2])
+
+    async def test_map_concurrent(self):
+        running = 0
+        max_running = 0
+
+        async def track(value):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01 * (5 - value % 5))
+            running -= 1
+            return value * 10
+
+        result = await (
+            AsyncStream(arange(10))
+            .map_concurrent(track, limit=3)
+            .to_list()
+        )
+
+        self.assertListEqual(result, list(range(0, 100, 10)))
+        self.assertEqual(max_running, 3)
+
+    async def test_map_concurrent_unordered(self):
+        result = await (
+            AsyncStream(arange(10))
+            .map_concurrent(times_ten, limit=4, ordered=False)
+            .to_set()
+        )
+
+        self.assertSetEqual(result, set(range(0, 100, 10)))
+
+    def test_map_concurrent_with_invalid_limit_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            AsyncStream(arange(10)).map_concurrent(times_ten, limit=0)
+
+    async def test_unique(self):
+        result = await (
+            AsyncStream.of(0, 0, 1, 0, 1, 2, 0, 1, 2, 3)
+            .unique()
+            .to_list()
+        )
+
+        self.assertListEqual(result, [0, 1, 2, 3])
+
+    async def test_unique_with_key(self):
+        result = await (
+            AsyncStream.of('a', 'A', 'b', 'B')
+            .unique(key=str.lower)
+            .to_list()
+        )
+
+        self.assertListEqual(result, ['a', 'b'])
+
+    async def test_any(self):
+        self.assertFalse(await AsyncStream.of(0, 0, 0).any())
+        self.assertTrue(await AsyncStream.of(0, 1, 0).any())
+
+    async def test_count(self):
+        self.assertEqual(7, await self.stream.count())
+
+    async def test_reduce(self):
+        self.assertEqual(10, await AsyncStream(arange(5)).reduce())
+        self.assertEqual(20, await AsyncStream(arange(5)).reduce(initial=10))
+
+    async def test_reduce_empty_returns_default(self):
+        result = await AsyncStream([]).reduce(default=-1)
+        self.assertEqual(-1, result)
+
+    async def test_to_list(self):
+        self.assertListEqual(
+            await self.stream.to_list(),
+            ['60', '80', '100', '120', '140', '160', '180']
+        )
+
+    async def test_to_tuple(self):
+        self.assertTupleEqual(
+            await self.stream.to_tuple(),
+            ('60', '80', '100', '120', '140', '160', '180')
+        )
+
+    async def test_first(self):
+        self.assertEqual('60', await self.stream.first())
+
+    async def test_last(self):
+        self.assertEqual('180', await self.stream.last())
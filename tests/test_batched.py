@@ -0,0 +1,50 @@
+import time
+import unittest
+
+from yapytools import batched, chunked
+
+
+class ChunkedTest(unittest.TestCase):
+    def test(self):
+        result = chunked(range(7), 3)
+        self.assertListEqual(list(result), [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_empty_iterable_returns_no_chunks(self):
+        self.assertListEqual(list(chunked([], 3)), [])
+
+    def test_invalid_size_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            chunked(range(7), 0)
+
+
+class BatchedTest(unittest.TestCase):
+    def test_without_max_wait(self):
+        result = batched(range(7), 3)
+        self.assertListEqual(list(result), [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_with_max_wait_and_fast_input(self):
+        result = batched(range(7), 3, max_wait=10)
+        self.assertListEqual(list(result), [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_with_max_wait_and_slow_input_yields_partial_batches(self):
+        def slow_items():
+            yield 0
+            yield 1
+            time.sleep(0.3)
+            yield 2
+
+        result = batched(slow_items(), 10, max_wait=0.05)
+
+        self.assertListEqual(list(result), [[0, 1], [2]])
+
+    def test_with_max_wait_raises_input_error(self):
+        def failing_items():
+            yield 0
+            raise RuntimeError('oops')
+
+        with self.assertRaises(RuntimeError):
+            list(batched(failing_items(), 10, max_wait=1))
+
+    def test_with_max_wait_and_invalid_size_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            batched(range(7), 0, max_wait=1)
@@ -0,0 +1,172 @@
+import unittest
+from collections import OrderedDict, deque
+
+import numpy as np
+from parameterized import parameterized
+
+from yapytools.buffers import CachedIterable, is_reversible, reverse, tee
+
+
+class CachedIterableTest(unittest.TestCase):
+    @parameterized.expand([
+        ('memory', None),
+        ('memory', 0),
+        ('memory', 3),
+        ('disk', None),
+    ])
+    def test_can_be_iterated_repeatedly(self, policy, max_items):
+        cached = CachedIterable(iter(range(10)), policy, max_items)
+
+        self.assertListEqual(list(cached), list(range(10)))
+        self.assertListEqual(list(cached), list(range(10)))
+        self.assertEqual(len(cached), 10)
+
+    @parameterized.expand([('memory', None), ('memory', 2), ('disk', None)])
+    def test_interleaved_iterators(self, policy, max_items):
+        cached = CachedIterable(iter('abcde'), policy, max_items)
+        first = iter(cached)
+        next(first)
+
+        self.assertListEqual(list(zip(first, cached)), [('b', 'a'), ('c', 'b'), ('d', 'c'), ('e', 'd')])
+
+    def test_reads_source_lazily_and_once(self):
+        reads = []
+
+        def source():
+            for it in range(5):
+                reads.append(it)
+                yield it
+
+        cached = CachedIterable(source())
+        iterator = iter(cached)
+        next(iterator)
+        next(iterator)
+
+        self.assertListEqual(reads, [0, 1])
+
+        list(cached)
+        list(cached)
+
+        self.assertListEqual(reads, [0, 1, 2, 3, 4])
+
+    def test_items_beyond_max_items_spill_to_disk(self):
+        cached = CachedIterable(iter(range(10)), max_items=4)
+        list(cached)
+
+        self.assertEqual(len(cached._items), 4)
+        self.assertIsNotNone(cached._file)
+        cached.close()
+
+    @parameterized.expand([('ram', None), ('memory', -1)])
+    def test_invalid_arguments_raise_ValueError(self, policy, max_items):
+        with self.assertRaises(ValueError):
+            CachedIterable([], policy, max_items)
+
+
+class _Table:
+    """Iterates over rows, but is indexed by column name, like a DataFrame."""
+
+    def __len__(self):
+        return 2
+
+    def __iter__(self):
+        return iter(['r1', 'r2'])
+
+    def __getitem__(self, column):
+        return {'a': ['r1', 'r2']}[column]
+
+
+class IsReversibleTest(unittest.TestCase):
+    @parameterized.expand([
+        ([1, 2],),
+        ((1, 2),),
+        ('ab',),
+        (range(2),),
+        ({1: 2}.keys(),),
+        ({1: 2},),
+        (OrderedDict(a=1),),
+        (deque([1]),),
+    ])
+    def test_reversible(self, iterable):
+        self.assertTrue(is_reversible(iterable))
+
+    @parameterized.expand([
+        (iter([1, 2]),),
+        ({1, 2},),
+        (map(str, [1, 2]),),
+        (np.arange(2),),
+        (_Table(),),
+    ])
+    def test_not_reversible(self, iterable):
+        self.assertFalse(is_reversible(iterable))
+
+    def test_reversed_set_to_None(self):
+        class NotReversible(list):
+            __reversed__ = None
+
+        self.assertFalse(is_reversible(NotReversible()))
+
+
+class ReverseTest(unittest.TestCase):
+    @parameterized.expand([(None,), (1,), (3,), (10,), (100,)])
+    def test(self, max_memory_items):
+        result = reverse(iter(range(10)), max_memory_items)
+        self.assertListEqual(list(result), list(range(9, -1, -1)))
+
+    @parameterized.expand([(None,), (2,)])
+    def test_empty(self, max_memory_items):
+        self.assertListEqual(list(reverse(iter([]), max_memory_items)), [])
+
+    def test_label_indexed_table_is_buffered(self):
+        self.assertListEqual(list(reverse(_Table())), ['r2', 'r1'])
+
+    def test_uses_reversed_if_reversible(self):
+        items = deque('abc')
+        self.assertListEqual(list(reverse(items, max_memory_items=1)), ['c', 'b', 'a'])
+
+    def test_reads_source_lazily(self):
+        reads = []
+        result = reverse(map(reads.append, range(3)))
+
+        self.assertListEqual(reads, [])
+        next(result)
+        self.assertListEqual(reads, [0, 1, 2])
+
+    def test_spills_in_batches(self):
+        result = list(reverse(iter(range(5000)), max_memory_items=1500))
+        self.assertListEqual(result, list(range(4999, -1, -1)))
+
+    def test_invalid_max_memory_items_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            reverse([], 0)
+
+
+class TeeTest(unittest.TestCase):
+    @parameterized.expand([(1,), (2,), (5,)])
+    def test_each_iterator_gets_all_items(self, n):
+        iterators = tee(iter(range(10)), n)
+
+        self.assertEqual(len(iterators), n)
+        for iterator in iterators:
+            self.assertListEqual(list(iterator), list(range(10)))
+
+    def test_buffer_is_trimmed_once_all_iterators_have_seen_items(self):
+        a, b = tee(iter(range(10)), buffer_size=3)
+
+        for _ in range(10):
+            self.assertEqual(next(a), next(b))
+
+    def test_exceeding_buffer_size_raises_BufferError(self):
+        a, b = tee(iter(range(10)), buffer_size=3)
+
+        self.assertListEqual([next(a) for _ in range(3)], [0, 1, 2])
+        with self.assertRaises(BufferError):
+            next(a)
+
+        self.assertEqual(next(b), 0)
+        self.assertEqual(next(a), 3)
+
+    @parameterized.expand([(-1, None), (2, 0)])
+    def test_invalid_arguments_raise_ValueError(self, n, buffer_size):
+        with self.assertRaises(ValueError):
+            tee([], n, buffer_size)
@@ -0,0 +1,329 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from parameterized import parameterized
+
+from yapytools.caching import LFU, LRU, MISSING, TTL, Cache, memoize
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class LRUTest(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRU(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
+
+    def test_get_missing_returns_default(self):
+        cache = LRU()
+
+        self.assertIs(cache.get('a'), MISSING)
+        self.assertIsNone(cache.get('a', None))
+
+    def test_clear(self):
+        cache = LRU()
+        cache.set('a', 1)
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
+
+    @parameterized.expand([(0, None), (None, 0)])
+    def test_invalid_arguments_raise_ValueError(self, maxsize, max_bytes):
+        with self.assertRaises(ValueError):
+            LRU(maxsize, max_bytes)
+
+    def test_stats(self):
+        cache = LRU(maxsize=1)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('b')
+        cache.set('b', 2)
+
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual(cache.stats.hit_rate, 0.5)
+
+    def test_max_bytes_evicts_until_value_fits(self):
+        cache = LRU(maxsize=None, max_bytes=10, sizeof=len)
+        cache.set('a', 'xxxx')
+        cache.set('b', 'xxxx')
+        cache.get('a')
+        cache.set('c', 'xxxxx')
+
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.bytes, 9)
+
+    def test_value_larger_than_max_bytes_is_not_cached(self):
+        cache = LRU(max_bytes=3, sizeof=len)
+        cache.set('a', 'xx')
+        cache.set('b', 'xxxx')
+
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+
+
+class LFUTest(unittest.TestCase):
+    def test_evicts_least_frequently_used(self):
+        cache = LFU(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        cache.set('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_ties_evict_least_recently_used(self):
+        cache = LFU(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('c', 3)
+
+        self.assertListEqual([key in cache for key in 'abc'], [False, True, True])
+
+    def test_new_values_can_be_evicted_again(self):
+        cache = LFU(maxsize=3)
+        for key in 'ab':
+            cache.set(key, key)
+            for _ in range(5):
+                cache.get(key)
+
+        for key in 'cdef':
+            cache.set(key, key)
+
+        self.assertListEqual([key in cache for key in 'abcdef'], [True, True, False, False, False, True])
+        self.assertEqual(cache.stats.evictions, 3)
+
+
+class CacheTest(unittest.TestCase):
+    def test_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Cache(maxsize=1)
+
+
+class TTLTest(unittest.TestCase):
+    def test_filling_large_cache_is_fast(self):
+        cache = TTL(ttl=60)
+        start = time.perf_counter()
+        for i in range(40_000):
+            cache.set(i, i)
+
+        self.assertEqual(len(cache), 40_000)
+        self.assertLess(time.perf_counter() - start, 2)
+
+    def test_values_expire(self):
+        timer = FakeTimer()
+        cache = TTL(ttl=10, timer=timer)
+        cache.set('a', 1)
+        timer.now = 5
+        cache.set('b', 2)
+
+        timer.now = 9.9
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(len(cache), 2)
+
+        timer.now = 10
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.get('b'), 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_setting_again_renews_expiry(self):
+        timer = FakeTimer()
+        cache = TTL(ttl=10, timer=timer)
+        cache.set('a', 1)
+        timer.now = 5
+        cache.set('a', 2)
+
+        timer.now = 12
+        self.assertEqual(cache.get('a'), 2)
+
+    def test_maxsize_evicts_oldest(self):
+        cache = TTL(ttl=10, maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('c', 3)
+
+        self.assertNotIn('a', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_values_count_as_evictions(self):
+        timer = FakeTimer()
+        cache = TTL(ttl=10, timer=timer)
+        cache.set('a', 1)
+        timer.now = 10
+
+        self.assertIs(cache.get('a'), MISSING)
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual(cache.stats.misses, 1)
+
+    @parameterized.expand([(0, None), (10, 0)])
+    def test_invalid_arguments_raise_ValueError(self, ttl, maxsize):
+        with self.assertRaises(ValueError):
+            TTL(ttl, maxsize)
+
+
+class GetOrComputeTest(unittest.TestCase):
+    def test_computes_once(self):
+        cache = LRU()
+
+        self.assertEqual(cache.get_or_compute('a', lambda: 1), 1)
+        self.assertEqual(cache.get_or_compute('a', lambda: 2), 1)
+
+    def test_concurrent_threads_compute_once(self):
+        cache = LRU()
+        calls = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute)))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertListEqual(results, ['value'] * 5)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.hits, 4)
+
+    def test_error_is_raised_and_not_cached(self):
+        cache = LRU()
+
+        with self.assertRaises(ZeroDivisionError):
+            cache.get_or_compute('a', lambda: 1 / 0)
+
+        self.assertEqual(cache.get_or_compute('a', lambda: 1), 1)
+
+    def test_concurrent_tasks_compute_once(self):
+        cache = LRU()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'value'
+
+        async def main():
+            return await asyncio.gather(*(cache.aget_or_compute('key', compute) for _ in range(5)))
+
+        self.assertListEqual(asyncio.run(main()), ['value'] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_event_loops_in_different_threads_compute_once(self):
+        cache = LRU()
+        calls = []
+        started = threading.Event()
+
+        async def compute():
+            calls.append(1)
+            started.set()
+            await asyncio.sleep(0.05)
+            return 'value'
+
+        results = []
+
+        def run():
+            results.append(asyncio.run(cache.aget_or_compute('key', compute)))
+
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual(results, ['value'] * 3)
+        self.assertEqual(len(calls), 1)
+
+    def test_waiter_computes_if_leader_is_cancelled(self):
+        cache = LRU()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        async def main():
+            leader = asyncio.ensure_future(cache.aget_or_compute('key', compute))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(cache.aget_or_compute('key', compute))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await waiter, leader.cancelled()
+
+        self.assertEqual(asyncio.run(main()), (2, True))
+        self.assertEqual(len(calls), 2)
+
+
+class MemoizeTest(unittest.TestCase):
+    def test(self):
+        calls = []
+
+        @memoize(cache=LRU(2))
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        self.assertListEqual([double(1), double(2), double(1), double(3), double(2)], [2, 4, 2, 6, 4])
+        self.assertListEqual(calls, [1, 2, 3, 2])
+        self.assertEqual(double.cache.stats.hits, 1)
+        self.assertEqual(double.__name__, 'double')
+
+    def test_key(self):
+        lengths = memoize(len, key=lambda it: it[0])
+
+        self.assertEqual(lengths('ab'), 2)
+        self.assertEqual(lengths('abc'), 2)
+
+    def test_without_args_uses_default_cache(self):
+        self.assertIsInstance(memoize(len).cache, LRU)
+
+    def test_coroutine_function(self):
+        calls = []
+
+        @memoize
+        async def fetch(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value * 2
+
+        async def main():
+            return await asyncio.gather(fetch(1), fetch(1), fetch(2))
+
+        self.assertListEqual(asyncio.run(main()), [2, 2, 4])
+        self.assertListEqual(calls, [1, 2])
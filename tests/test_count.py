@@ -1,6 +1,7 @@
 import unittest
 
 from yapytools import count
+from yapytools.predicates import is_even
 
 
 class CountTest(unittest.TestCase):
@@ -11,3 +12,7 @@ class CountTest(unittest.TestCase):
     def test_empty_iterable(self):
         result = count([], lambda it: True)
         self.assertEqual(result, 0)
+
+    def test_with_workers(self):
+        result = count(range(1000), is_even, workers=4, chunk_size=16)
+        self.assertEqual(result, 500)
@@ -0,0 +1,206 @@
+import bz2
+import gzip
+import json
+import lzma
+import os
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from yapytools.files import (
+    byte_ranges,
+    read_csv,
+    read_jsonl,
+    read_lines,
+    write_csv,
+    write_file,
+    write_jsonl,
+    write_partitioned,
+)
+
+
+class FileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def path(self, name: str = 'data') -> str:
+        return os.path.join(self.dir.name, name)
+
+    def read(self, path: str, open_=open) -> str:
+        with open_(path, 'rt', encoding='utf-8', newline='') as file:
+            return file.read()
+
+    def write(self, data: bytes) -> str:
+        path = self.path()
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+
+class ReadLinesTest(FileTestCase):
+    @parameterized.expand([
+        (b'', []),
+        (b'\n', ['']),
+        (b'a', ['a']),
+        (b'a\nbb\n\nccc\n', ['a', 'bb', '', 'ccc']),
+        (b'a\r\nbb\r\nccc', ['a', 'bb', 'ccc']),
+    ])
+    def test(self, data, expected):
+        path = self.write(data)
+
+        for mmap in (True, False):
+            for chunk_bytes in (1, 2, 3, 1 << 20):
+                self.assertListEqual(list(read_lines(path, mmap=mmap, chunk_bytes=chunk_bytes)), expected)
+
+    def test_keep_ends(self):
+        path = self.write(b'a\nb\r\nc')
+        self.assertListEqual(list(read_lines(path, keep_ends=True)), ['a\n', 'b\r\n', 'c'])
+
+    def test_multi_byte_characters_split_across_blocks(self):
+        path = self.write('héllo\nwörld\n'.encode('utf-8'))
+        self.assertListEqual(list(read_lines(path, chunk_bytes=2)), ['héllo', 'wörld'])
+
+    @parameterized.expand([(1,), (2,), (3,), (7,), (100,)])
+    def test_byte_ranges_read_each_line_exactly_once(self, n):
+        lines = [str(it) * (it % 7) for it in range(100)]
+        path = self.write('\n'.join(lines).encode('utf-8'))
+
+        for mmap in (True, False):
+            result = [
+                line
+                for start, end in byte_ranges(path, n)
+                for line in read_lines(path, start, end, mmap=mmap, chunk_bytes=16)
+            ]
+            self.assertListEqual(result, lines)
+
+    @parameterized.expand([(-1, None), (5, 4), (0, None, 0)])
+    def test_invalid_arguments_raise_ValueError(self, start, end, chunk_bytes=1):
+        with self.assertRaises(ValueError):
+            read_lines('unused', start, end, chunk_bytes=chunk_bytes)
+
+
+class ByteRangesTest(FileTestCase):
+    def test(self):
+        path = self.write(b'x' * 10)
+        self.assertListEqual(byte_ranges(path, 3), [(0, 3), (3, 6), (6, 10)])
+
+    def test_invalid_n_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            byte_ranges(self.write(b''), 0)
+
+
+class ReadJsonlTest(FileTestCase):
+    def test(self):
+        values = [{'a': 1}, [1, 2], 'foo', None]
+        path = self.write(('\n'.join(map(json.dumps, values)) + '\n\n').encode('utf-8'))
+
+        self.assertListEqual(list(read_jsonl(path)), values)
+
+
+class ReadCsvTest(FileTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = self.write(b'name,note\r\nfoo,"multi\nline"\r\nbar,plain\r\n')
+
+    def test_header(self):
+        self.assertListEqual(list(read_csv(self.path)), [
+            {'name': 'foo', 'note': 'multi\nline'},
+            {'name': 'bar', 'note': 'plain'},
+        ])
+
+    def test_no_header(self):
+        self.assertListEqual(list(read_csv(self.path, header=False)), [
+            ['name', 'note'],
+            ['foo', 'multi\nline'],
+            ['bar', 'plain'],
+        ])
+
+    def test_byte_range_uses_header_from_start_of_file(self):
+        start = os.path.getsize(self.path) - len(b'bar,plain\r\n')
+        self.assertListEqual(list(read_csv(self.path, start=start)), [{'name': 'bar', 'note': 'plain'}])
+
+
+class WriteFileTest(FileTestCase):
+    @parameterized.expand([(1,), (5,), (1 << 20,)])
+    def test(self, buffer_bytes):
+        count = write_file(range(10), self.path(), lambda it: f'#{it}', buffer_bytes=buffer_bytes)
+
+        self.assertEqual(count, 10)
+        self.assertEqual(self.read(self.path()), ''.join(f'#{it}\n' for it in range(10)))
+
+    def test_empty(self):
+        self.assertEqual(write_file([], self.path()), 0)
+        self.assertEqual(self.read(self.path()), '')
+
+    @parameterized.expand([('gzip', gzip.open), ('bz2', bz2.open), ('xz', lzma.open)])
+    def test_compression(self, compression, open_):
+        write_file(['héllo', 'wörld'], self.path(), compression=compression)
+        self.assertEqual(self.read(self.path(), open_), 'héllo\nwörld\n')
+
+    @parameterized.expand([('zip', 1024), (None, 0)])
+    def test_invalid_arguments_raise_ValueError(self, compression, buffer_bytes):
+        with self.assertRaises(ValueError):
+            write_file([], self.path(), compression=compression, buffer_bytes=buffer_bytes)
+
+
+class WriteJsonlTest(FileTestCase):
+    def test_round_trip(self):
+        values = [{'a': 1}, [1, 2], 'foo', None]
+
+        self.assertEqual(write_jsonl(values, self.path()), 4)
+        self.assertListEqual(list(read_jsonl(self.path())), values)
+
+
+class WriteCsvTest(FileTestCase):
+    def test_dicts(self):
+        rows = [{'name': 'foo', 'note': 'multi\nline'}, {'name': 'bar', 'note': 'plain'}]
+
+        self.assertEqual(write_csv(rows, self.path()), 2)
+        self.assertListEqual(list(read_csv(self.path())), rows)
+
+    def test_sequences(self):
+        rows = [['foo', 1], ['bar', 2]]
+
+        self.assertEqual(write_csv(rows, self.path(), fieldnames=['name', 'value']), 2)
+        self.assertEqual(self.read(self.path()), 'name,value\r\nfoo,1\r\nbar,2\r\n')
+
+    def test_empty(self):
+        self.assertEqual(write_csv([], self.path()), 0)
+        self.assertEqual(self.read(self.path()), '')
+
+
+class WritePartitionedTest(FileTestCase):
+    @parameterized.expand([(1,), (2,), (64,)])
+    def test(self, max_open_files):
+        directory = self.path('out')
+
+        count = write_partitioned(
+            range(20),
+            lambda it: it % 3,
+            directory,
+            filename='part-{key}.txt',
+            max_open_files=max_open_files,
+            buffer_bytes=4,
+        )
+
+        self.assertEqual(count, 20)
+        self.assertListEqual(sorted(os.listdir(directory)), ['part-0.txt', 'part-1.txt', 'part-2.txt'])
+        for key in range(3):
+            self.assertEqual(
+                self.read(os.path.join(directory, f'part-{key}.txt')),
+                ''.join(f'{it}\n' for it in range(key, 20, 3)),
+            )
+
+    def test_compressed_partitions_reopened_for_appending(self):
+        directory = self.path('out')
+
+        write_partitioned(range(10), lambda it: it % 2, directory, filename='{key}.gz',
+                          max_open_files=1, compression='gzip')
+
+        self.assertEqual(self.read(os.path.join(directory, '0.gz'), gzip.open), '0\n2\n4\n6\n8\n')
+
+    def test_invalid_max_open_files_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            write_partitioned([], str, self.path('out'), max_open_files=0)
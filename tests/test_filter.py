@@ -48,3 +48,7 @@ class FiltersTest(unittest.TestCase):
             list(result),
             list(range(10)),
         )
+
+    def test_none_keeps_truthy_items(self):
+        results = filters([0, 1, 2, None, 3, 4], None, is_even)
+        self.assertListEqual(list(results), [2, 4])
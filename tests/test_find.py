@@ -1,4 +1,5 @@
 import unittest
+from collections import OrderedDict, deque
 
 from parameterized import parameterized
 
@@ -15,6 +16,10 @@ class FindTest(unittest.TestCase):
         result = find(range(11), is_negative)
         self.assertIsNone(result)
 
+    def test_with_workers(self):
+        result = find(range(1, 1000), lambda it: it % 97 == 0, workers=4, chunk_size=8)
+        self.assertEqual(result, 97)
+
 
 class FindLastTest(unittest.TestCase):
     @parameterized.expand([10, 11])
@@ -34,3 +39,47 @@ class FindLastTest(unittest.TestCase):
     def test_with_item_not_in_sequence(self):
         result = find_last(list(range(11)), is_negative)
         self.assertIsNone(result)
+
+    @parameterized.expand([
+        (deque(range(11)),),
+        (OrderedDict.fromkeys(range(11)),),
+        (dict.fromkeys(range(11)).keys(),),
+    ])
+    def test_with_reversible(self, iterable):
+        result = find_last(iterable, is_odd)
+        self.assertEqual(result, 9)
+
+    def test_with_label_indexed_table(self):
+        class Table:
+            def __len__(self):
+                return 2
+
+            def __iter__(self):
+                return iter(['r1', 'r2'])
+
+            def __getitem__(self, column):
+                return {'a': ['r1', 'r2']}[column]
+
+        self.assertEqual(find_last(Table(), lambda it: it.startswith('r')), 'r2')
+
+    def test_traverses_reversible_backwards(self):
+        checked = []
+
+        class Reversible:
+            def __iter__(self):
+                raise AssertionError('iterated forward')
+
+            def __reversed__(self):
+                return reversed(range(11))
+
+        def is_odd_(value):
+            checked.append(value)
+            return value % 2 == 1
+
+        self.assertEqual(find_last(Reversible(), is_odd_), 9)
+        self.assertListEqual(checked, [10, 9])
+
+    @parameterized.expand([(list,), (iter,)])
+    def test_with_workers(self, type_):
+        result = find_last(type_(range(1000)), lambda it: it % 97 == 0, workers=4, chunk_size=8)
+        self.assertEqual(result, 970)
@@ -1,6 +1,6 @@
 import unittest
 
-from yapytools import group_by, group_by_to
+from yapytools import external_group_by, group_by, group_by_to
 from yapytools.predicates import is_even
 
 
@@ -46,3 +46,38 @@ class GroupByToTest(unittest.TestCase):
         )
 
         self.assertDictEqual(result, {})
+
+
+class ExternalGroupByTest(unittest.TestCase):
+    def test_in_memory(self):
+        result = external_group_by(
+            range(10),
+            key_selector=lambda it: 'even' if is_even(it) else 'odd',
+            value_transform=lambda it: -it,
+        )
+
+        self.assertListEqual(
+            [(key, list(values)) for key, values in result],
+            [('even', [0, -2, -4, -6, -8]), ('odd', [-1, -3, -5, -7, -9])],
+        )
+
+    def test_spills_to_disk(self):
+        result = external_group_by(
+            range(1000),
+            key_selector=lambda it: it % 7,
+            max_memory_bytes=1024,
+            partitions=3,
+        )
+
+        self.assertDictEqual(
+            {key: list(values) for key, values in result},
+            group_by(range(1000), lambda it: it % 7),
+        )
+
+    def test_empty_iterable_returns_no_groups(self):
+        result = external_group_by([], key_selector=lambda it: it)
+        self.assertListEqual(list(result), [])
+
+    def test_invalid_partitions_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            list(external_group_by([], key_selector=lambda it: it, partitions=0))
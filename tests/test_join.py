@@ -0,0 +1,133 @@
+import unittest
+
+from parameterized import parameterized
+
+from yapytools import Stream, anti_join, cogroup, join, semi_join
+
+LEFT = [(1, 'a'), (2, 'b'), (2, 'c'), (4, 'd')]
+RIGHT = [(0, 'w'), (2, 'x'), (2, 'y'), (4, 'z')]
+
+
+def first(it):
+    return it[0]
+
+
+class JoinTest(unittest.TestCase):
+    @parameterized.expand(['hash', 'merge'])
+    def test_inner(self, method: str):
+        result = join(LEFT, RIGHT, first, method=method)
+
+        self.assertListEqual(
+            list(result),
+            [
+                ((2, 'b'), (2, 'x')),
+                ((2, 'b'), (2, 'y')),
+                ((2, 'c'), (2, 'x')),
+                ((2, 'c'), (2, 'y')),
+                ((4, 'd'), (4, 'z')),
+            ]
+        )
+
+    @parameterized.expand(['hash', 'merge'])
+    def test_left(self, method: str):
+        result = join(LEFT, RIGHT, first, how='left', method=method)
+
+        self.assertListEqual(
+            list(result),
+            [
+                ((1, 'a'), None),
+                ((2, 'b'), (2, 'x')),
+                ((2, 'b'), (2, 'y')),
+                ((2, 'c'), (2, 'x')),
+                ((2, 'c'), (2, 'y')),
+                ((4, 'd'), (4, 'z')),
+            ]
+        )
+
+    @parameterized.expand(['hash', 'merge'])
+    def test_outer(self, method: str):
+        result = join(LEFT, RIGHT, first, how='outer', method=method)
+
+        self.assertCountEqual(
+            list(result),
+            [
+                ((1, 'a'), None),
+                ((2, 'b'), (2, 'x')),
+                ((2, 'b'), (2, 'y')),
+                ((2, 'c'), (2, 'x')),
+                ((2, 'c'), (2, 'y')),
+                ((4, 'd'), (4, 'z')),
+                (None, (0, 'w')),
+            ]
+        )
+
+    @parameterized.expand(['hash', 'merge'])
+    def test_with_different_keys(self, method: str):
+        result = join(
+            [1, 2, 3],
+            ['1', '3', '5'],
+            left_key=lambda it: it,
+            right_key=int,
+            method=method,
+        )
+
+        self.assertListEqual(list(result), [(1, '1'), (3, '3')])
+
+    @parameterized.expand(['hash', 'merge'])
+    def test_unorderable_equal_keys(self, method: str):
+        result = join([None, 1], [None], lambda it: it, how='left', method=method)
+        self.assertListEqual(list(result), [(None, None), (1, None)])
+
+    def test_inner_builds_table_on_smaller_left_side(self):
+        left = [(2, 'b'), (4, 'd')]
+        right = Stream([(4, 'z'), (2, 'x'), (1, 'y')])
+
+        result = join(left, right, first)
+
+        # Pairs are in the order of the streamed right side
+        self.assertListEqual(
+            list(result),
+            [((4, 'd'), (4, 'z')), ((2, 'b'), (2, 'x'))],
+        )
+
+    def test_is_lazy(self):
+        def items():
+            raise RuntimeError('Should not be called yet')
+            yield
+
+        join(items(), items(), first)
+
+    @parameterized.expand([
+        ({'how': 'cross'},),
+        ({'method': 'nested'},),
+    ])
+    def test_invalid_arguments_raise_ValueError(self, kwargs):
+        with self.assertRaises(ValueError):
+            join(LEFT, RIGHT, first, **kwargs)
+
+
+class CogroupTest(unittest.TestCase):
+    def test(self):
+        result = cogroup(LEFT, RIGHT, first)
+
+        self.assertListEqual(
+            list(result),
+            [
+                (1, [(1, 'a')], []),
+                (2, [(2, 'b'), (2, 'c')], [(2, 'x'), (2, 'y')]),
+                (4, [(4, 'd')], [(4, 'z')]),
+                (0, [], [(0, 'w')]),
+            ]
+        )
+
+
+class SemiJoinTest(unittest.TestCase):
+    def test(self):
+        result = semi_join(LEFT, RIGHT, first)
+        self.assertListEqual(list(result), [(2, 'b'), (2, 'c'), (4, 'd')])
+
+
+class AntiJoinTest(unittest.TestCase):
+    def test(self):
+        result = anti_join(LEFT, [4, 5], first, right_key=lambda it: it)
+        self.assertListEqual(list(result), [(1, 'a'), (2, 'b'), (2, 'c')])
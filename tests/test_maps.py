@@ -37,3 +37,7 @@ class MapsTest(unittest.TestCase):
             list(result),
             list(range(10)),
         )
+
+    def test_many_functions(self):
+        result = maps(range(-3, 3), *[abs] * 300)
+        self.assertListEqual(list(result), [3, 2, 1, 0, 1, 2])
@@ -0,0 +1,209 @@
+import itertools
+import threading
+import time
+import unittest
+
+from parameterized import parameterized
+
+from yapytools.parallel import (
+    parallel_count,
+    parallel_filter,
+    parallel_find,
+    parallel_find_last,
+    parallel_map,
+    parallel_options,
+    run_any,
+)
+from yapytools.plan import MAP
+from yapytools.predicates import is_even, is_negative
+
+
+def square(value: int) -> int:
+    return value * value
+
+
+class ParallelMapTest(unittest.TestCase):
+    @parameterized.expand(['thread', 'process'])
+    def test(self, backend: str):
+        result = parallel_map(
+            square,
+            range(100),
+            workers=2,
+            backend=backend,
+            chunk_size=7,
+        )
+
+        self.assertListEqual(
+            list(result),
+            [it * it for it in range(100)],
+        )
+
+    def test_unordered(self):
+        result = parallel_map(
+            square,
+            range(100),
+            workers=4,
+            chunk_size=3,
+            ordered=False,
+        )
+
+        self.assertListEqual(
+            sorted(result),
+            [it * it for it in range(100)],
+        )
+
+    def test_empty_iterable_returns_empty_iterable(self):
+        result = parallel_map(square, [], workers=2)
+        self.assertListEqual(list(result), [])
+
+    def test_unbounded_iterable(self):
+        result = parallel_map(
+            square,
+            itertools.count(),
+            workers=2,
+            chunk_size=4,
+            max_in_flight=2,
+        )
+
+        self.assertListEqual(
+            list(itertools.islice(result, 10)),
+            [0, 1, 4, 9, 16, 25, 36, 49, 64, 81],
+        )
+
+    def test_exception_is_raised(self):
+        result = parallel_map(lambda it: 1 / it, [1, 0, 2], workers=2)
+
+        with self.assertRaises(ZeroDivisionError):
+            list(result)
+
+
+class ParallelFilterTest(unittest.TestCase):
+    def test(self):
+        result = parallel_filter(is_even, range(10), workers=2, chunk_size=3)
+
+        self.assertListEqual(
+            list(result),
+            [0, 2, 4, 6, 8],
+        )
+
+
+class ParallelCountTest(unittest.TestCase):
+    @parameterized.expand(['thread', 'process'])
+    def test(self, backend: str):
+        result = parallel_count(is_even, range(101), workers=2, backend=backend, chunk_size=7)
+        self.assertEqual(result, 51)
+
+    def test_empty_iterable(self):
+        self.assertEqual(parallel_count(is_even, [], workers=2), 0)
+
+
+class ParallelFindTest(unittest.TestCase):
+    @parameterized.expand(['thread', 'process'])
+    def test(self, backend: str):
+        result = parallel_find(is_even, range(1, 100), workers=2, backend=backend, chunk_size=7)
+        self.assertEqual(result, 2)
+
+    def test_returns_earliest_match_when_later_chunks_finish_first(self):
+        def is_match(value):
+            if value < 10:
+                time.sleep(0.01)
+            return value % 10 == 5
+
+        result = parallel_find(is_match, range(100), workers=4, chunk_size=10)
+
+        self.assertEqual(result, 5)
+
+    def test_without_match_returns_None(self):
+        self.assertIsNone(parallel_find(is_negative, range(100), workers=2, chunk_size=7))
+
+    def test_found_None_is_returned(self):
+        self.assertIsNone(parallel_find(lambda it: it is None, [1, None, 2], workers=2, chunk_size=1))
+
+    def test_stops_reading_once_match_is_known(self):
+        read = itertools.count()
+
+        def items():
+            for item in range(1_000_000):
+                next(read)
+                yield item
+
+        result = parallel_find(lambda it: it == 3, items(), workers=2, chunk_size=10, max_in_flight=2)
+
+        self.assertEqual(result, 3)
+        self.assertLessEqual(next(read), 40)
+
+    def test_cancels_later_chunks(self):
+        checked = set()
+        lock = threading.Lock()
+
+        def is_match(value):
+            with lock:
+                checked.add(value)
+            time.sleep(0.001)
+            return value == 0
+
+        parallel_find(is_match, range(1000), workers=1, chunk_size=10, max_in_flight=10)
+
+        self.assertLess(len(checked), 100)
+
+    def test_error_before_match_is_raised(self):
+        def is_match(value):
+            if value == 3:
+                raise ZeroDivisionError
+            return value == 50
+
+        with self.assertRaises(ZeroDivisionError):
+            parallel_find(is_match, range(100), workers=4, chunk_size=5)
+
+    def test_error_after_match_is_ignored(self):
+        def is_match(value):
+            if value == 50:
+                raise ZeroDivisionError
+            if value == 3:
+                time.sleep(0.05)
+            return value == 3
+
+        self.assertEqual(parallel_find(is_match, range(100), workers=4, chunk_size=5), 3)
+
+
+class ParallelFindLastTest(unittest.TestCase):
+    @parameterized.expand([
+        ('thread', list),
+        ('thread', iter),
+        ('process', list),
+        ('process', iter),
+    ])
+    def test(self, backend: str, type_):
+        result = parallel_find_last(is_even, type_(range(100)), workers=2, backend=backend, chunk_size=7)
+        self.assertEqual(result, 98)
+
+    @parameterized.expand([(list,), (iter,)])
+    def test_without_match_returns_None(self, type_):
+        self.assertIsNone(parallel_find_last(is_negative, type_(range(100)), workers=2, chunk_size=7))
+
+
+class RunAnyTest(unittest.TestCase):
+    def test(self):
+        options = parallel_options(workers=2, chunk_size=3)
+
+        self.assertTrue(run_any([(MAP, is_even)], range(1, 10), options))
+        self.assertFalse(run_any([(MAP, is_negative)], range(1, 10), options))
+        self.assertFalse(run_any([], [], options))
+
+
+class ParallelOptionsTest(unittest.TestCase):
+    def test_defaults(self):
+        options = parallel_options(workers=3)
+
+        self.assertEqual(options.backend, 'thread')
+        self.assertEqual(options.max_in_flight, 6)
+
+    @parameterized.expand([
+        ({'backend': 'gpu'},),
+        ({'workers': 0},),
+        ({'chunk_size': 0},),
+        ({'max_in_flight': 0},),
+    ])
+    def test_invalid_option_raises_ValueError(self, kwargs):
+        with self.assertRaises(ValueError):
+            parallel_options(**kwargs)
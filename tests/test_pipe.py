@@ -1,6 +1,9 @@
 import unittest
 
+from parameterized import parameterized
+
 from yapytools import pipe
+from yapytools.caching import LRU
 
 
 class PipeTest(unittest.TestCase):
@@ -13,3 +16,53 @@ class PipeTest(unittest.TestCase):
         self.assertEqual(f(0), 20)
         self.assertEqual(f(1), 22)
         self.assertEqual(f(10), 40)
+
+    @parameterized.expand([(1,), (2,), (49,), (50,), (51,), (237,)])
+    def test_compile(self, size):
+        f = pipe(*([lambda it: it + 1] * size), compile=True)
+        self.assertEqual(f(0), size)
+
+    def test_compile_passes_all_args_to_first_function(self):
+        f = pipe(lambda a, b=0: a - b, str, compile=True)
+        self.assertEqual(f(5, b=2), '3')
+
+    def test_stages(self):
+        self.assertTupleEqual(pipe(str.strip, int).stages, (str.strip, int))
+
+    def test_memoize(self):
+        calls = []
+
+        def record(value):
+            calls.append(value)
+            return value * 2
+
+        f = pipe(record, str, memoize=LRU(2))
+
+        self.assertListEqual([f(1), f(2), f(1), f(3), f(2)], ['2', '4', '2', '6', '4'])
+        self.assertListEqual(calls, [1, 2, 3, 2])
+        self.assertEqual(len(f.cache), 2)
+
+    def test_memoize_keys_on_args_and_kwargs(self):
+        f = pipe(lambda *args, **kwargs: (args, kwargs), memoize=LRU())
+
+        self.assertEqual(f((1, 2)), (((1, 2),), {}))
+        self.assertEqual(f(1, 2), ((1, 2), {}))
+        self.assertEqual(f(1, b=2), ((1,), {'b': 2}))
+
+    def test_memoize_does_not_cache_unhashable_args(self):
+        f = pipe(len, memoize=LRU())
+
+        self.assertEqual(f([1, 2]), 2)
+        self.assertEqual(len(f.cache), 0)
+
+    def test_profile(self):
+        f = pipe(str.strip, int, compile=True, memoize=LRU())
+        profiled = f.profile()
+
+        self.assertEqual(profiled(' 1 '), 1)
+        self.assertEqual(profiled(' 2 '), 2)
+
+        stats = profiled.stats.stages
+        self.assertListEqual([it.name for it in stats], ['map(strip)', 'map(int)'])
+        self.assertListEqual([it.items_in for it in stats], [2, 2])
+        self.assertTrue(all(it.wall_time > 0 for it in stats))
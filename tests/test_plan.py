@@ -0,0 +1,80 @@
+import unittest
+
+from parameterized import parameterized
+
+from yapytools.plan import FILTER, MAP, NESTING_LIMIT, describe, fuse, nest_calls
+from yapytools.predicates import Condition, is_even, is_positive, is_zero
+
+
+class FuseTest(unittest.TestCase):
+    def test_no_stages_returns_items(self):
+        run = fuse([])
+        self.assertListEqual(list(run(range(3))), [0, 1, 2])
+
+    @parameterized.expand([
+        ([(MAP, str)], ['0', '1', '2', '3', '4', '5']),
+        ([(FILTER, is_even)], [0, 2, 4]),
+        ([(MAP, lambda it: it - 2), (MAP, abs), (MAP, str)], ['2', '1', '0', '1', '2', '3']),
+        ([(FILTER, is_even), (FILTER, is_positive)], [2, 4]),
+        ([(FILTER, Condition(is_even) & is_positive)], [2, 4]),
+        ([(MAP, lambda it: it - 2), (FILTER, ~(Condition(is_zero) | is_even)), (MAP, str)], ['-1', '1', '3']),
+        (
+            [
+                (MAP, lambda it: it - 2),
+                (FILTER, is_positive),
+                (MAP, lambda it: it * 10),
+                (FILTER, lambda it: it != 20),
+                (MAP, str),
+            ],
+            ['10', '30'],
+        ),
+    ])
+    def test(self, stages, expected):
+        run = fuse(stages)
+        self.assertListEqual(list(run(range(6))), expected)
+
+    def test_many_maps(self):
+        run = fuse([(MAP, lambda it: it + 1)] * 300 + [(FILTER, is_even), (MAP, str)])
+        self.assertListEqual(list(run(range(4))), ['300', '302'])
+
+    def test_many_combined_conditions(self):
+        check = Condition(is_positive)
+        for _ in range(300):
+            check = check & is_even
+
+        run = fuse([(FILTER, check)])
+        self.assertListEqual(list(run(range(-2, 5))), [2, 4])
+
+    def test_is_lazy(self):
+        calls = []
+
+        def record(value):
+            calls.append(value)
+            return value
+
+        run = fuse([(MAP, record), (FILTER, is_even)])
+        iterator = run(range(10))
+
+        self.assertListEqual(calls, [])
+        self.assertEqual(next(iterator), 0)
+        self.assertListEqual(calls, [0])
+
+
+class DescribeTest(unittest.TestCase):
+    def test(self):
+        result = describe([(FILTER, is_even), (MAP, lambda it: it), (MAP, str)])
+        self.assertEqual(result, 'filter(is_even) -> map(<lambda>) -> map(str)')
+
+
+class NestCallsTest(unittest.TestCase):
+    def test(self):
+        statements, value = nest_calls(['f0(item)', 'f1(item)'], 'x', 'y')
+
+        self.assertListEqual(statements, [])
+        self.assertEqual(value, 'f1(f0(x))')
+
+    def test_assigns_every_nesting_limit_calls(self):
+        statements, value = nest_calls(['f(item)'] * (NESTING_LIMIT + 1), 'x', 'y')
+
+        self.assertListEqual(statements, ['y = ' + 'f(' * NESTING_LIMIT + 'x' + ')' * NESTING_LIMIT])
+        self.assertEqual(value, 'f(y)')
@@ -0,0 +1,131 @@
+import pickle
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from yapytools.predicates import (
+    Condition,
+    as_function,
+    condition,
+    filter_batch,
+    is_even,
+    is_none,
+    is_not_none,
+    is_positive,
+    is_true,
+    is_zero,
+)
+
+
+def _is_small(value) -> bool:
+    return abs(value) < 10
+
+
+even = Condition(is_even)
+positive = Condition(is_positive)
+zero = Condition(is_zero)
+
+
+class ConditionTest(unittest.TestCase):
+    def test_call(self):
+        self.assertTrue(even(4))
+        self.assertFalse(even(3))
+
+    def test_module_predicates_are_plain_functions(self):
+        self.assertNotIsInstance(is_even, Condition)
+        self.assertIs(as_function(is_even), is_even)
+
+    @parameterized.expand([
+        (even & positive, [2, 4]),
+        (even | is_positive, [-4, -2, 0, 1, 2, 3, 4]),
+        (is_even | positive, [-4, -2, 0, 1, 2, 3, 4]),
+        (~even, [-3, -1, 1, 3]),
+        (even & ~zero, [-4, -2, 2, 4]),
+        (positive & _is_small, [1, 2, 3, 4]),
+        (_is_small & ~positive, [-4, -3, -2, -1, 0]),
+        (~(even | is_positive) | is_zero, [-3, -1, 0]),
+    ])
+    def test_combined(self, check, expected):
+        values = list(range(-4, 5))
+
+        self.assertListEqual([it for it in values if check(it)], expected)
+        self.assertListEqual(list(filter(check.check, values)), expected)
+        self.assertListEqual(check.mask(values).tolist(), [it in expected for it in values])
+
+    def test_many_combined(self):
+        check_and, check_or = even, zero
+        for _ in range(300):
+            check_and &= positive
+            check_or |= positive
+
+        self.assertListEqual(list(filter(check_and, range(-2, 5))), [2, 4])
+        self.assertListEqual(list(filter(check_or, range(-2, 3))), [0, 1, 2])
+        self.assertEqual(check_and.check(-2), False)
+
+    def test_combined_short_circuits(self):
+        calls = []
+
+        def record(value) -> bool:
+            calls.append(value)
+            return True
+
+        check = even & record
+        self.assertListEqual(list(filter(check, range(4))), [0, 2])
+        self.assertListEqual(calls, [0, 2])
+
+    def test_name(self):
+        self.assertEqual(even.__name__, 'is_even')
+        self.assertEqual(repr(even & ~Condition(is_none)), '(is_even & ~is_none)')
+        self.assertEqual((even & ~Condition(is_none)).check.__name__, '(is_even & ~is_none)')
+
+    def test_pickle(self):
+        self.assertIs(pickle.loads(pickle.dumps(even)).function, is_even)
+        self.assertIsNotNone(pickle.loads(pickle.dumps(Condition(is_true))).vectorized)
+
+        check = pickle.loads(pickle.dumps(even & ~Condition(_is_small)))
+        self.assertListEqual(list(filter(check, range(16))), [10, 12, 14])
+
+    def test_mask_uses_vectorized_function(self):
+        values = np.arange(-3, 4)
+
+        self.assertListEqual((positive & is_even).mask(values).tolist(), [False] * 5 + [True, False])
+        self.assertListEqual(Condition(is_true).mask(values).tolist(), [True] * 3 + [False] + [True] * 3)
+
+    def test_mask_falls_back_to_calling_check(self):
+        values = np.array([None, 1, None], dtype=object)
+        self.assertListEqual(Condition(is_not_none).mask(values).tolist(), [False, True, False])
+
+    def test_condition_decorator(self):
+        @condition(vectorized=True)
+        def is_small(value) -> bool:
+            return abs(value) < 10
+
+        self.assertIsInstance(is_small, Condition)
+        self.assertListEqual(is_small.mask(np.array([5, 50])).tolist(), [True, False])
+        self.assertIsInstance(condition(_is_small), Condition)
+
+
+class AsFunctionTest(unittest.TestCase):
+    def test(self):
+        self.assertIs(as_function(_is_small), _is_small)
+        self.assertIs(as_function(Condition(_is_small)), _is_small)
+        self.assertNotIsInstance(as_function(even & is_positive), Condition)
+
+
+class FilterBatchTest(unittest.TestCase):
+    def test_list(self):
+        self.assertListEqual(filter_batch(even & ~zero, [0, 1, 2, 3, 4]), [2, 4])
+        self.assertListEqual(filter_batch(_is_small, [5, 50]), [5])
+
+    def test_array(self):
+        result = filter_batch(even & ~zero, np.arange(5))
+
+        self.assertIsInstance(result, np.ndarray)
+        self.assertListEqual(result.tolist(), [2, 4])
+
+    def test_array_with_vectorized_function(self):
+        result = filter_batch(is_even, np.arange(5))
+
+        self.assertIsInstance(result, np.ndarray)
+        self.assertListEqual(result.tolist(), [0, 2, 4])
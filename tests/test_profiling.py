@@ -0,0 +1,79 @@
+import unittest
+
+from yapytools.plan import FILTER, MAP, fuse
+from yapytools.predicates import is_even
+from yapytools.profiling import StreamProfile
+
+
+class StreamProfileTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.profile = StreamProfile(hook=self.calls.append)
+        self.stages = ((FILTER, is_even), (MAP, str))
+
+    def run_stages(self):
+        self.profile.started()
+        try:
+            return list(fuse(self.profile.instrument(self.stages))(range(10)))
+        finally:
+            self.profile.stopped()
+
+    def test_instrumented_stages_give_same_results(self):
+        self.assertListEqual(self.run_stages(), ['0', '2', '4', '6', '8'])
+
+    def test_records_items_in_and_out(self):
+        self.run_stages()
+
+        self.assertListEqual(
+            [(stats.name, stats.items_in, stats.items_out) for stats in self.profile.stages],
+            [('filter(is_even)', 10, 5), ('map(str)', 5, 5)],
+        )
+        self.assertEqual(self.profile.stages[0].selectivity, 0.5)
+
+    def test_records_time(self):
+        self.run_stages()
+
+        for stats in self.profile.stages:
+            self.assertGreater(stats.wall_time, 0)
+            self.assertGreaterEqual(stats.cpu_time, 0)
+            self.assertGreater(stats.throughput, 0)
+
+    def test_accumulates_across_runs(self):
+        self.run_stages()
+        self.run_stages()
+
+        self.assertEqual(len(self.profile.stages), 2)
+        self.assertEqual(self.profile.stages[0].items_in, 20)
+
+    def test_register_keeps_stage_order(self):
+        self.profile.register(self.stages)
+        self.profile.instrument(self.stages[::-1])
+
+        self.assertListEqual(
+            [stats.name for stats in self.profile.stages],
+            ['filter(is_even)', 'map(str)'],
+        )
+
+    def test_hook_is_called_when_outermost_run_stops(self):
+        self.profile.started()
+        self.run_stages()
+
+        self.assertListEqual(self.calls, [])
+
+        self.profile.stopped()
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.calls[0]['stages'][1]['items_out'], 5)
+
+    def test_to_table(self):
+        self.run_stages()
+
+        lines = self.profile.to_table().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith('stage'))
+        self.assertTrue(lines[1].startswith('filter(is_even)  10    5        50.0%'))
+
+    def test_to_table_without_items(self):
+        self.profile.register(self.stages)
+        self.assertIn(' - ', self.profile.to_table())
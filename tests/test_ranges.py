@@ -1,6 +1,14 @@
+import itertools
 import unittest
 
-from yapytools import ranges
+from parameterized import parameterized
+
+from yapytools import Ranges, ranges
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 
 class RangesTest(unittest.TestCase):
@@ -59,3 +67,109 @@ class RangesTest(unittest.TestCase):
             list(ranges(3, 0, 2)),
             [],
         )
+
+
+class RangesSequenceTest(unittest.TestCase):
+    def setUp(self):
+        self.ranges = ranges(4, (10, 3, -3), (1, 6, 2))
+        self.expected = list(itertools.product(range(4), range(10, 3, -3), range(1, 6, 2)))
+
+    def test_returns_Ranges(self):
+        self.assertIsInstance(self.ranges, Ranges)
+        self.assertTupleEqual(self.ranges.shape, (4, 3, 3))
+
+    def test_len(self):
+        self.assertEqual(len(self.ranges), 36)
+
+    def test_getitem(self):
+        self.assertListEqual(
+            [self.ranges[i] for i in range(-36, 36)],
+            self.expected * 2,
+        )
+
+    def test_getitem_out_of_range_raises_IndexError(self):
+        with self.assertRaises(IndexError):
+            self.ranges[36]
+
+    @parameterized.expand([
+        (slice(None),),
+        (slice(5, 20),),
+        (slice(7, None, 5),),
+        (slice(None, None, -1),),
+        (slice(30, 3, -4),),
+        (slice(10, 10),),
+    ])
+    def test_slice(self, slice_: slice):
+        result = self.ranges[slice_]
+
+        self.assertIsInstance(result, Ranges)
+        self.assertEqual(len(result), len(self.expected[slice_]))
+        self.assertListEqual(list(result), self.expected[slice_])
+
+    def test_contains(self):
+        self.assertIn((3, 4, 5), self.ranges)
+        self.assertNotIn((3, 5, 5), self.ranges)
+        self.assertNotIn((3, 4), self.ranges)
+        self.assertNotIn('foo', self.ranges)
+        self.assertNotIn((0, 10, 1), self.ranges[1:])
+
+    def test_index(self):
+        self.assertEqual(self.ranges.index((1, 7, 3)), self.expected.index((1, 7, 3)))
+        self.assertEqual(self.ranges[10:].index((1, 7, 3)), self.expected.index((1, 7, 3)) - 10)
+
+        with self.assertRaises(ValueError):
+            self.ranges.index((1, 8, 3))
+
+    def test_index_with_negative_bounds_is_like_list_index(self):
+        index = self.expected.index((1, 7, 3))
+        n = len(self.expected)
+
+        self.assertEqual(self.ranges.index((1, 7, 3), index - n), index)
+        self.assertEqual(self.ranges.index((1, 7, 3), -n - 5, index + 1 - n), index)
+
+        for start, stop in [(index + 1 - n, None), (0, index - n)]:
+            with self.assertRaises(ValueError):
+                self.ranges.index((1, 7, 3), start, stop)
+
+    def test_reversed(self):
+        self.assertListEqual(list(reversed(self.ranges)), self.expected[::-1])
+
+    def test_split(self):
+        shards = self.ranges.split(5)
+
+        self.assertListEqual([len(shard) for shard in shards], [8, 7, 7, 7, 7])
+        self.assertListEqual(list(itertools.chain(*shards)), self.expected)
+
+    def test_split_with_invalid_n_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            self.ranges.split(0)
+
+
+@unittest.skipUnless(np, 'NumPy is not installed')
+class RangesAsArrayTest(unittest.TestCase):
+    def test(self):
+        result = list(ranges(3, (10, 3, -3), 2, as_array=True, chunk_size=5))
+
+        self.assertListEqual([len(chunk) for chunk in result], [5, 5, 5, 3])
+        self.assertListEqual(
+            [tuple(row) for row in np.concatenate(result)],
+            list(ranges(3, (10, 3, -3), 2)),
+        )
+
+    def test_values_containing_zero_returns_no_arrays(self):
+        self.assertListEqual(
+            list(ranges(3, 0, 2, as_array=True)),
+            [],
+        )
+
+    def test_invalid_chunk_size_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            list(ranges(3, as_array=True, chunk_size=0))
+
+    def test_slice(self):
+        result = list(ranges(3, 4).split(2)[1].arrays(chunk_size=4))
+
+        self.assertListEqual(
+            [tuple(row) for row in np.concatenate(result)],
+            list(ranges(3, 4))[6:],
+        )
@@ -0,0 +1,86 @@
+import unittest
+from collections import Counter
+
+from parameterized import parameterized
+
+from yapytools.sampling import sample, sample_by, sample_fraction
+
+
+class SampleTest(unittest.TestCase):
+    @parameterized.expand([(0,), (1,), (10,), (1000,)])
+    def test_returns_k_distinct_items_from_input(self, k):
+        result = sample(range(10_000), k, seed=0)
+
+        self.assertEqual(len(result), k)
+        self.assertEqual(len(set(result)), k)
+        self.assertTrue(all(0 <= it < 10_000 for it in result))
+
+    def test_fewer_than_k_items_returns_all_items(self):
+        self.assertListEqual(sample(iter([1, 2, 3]), 5), [1, 2, 3])
+
+    def test_seed_makes_sample_reproducible(self):
+        self.assertListEqual(
+            sample(range(10_000), 10, seed=42),
+            sample(range(10_000), 10, seed=42),
+        )
+
+    def test_sample_is_uniform(self):
+        counts = Counter()
+        for seed in range(5000):
+            counts.update(sample(range(20), 4, seed=seed))
+
+        expected = 5000 * 4 / 20
+        for item in range(20):
+            self.assertAlmostEqual(counts[item] / expected, 1, delta=0.1)
+
+    def test_negative_k_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            sample(range(10), -1)
+
+
+class SampleByTest(unittest.TestCase):
+    def test_keeps_up_to_k_items_per_key(self):
+        result = sample_by(range(1000), lambda it: it % 3, 5, seed=0)
+
+        self.assertSetEqual(set(result), {0, 1, 2})
+        for key, items in result.items():
+            self.assertEqual(len(items), 5)
+            self.assertTrue(all(it % 3 == key for it in items))
+
+    def test_zero_k_returns_empty_samples(self):
+        result = sample_by(range(10), lambda it: it % 2, 0, seed=0)
+        self.assertDictEqual(result, {0: [], 1: []})
+
+    def test_rare_key_keeps_all_its_items(self):
+        items = ['rare'] + ['common'] * 1000
+
+        result = sample_by(items, lambda it: it, 10, seed=0)
+
+        self.assertListEqual(result['rare'], ['rare'])
+        self.assertEqual(len(result['common']), 10)
+
+    def test_sample_is_uniform_per_key(self):
+        counts = Counter()
+        for seed in range(5000):
+            counts.update(sample_by(range(40), lambda it: it % 2, 4, seed=seed)[0])
+
+        expected = 5000 * 4 / 20
+        for item in range(0, 40, 2):
+            self.assertAlmostEqual(counts[item] / expected, 1, delta=0.1)
+
+
+class SampleFractionTest(unittest.TestCase):
+    def test_keeps_about_p_of_items_in_order(self):
+        result = list(sample_fraction(range(100_000), 0.1, seed=0))
+
+        self.assertAlmostEqual(len(result) / 10_000, 1, delta=0.05)
+        self.assertListEqual(result, sorted(set(result)))
+
+    @parameterized.expand([(0, []), (1, list(range(10)))])
+    def test_edge_probabilities(self, p, expected):
+        self.assertListEqual(list(sample_fraction(range(10), p)), expected)
+
+    @parameterized.expand([(-0.1,), (1.1,)])
+    def test_invalid_p_raises_ValueError(self, p):
+        with self.assertRaises(ValueError):
+            sample_fraction(range(10), p)
@@ -0,0 +1,195 @@
+import unittest
+
+from parameterized import parameterized
+
+from yapytools.sketches import (
+    BloomFilter,
+    CountMinSketch,
+    HyperLogLog,
+    SpaceSaving,
+    builtin_hash_pair,
+    hash_pair,
+)
+
+
+class BloomFilterTest(unittest.TestCase):
+    def test_add_and_contains(self):
+        bloom = BloomFilter(capacity=100)
+
+        self.assertTrue(bloom.add('foo'))
+        self.assertFalse(bloom.add('foo'))
+        self.assertIn('foo', bloom)
+        self.assertNotIn('bar', bloom)
+        self.assertEqual(len(bloom), 1)
+
+    @parameterized.expand([(hash_pair,), (builtin_hash_pair,)])
+    def test_false_positive_rate(self, hash_function):
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01, hash_function=hash_function)
+        bloom.update(range(10_000))
+
+        false_positives = sum(1 for it in range(10_000, 20_000) if it in bloom)
+
+        self.assertLess(false_positives, 200)
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000)
+        bloom.update(str(it) for it in range(1000))
+
+        self.assertTrue(all(str(it) in bloom for it in range(1000)))
+
+    def test_or(self):
+        a = BloomFilter(capacity=100)
+        a.add('foo')
+        b = BloomFilter(capacity=100)
+        b.add('bar')
+
+        result = a | b
+
+        self.assertIn('foo', result)
+        self.assertIn('bar', result)
+
+    def test_or_with_different_sizes_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=100) | BloomFilter(capacity=200)
+
+    def test_or_with_different_hash_functions_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=100) | BloomFilter(capacity=100, hash_function=builtin_hash_pair)
+
+    def test_builtin_hash_pair_matches_equality(self):
+        bloom = BloomFilter(capacity=100, hash_function=builtin_hash_pair)
+
+        self.assertTrue(bloom.add(1))
+        self.assertFalse(bloom.add(1.0))
+        self.assertTrue(bloom.add(2.0))
+        self.assertFalse(bloom.add(2))
+
+    @parameterized.expand([
+        (0, 0.01),
+        (100, 0),
+        (100, 1),
+    ])
+    def test_invalid_arguments_raise_ValueError(self, capacity, error_rate):
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity, error_rate)
+
+
+class HashPairTest(unittest.TestCase):
+    def test_is_stable(self):
+        self.assertEqual(hash_pair('foo'), hash_pair('foo'))
+        self.assertEqual(hash_pair(2 ** 100), hash_pair(2 ** 100))
+
+    def test_types_are_distinguished(self):
+        self.assertNotEqual(hash_pair('1'), hash_pair(1))
+        self.assertNotEqual(hash_pair(b'1'), hash_pair('1'))
+
+
+class CountMinSketchTest(unittest.TestCase):
+    def test_counts_are_never_underestimated(self):
+        sketch = CountMinSketch(width=64, depth=4)
+        items = [it % 500 for it in range(5000)]
+        sketch.update(items)
+
+        self.assertEqual(sketch.total, 5000)
+        self.assertTrue(all(sketch[it] >= 10 for it in range(500)))
+
+    def test_counts_are_exact_without_collisions(self):
+        sketch = CountMinSketch()
+        sketch.update(['foo', 'bar', 'foo'])
+        sketch.add('baz', count=5)
+
+        self.assertEqual(sketch['foo'], 2)
+        self.assertEqual(sketch['bar'], 1)
+        self.assertEqual(sketch['baz'], 5)
+        self.assertEqual(sketch['qux'], 0)
+
+    def test_or(self):
+        a = CountMinSketch()
+        a.update(['foo', 'bar'])
+        b = CountMinSketch()
+        b.update(['foo'])
+
+        result = a | b
+
+        self.assertEqual(result['foo'], 2)
+        self.assertEqual(result['bar'], 1)
+        self.assertEqual(result.total, 3)
+
+    def test_or_with_different_sizes_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            CountMinSketch(width=10) | CountMinSketch(width=20)
+
+    @parameterized.expand([(0, 5), (10, 0)])
+    def test_invalid_arguments_raise_ValueError(self, width, depth):
+        with self.assertRaises(ValueError):
+            CountMinSketch(width, depth)
+
+
+class HyperLogLogTest(unittest.TestCase):
+    @parameterized.expand([(0,), (10,), (1000,), (100_000,)])
+    def test_count(self, distinct):
+        hll = HyperLogLog()
+        hll.update(it % max(distinct, 1) for it in range(distinct * 3))
+
+        self.assertAlmostEqual(hll.count(), distinct, delta=max(1, distinct * 0.03))
+
+    def test_or(self):
+        a = HyperLogLog()
+        a.update(range(0, 6000))
+        b = HyperLogLog()
+        b.update(range(4000, 10_000))
+
+        self.assertAlmostEqual((a | b).count(), 10_000, delta=300)
+
+    def test_or_with_different_precision_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(10) | HyperLogLog(12)
+
+    @parameterized.expand([(3,), (19,)])
+    def test_invalid_precision_raises_ValueError(self, precision):
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision)
+
+
+class SpaceSavingTest(unittest.TestCase):
+    def test_top(self):
+        summary = SpaceSaving(capacity=100)
+        summary.update('abracadabra')
+
+        self.assertListEqual(summary.top(2), [('a', 5), ('b', 2)])
+        self.assertEqual(summary['a'], 5)
+        self.assertEqual(summary.error('a'), 0)
+        self.assertEqual(summary['z'], 0)
+
+    def test_finds_frequent_items_among_many_rare_ones(self):
+        items = [f'rare{it}' for it in range(10_000)]
+        for index in range(0, len(items), 10):
+            items.insert(index, 'frequent1')
+        for index in range(0, len(items), 25):
+            items.insert(index, 'frequent2')
+
+        summary = SpaceSaving(capacity=50)
+        summary.update(items)
+
+        self.assertEqual(len(summary), 50)
+        top = summary.top(2)
+        self.assertListEqual([item for item, _ in top], ['frequent1', 'frequent2'])
+        for item, count in top:
+            true_count = items.count(item)
+            self.assertGreaterEqual(count, true_count)
+            self.assertLessEqual(count - summary.error(item), true_count)
+
+    def test_or(self):
+        a = SpaceSaving(capacity=10)
+        a.update('aaab')
+        b = SpaceSaving(capacity=10)
+        b.update('abbbb')
+
+        result = a | b
+
+        self.assertListEqual(result.top(), [('b', 5), ('a', 4)])
+        self.assertEqual(result.total, 9)
+
+    def test_invalid_capacity_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            SpaceSaving(0)
@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from yapytools import external_sorted
+
+
+class ExternalSortedTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.values = [rng.randrange(100) for _ in range(1000)]
+
+    @parameterized.expand([
+        (10_000,),
+        (1000,),
+        (999,),
+        (7,),
+        (1,),
+    ])
+    def test(self, max_memory_items: int):
+        result = external_sorted(self.values, max_memory_items=max_memory_items)
+        self.assertListEqual(list(result), sorted(self.values))
+
+    def test_with_key_and_reverse_is_stable(self):
+        values = list(enumerate(self.values))
+
+        result = external_sorted(
+            values,
+            key=lambda it: it[1] // 10,
+            reverse=True,
+            max_memory_items=64,
+        )
+
+        self.assertListEqual(
+            list(result),
+            sorted(values, key=lambda it: it[1] // 10, reverse=True),
+        )
+
+    @parameterized.expand([
+        (1000, 1),
+        (64, 2),
+    ])
+    def test_sorts_each_run_once(self, max_memory_items: int, calls_per_item: int):
+        calls = []
+
+        def key(it):
+            calls.append(it)
+            return it
+
+        list(external_sorted(self.values, key=key, max_memory_items=max_memory_items))
+
+        # heapq.merge calls the key once more per item when merging runs
+        self.assertEqual(len(calls), calls_per_item * len(self.values))
+
+    def test_is_lazy(self):
+        def values():
+            raise RuntimeError('Should not be called yet')
+            yield
+
+        external_sorted(values(), max_memory_items=10)
+
+    def test_empty_iterable_returns_empty_iterable(self):
+        self.assertListEqual(list(external_sorted([], max_memory_items=10)), [])
+
+    def test_invalid_max_memory_items_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            list(external_sorted([], max_memory_items=0))
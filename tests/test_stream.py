@@ -1,7 +1,12 @@
+import os
+import tempfile
 import unittest
 
+import numpy as np
+
 from yapytools import Stream
-from yapytools.predicates import is_even
+from yapytools.aggregators import Mean
+from yapytools.predicates import Condition, is_even, is_zero
 
 
 class StreamTest(unittest.TestCase):
@@ -22,6 +27,38 @@ class StreamTest(unittest.TestCase):
             [0, 1, 3, 6, 10]
         )
 
+    def test_anti_join(self):
+        result = Stream(range(5)).anti_join([1, 3], left_key=lambda it: it).to_list()
+        self.assertListEqual(result, [0, 2, 4])
+
+    def test_batched(self):
+        result = Stream(range(5)).batched(2, max_wait=1).to_list()
+        self.assertListEqual(result, [[0, 1], [2, 3], [4]])
+
+    def test_cache(self):
+        calls = []
+        stream = Stream(iter(range(5))).map(lambda it: calls.append(it) or it * 2).cache()
+
+        self.assertEqual(stream.sum(), 20)
+        self.assertListEqual(stream.filter(lambda it: it > 4).to_list(), [6, 8])
+        self.assertListEqual(calls, [0, 1, 2, 3, 4])
+
+    def test_chunked(self):
+        result = Stream(range(5)).chunked(2).to_list()
+        self.assertListEqual(result, [[0, 1], [2, 3], [4]])
+
+    def test_cogroup(self):
+        result = (
+            Stream.of('a', 'bb', 'cc')
+            .cogroup(['xx', 'yyy'], left_key=len)
+            .to_list()
+        )
+
+        self.assertListEqual(
+            result,
+            [(1, ['a'], []), (2, ['bb', 'cc'], ['xx']), (3, [], ['yyy'])]
+        )
+
     def test_enumerate(self):
         result = (
             Stream.of('foo', 'bar', 'baz')
@@ -46,6 +83,106 @@ class StreamTest(unittest.TestCase):
             [(10, 'foo'), (11, 'bar'), (12, 'baz')]
         )
 
+    def test_explain(self):
+        self.assertEqual(
+            self.stream.explain(),
+            'source: range(0, 20)\n'
+            'fused: filter(is_even) -> filter(<lambda>) -> map(<lambda>) -> map(str)'
+        )
+
+    def test_explain_parallel(self):
+        result = (
+            Stream([1, 2, 3])
+            .map(str)
+            .parallel(workers=2, chunk_size=10)
+            .map(int)
+            .explain()
+        )
+
+        self.assertEqual(
+            result,
+            'source: [1, 2, 3]\n'
+            'fused: map(str)\n'
+            "parallel: workers=2, backend='thread', chunk_size=10, ordered=True, max_in_flight=4\n"
+            'fused: map(int)'
+        )
+
+    def test_filter_with_none_removes_falsy_items(self):
+        result = Stream.of(0, 1, '', 'a', None).filter(None).to_list()
+        self.assertListEqual(result, [1, 'a'])
+
+    def test_stages_are_independent(self):
+        base = Stream(range(5)).map(lambda it: it * 10)
+        first = base.map(str)
+        second = base.filter(is_even)
+
+        self.assertListEqual(first.to_list(), ['0', '10', '20', '30', '40'])
+        self.assertListEqual(second.to_list(), [0, 10, 20, 30, 40])
+
+    def test_from_lines(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'data.jsonl')
+            with open(path, 'w') as file:
+                file.write('{"a": 1}\n{"a": 2}\n')
+
+            self.assertListEqual(Stream.from_lines(path).to_list(), ['{"a": 1}', '{"a": 2}'])
+            self.assertListEqual(Stream.from_jsonl(path).map(lambda it: it['a']).to_list(), [1, 2])
+
+    def test_instrument(self):
+        calls = []
+        stream = (
+            Stream(range(20))
+            .filter(is_even)
+            .instrument(hook=calls.append)
+            .map(lambda it: it * 10)
+            .unique()
+            .map(str)
+        )
+
+        result = stream.to_list()
+
+        self.assertListEqual(result, [str(it) for it in range(0, 200, 20)])
+        self.assertListEqual(
+            [
+                (stats['name'], stats['items_in'], stats['items_out'])
+                for stats in stream.profile.to_dict()['stages']
+            ],
+            [('filter(is_even)', 20, 10), ('map(<lambda>)', 10, 10), ('map(str)', 10, 10)],
+        )
+        self.assertEqual(len(calls), 1)
+
+    def test_instrument_parallel(self):
+        stream = (
+            Stream(range(20))
+            .parallel(workers=4, chunk_size=3)
+            .instrument()
+            .filter(is_even)
+        )
+
+        self.assertEqual(len(stream.to_list()), 10)
+        self.assertEqual(stream.profile.stages[0].items_in, 20)
+
+    def test_instrument_process_backend_raises_ValueError(self):
+        stream = Stream(range(20)).parallel(backend='process').instrument().filter(is_even)
+
+        with self.assertRaises(ValueError):
+            stream.to_list()
+
+    def test_not_instrumented_has_no_profile(self):
+        self.assertIsNone(self.stream.profile)
+
+    def test_filter_batches(self):
+        result = (
+            Stream(range(10))
+            .chunked(4)
+            .map(np.array)
+            .filter_batches(Condition(is_even) & ~Condition(is_zero))
+            .map(np.ndarray.tolist)
+            .to_list()
+        )
+
+        self.assertListEqual(result, [[2], [4, 6], [8]])
+
     def test_filter_not_none(self):
         result = (
             Stream.of(None, 1, None, 2, None, 3, None)
@@ -67,10 +204,157 @@ class StreamTest(unittest.TestCase):
             [1, 2, 3, 4, 5, 6]
         )
 
+    def test_join(self):
+        result = (
+            Stream.of(1, 2, 3)
+            .join(['1', '3', '3'], left_key=str)
+            .to_list()
+        )
+
+        self.assertListEqual(result, [(1, '1'), (3, '3'), (3, '3')])
+
+    def test_join_merge(self):
+        result = (
+            Stream.of(1, 2, 3)
+            .join(['1', '3', '4'], left_key=str, how='outer', method='merge')
+            .to_list()
+        )
+
+        self.assertListEqual(result, [(1, '1'), (2, None), (3, '3'), (None, '4')])
+
+    def test_map_cached(self):
+        calls = []
+
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        result = Stream([1, 2, 1, 3, 1]).map_cached(double).to_list()
+
+        self.assertListEqual(result, [2, 4, 2, 6, 2])
+        self.assertListEqual(calls, [1, 2, 3])
+
+    def test_map_batches(self):
+        batches = []
+
+        def double_all(batch):
+            batches.append(batch)
+            return [it * 2 for it in batch]
+
+        result = Stream(range(5)).map_batches(double_all, size=2).to_list()
+
+        self.assertListEqual(result, [0, 2, 4, 6, 8])
+        self.assertListEqual(batches, [[0, 1], [2, 3], [4]])
+
+    def test_map_batches_parallel(self):
+        result = (
+            Stream(range(10))
+            .parallel(workers=3)
+            .map_batches(lambda batch: [sum(batch)], size=3)
+            .to_list()
+        )
+
+        self.assertListEqual(result, [3, 12, 21, 9])
+
+    def test_pairwise(self):
+        result = Stream.of(1, 2, 4).pairwise().to_list()
+        self.assertListEqual(result, [(1, 2), (2, 4)])
+
+    def test_parallel(self):
+        result = (
+            Stream(range(20))
+            .parallel(workers=4, chunk_size=3)
+            .filter(is_even)
+            .filter(lambda it: it > 4)
+            .map(lambda it: it * 10)
+            .map(str)
+            .to_list()
+        )
+
+        self.assertListEqual(
+            result,
+            ['60', '80', '100', '120', '140', '160', '180']
+        )
+
+    def test_parallel_unordered(self):
+        result = (
+            Stream(range(20))
+            .parallel(workers=4, chunk_size=3, ordered=False)
+            .map(lambda it: it * 10)
+            .to_set()
+        )
+
+        self.assertSetEqual(result, set(range(0, 200, 10)))
+
+    def test_rolling(self):
+        values = [4, 2, 3, 5, 1]
+
+        self.assertListEqual(Stream(values).rolling_sum(3).to_list(), [9, 10, 9])
+        self.assertListEqual(Stream(values).rolling_mean(2).to_list(), [3.0, 2.5, 4.0, 3.0])
+        self.assertListEqual(Stream(values).rolling_min(3).to_list(), [2, 2, 1])
+        self.assertListEqual(Stream(values).rolling_max(3).to_list(), [4, 5, 5])
+
+    def test_sample(self):
+        result = Stream(range(100)).map(str).sample(3, seed=0)
+
+        self.assertEqual(len(result), 3)
+        self.assertTrue(set(result) <= set(map(str, range(100))))
+
+    def test_sample_by(self):
+        result = Stream(range(100)).sample_by(lambda it: it % 2, 3, seed=0)
+        self.assertDictEqual({key: len(items) for key, items in result.items()}, {0: 3, 1: 3})
+
+    def test_sample_fraction(self):
+        result = Stream(range(100)).sample_fraction(0.5, seed=0).to_list()
+        self.assertListEqual(result, sorted(set(result) & set(range(100))))
+
+    def test_semi_join(self):
+        result = Stream(range(5)).semi_join([1, 3], left_key=lambda it: it).to_list()
+        self.assertListEqual(result, [1, 3])
+
+    def test_sequential(self):
+        result = (
+            Stream(range(5))
+            .parallel(workers=2)
+            .map(lambda it: it * 10)
+            .sequential()
+            .map(str)
+            .to_list()
+        )
+
+        self.assertListEqual(result, ['0', '10', '20', '30', '40'])
+
+    def test_many_maps(self):
+        stream = Stream(range(3))
+        for _ in range(300):
+            stream = stream.map(lambda it: it + 1)
+
+        self.assertListEqual(stream.to_list(), [300, 301, 302])
+
     def test_reversed(self):
         result = Stream(range(5)).reversed().to_list()
         self.assertListEqual(result, [4, 3, 2, 1, 0])
 
+    def test_reversed_applies_stages_to_reversed_source(self):
+        mapped = []
+
+        def times_ten(value):
+            mapped.append(value)
+            return value * 10
+
+        stream = Stream([1, 2, 3, 4]).filter(is_even).map(times_ten).reversed()
+
+        self.assertListEqual(stream.to_list(), [40, 20])
+        self.assertListEqual(mapped, [4, 2])
+
+    def test_reversed_generator(self):
+        result = Stream(it for it in range(5)).filter(is_even).reversed().to_list()
+        self.assertListEqual(result, [4, 2, 0])
+
+    def test_reversed_with_max_memory_items(self):
+        result = Stream(iter(range(10))).map(str).reversed(max_memory_items=3).to_list()
+        self.assertListEqual(result, list(map(str, range(9, -1, -1))))
+
     def test_sorted(self):
         result = (
             Stream.of(1, 0, 3, 2, 4)
@@ -80,6 +364,21 @@ class StreamTest(unittest.TestCase):
 
         self.assertListEqual(result, [0, 1, 2, 3, 4])
 
+    def test_sorted_with_max_memory_items(self):
+        result = (
+            Stream.of(1, 0, 3, 2, 4)
+            .sorted(key=lambda it: -it, max_memory_items=2)
+            .to_list()
+        )
+
+        self.assertListEqual(result, [4, 3, 2, 1, 0])
+
+    def test_tee(self):
+        evens, odds = Stream(iter(range(6))).tee()
+
+        self.assertListEqual(evens.filter(lambda it: it % 2 == 0).to_list(), [0, 2, 4])
+        self.assertListEqual(odds.filter(lambda it: it % 2 == 1).to_list(), [1, 3, 5])
+
     def test_unique(self):
         result = (
             Stream.of(0, 0, 1, 0, 1, 2, 0, 1, 2, 3, 0, 1, 2, 3, 4)
@@ -89,6 +388,19 @@ class StreamTest(unittest.TestCase):
 
         self.assertListEqual(result, [0, 1, 2, 3, 4])
 
+    def test_unique_with_key_and_window(self):
+        result = (
+            Stream.of('a', 'A', 'b', 'B', 'a')
+            .unique(key=str.lower, strategy='window', max_size=1)
+            .to_list()
+        )
+
+        self.assertListEqual(result, ['a', 'b', 'a'])
+
+    def test_windowed(self):
+        result = Stream(range(5)).windowed(2, step=2).to_list()
+        self.assertListEqual(result, [(0, 1), (2, 3)])
+
     def test_zip(self):
         result = (
             Stream(range(5))
@@ -101,21 +413,89 @@ class StreamTest(unittest.TestCase):
             [(0, 10), (1, 11), (2, 12), (3, 13), (4, 14)]
         )
 
+    def test_aggregate_by(self):
+        result = Stream(range(10)).aggregate_by(lambda it: it % 3, Mean())
+        self.assertDictEqual(result, {0: 4.5, 1: 4.0, 2: 5.0})
+
     def test_any(self):
         self.assertFalse(Stream.of(0, 0, 0).any())
         self.assertTrue(Stream.of(0, 1, 0).any())
 
+    def test_any_with_workers(self):
+        stream = Stream(range(1, 100)).map(lambda it: it % 50 == 0)
+
+        self.assertTrue(stream.any(workers=4))
+        self.assertFalse(Stream(range(1, 100)).filter(is_zero).any(workers=4))
+        self.assertTrue(Stream(range(100)).parallel(workers=2, chunk_size=8).filter(is_even).any())
+
+    def test_any_instrumented_with_workers_raises_ValueError(self):
+        stream = Stream(range(100)).instrument().filter(is_even)
+
+        with self.assertRaises(ValueError):
+            stream.any(workers=4)
+
     def test_count(self):
         self.assertEqual(7, self.stream.count())
 
+    def test_count_includes_falsy_items(self):
+        self.assertEqual(Stream.of(0, None, '', 1).count(), 4)
+
+    def test_approx_count_distinct(self):
+        result = Stream(range(3000)).map(lambda it: it % 1000).approx_count_distinct()
+        self.assertAlmostEqual(result, 1000, delta=30)
+
+    def test_bottom_k(self):
+        result = Stream.of(5, 1, 4, 2, 3).bottom_k(3)
+        self.assertListEqual(result, [1, 2, 3])
+
+    def test_bottom_k_with_key(self):
+        result = Stream.of('ccc', 'a', 'bb').bottom_k(2, key=len)
+        self.assertListEqual(result, ['a', 'bb'])
+
+    def test_heavy_hitters(self):
+        result = Stream('mississippi').heavy_hitters(2)
+        self.assertListEqual(result, [('i', 4), ('s', 4)])
+
     def test_max(self):
         result = Stream.of(0, 1, 0, -1, 0).max()
         self.assertEqual(1, result)
 
+    def test_max_with_key(self):
+        result = Stream.of(0, 1, 0, -2, 0).max(key=abs)
+        self.assertEqual(-2, result)
+
+    def test_max_empty(self):
+        self.assertIsNone(Stream.of().max(default=None))
+
+        with self.assertRaises(ValueError):
+            Stream.of().max()
+
     def test_min(self):
         result = Stream.of(0, 1, 0, -1, 0).min()
         self.assertEqual(-1, result)
 
+    def test_min_with_key(self):
+        result = Stream.of(3, -1, 2).min(key=lambda it: -it)
+        self.assertEqual(3, result)
+
+    def test_min_empty(self):
+        self.assertEqual(5, Stream.of().min(default=5))
+
+        with self.assertRaises(ValueError):
+            Stream.of().min()
+
+    def test_nth_smallest(self):
+        values = [5, 1, 4, 2, 3]
+
+        self.assertEqual(1, Stream(values).nth_smallest(0))
+        self.assertEqual(3, Stream(values).nth_smallest(2))
+        self.assertEqual(1, Stream(values).nth_smallest(4, key=lambda it: -it))
+        self.assertIsNone(Stream(values).nth_smallest(5))
+
+    def test_nth_smallest_with_negative_n_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            Stream.of(1).nth_smallest(-1)
+
     def test_reduce(self):
         result = Stream(range(5)).reduce()
         self.assertEqual(10, result)
@@ -124,6 +504,30 @@ class StreamTest(unittest.TestCase):
         result = Stream.of(1, 2, 4, 8).sum()
         self.assertEqual(15, result)
 
+    def test_top_k(self):
+        result = Stream.of(5, 1, 4, 2, 3).top_k(2)
+        self.assertListEqual(result, [5, 4])
+
+    def test_top_k_with_key(self):
+        result = Stream.of('ccc', 'a', 'bb').top_k(2, key=len)
+        self.assertListEqual(result, ['ccc', 'bb'])
+
+    def test_to_file(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'out.txt')
+
+            self.assertEqual(Stream(range(3)).map(lambda it: it * 10).to_file(path), 3)
+            self.assertListEqual(Stream.from_lines(path).to_list(), ['0', '10', '20'])
+
+            self.assertEqual(Stream.of({'a': 1}, {'a': 2}).to_jsonl(path), 2)
+            self.assertListEqual(Stream.from_jsonl(path).to_list(), [{'a': 1}, {'a': 2}])
+
+            self.assertEqual(Stream.of({'a': '1'}, {'a': '2'}).to_csv(path), 2)
+            self.assertListEqual(Stream.from_csv(path).to_list(), [{'a': '1'}, {'a': '2'}])
+
+            self.assertEqual(Stream(range(4)).to_partitioned_files(lambda it: it % 2, dir), 4)
+            self.assertListEqual(Stream.from_lines(os.path.join(dir, '1.txt')).to_list(), ['1', '3'])
+
     def test_to_list(self):
         self.assertListEqual(
             self.stream.to_list(),
@@ -147,3 +551,19 @@ class StreamTest(unittest.TestCase):
 
     def test_last(self):
         self.assertEqual('180', self.stream.last())
+
+    def test_last_of_reversible_only_applies_stages_at_the_end(self):
+        mapped = []
+
+        def times_ten(value):
+            mapped.append(value)
+            return value * 10
+
+        result = Stream(range(10)).filter(lambda it: it < 5).map(times_ten).last()
+
+        self.assertEqual(result, 40)
+        self.assertListEqual(mapped, [4])
+
+    def test_last_of_empty_stream_returns_default(self):
+        self.assertEqual(Stream([]).last('default'), 'default')
+        self.assertEqual(Stream(iter([])).last('default'), 'default')
@@ -0,0 +1,60 @@
+import unittest
+
+from parameterized import parameterized
+
+from yapytools import unique
+
+
+class UniqueTest(unittest.TestCase):
+    def test(self):
+        result = unique([0, 0, 1, 0, 1, 2, 0, 1, 2, 3])
+        self.assertListEqual(list(result), [0, 1, 2, 3])
+
+    def test_with_key(self):
+        result = unique(['a', 'B', 'b', 'A', 'c'], key=str.lower)
+        self.assertListEqual(list(result), ['a', 'B', 'c'])
+
+    def test_window_only_removes_recent_duplicates(self):
+        result = unique(
+            [1, 2, 1, 3, 1, 4, 5, 1],
+            strategy='window',
+            max_size=2,
+        )
+
+        # Seeing a duplicate keeps it in the window; 1 falls out after 4, 5
+        self.assertListEqual(list(result), [1, 2, 3, 4, 5, 1])
+
+    def test_bloom(self):
+        values = list(range(1000)) * 2
+        result = unique(values, strategy='bloom', max_size=1000, error_rate=0.001)
+
+        result = list(result)
+        self.assertEqual(len(result), len(set(result)))
+        self.assertGreater(len(result), 990)
+
+    def test_bloom_uses_equality(self):
+        result = unique([1, 1.0, 2.0, 2], strategy='bloom', max_size=10)
+        self.assertListEqual(list(result), [1, 2.0])
+
+    def test_bloom_does_not_use_repr(self):
+        class Item:
+            def __repr__(self):
+                return 'Item'
+
+        items = [Item() for _ in range(100)]
+        result = unique(items, strategy='bloom', max_size=1000, error_rate=0.001)
+
+        self.assertGreater(len(list(result)), 95)
+
+    def test_bloom_with_key(self):
+        result = unique(['a', 'A', 'b'], key=str.lower, strategy='bloom', max_size=10)
+        self.assertListEqual(list(result), ['a', 'b'])
+
+    @parameterized.expand([
+        ({'strategy': 'lossy'},),
+        ({'strategy': 'window'},),
+        ({'strategy': 'bloom', 'max_size': 0},),
+    ])
+    def test_invalid_arguments_raise_ValueError(self, kwargs):
+        with self.assertRaises(ValueError):
+            unique([], **kwargs)
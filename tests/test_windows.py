@@ -0,0 +1,90 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from yapytools.windows import (
+    pairwise,
+    rolling_max,
+    rolling_mean,
+    rolling_min,
+    rolling_sum,
+    windowed,
+)
+
+
+class PairwiseTest(unittest.TestCase):
+    def test(self):
+        self.assertListEqual(
+            list(pairwise('abcd')),
+            [('a', 'b'), ('b', 'c'), ('c', 'd')],
+        )
+
+    @parameterized.expand([([],), ([1],)])
+    def test_fewer_than_two_items_returns_no_pairs(self, items):
+        self.assertListEqual(list(pairwise(items)), [])
+
+
+class WindowedTest(unittest.TestCase):
+    @parameterized.expand([
+        (3, 1, [(0, 1, 2), (1, 2, 3), (2, 3, 4), (3, 4, 5)]),
+        (3, 2, [(0, 1, 2), (2, 3, 4)]),
+        (2, 2, [(0, 1), (2, 3), (4, 5)]),
+        (2, 3, [(0, 1), (3, 4)]),
+        (6, 1, [(0, 1, 2, 3, 4, 5)]),
+        (7, 1, []),
+    ])
+    def test(self, size, step, expected):
+        self.assertListEqual(list(windowed(range(6), size, step)), expected)
+
+    @parameterized.expand([(0, 1), (1, 0)])
+    def test_invalid_arguments_raise_ValueError(self, size, step):
+        with self.assertRaises(ValueError):
+            windowed(range(6), size, step)
+
+
+class RollingTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.values = [rng.randrange(-50, 50) for _ in range(200)]
+
+    def windows(self, size):
+        return [self.values[i:i + size] for i in range(len(self.values) - size + 1)]
+
+    @parameterized.expand([(1,), (3,), (10,), (200,), (201,)])
+    def test_rolling_sum(self, size):
+        self.assertListEqual(
+            list(rolling_sum(self.values, size)),
+            [sum(window) for window in self.windows(size)],
+        )
+
+    @parameterized.expand([(1,), (3,), (10,)])
+    def test_rolling_mean(self, size):
+        self.assertListEqual(
+            list(rolling_mean(self.values, size)),
+            [sum(window) / size for window in self.windows(size)],
+        )
+
+    @parameterized.expand([(1,), (3,), (10,), (200,), (201,)])
+    def test_rolling_min(self, size):
+        self.assertListEqual(
+            list(rolling_min(self.values, size)),
+            [min(window) for window in self.windows(size)],
+        )
+
+    @parameterized.expand([(1,), (3,), (10,), (200,), (201,)])
+    def test_rolling_max(self, size):
+        self.assertListEqual(
+            list(rolling_max(self.values, size)),
+            [max(window) for window in self.windows(size)],
+        )
+
+    @parameterized.expand([
+        (rolling_sum,),
+        (rolling_mean,),
+        (rolling_min,),
+        (rolling_max,),
+    ])
+    def test_invalid_size_raises_ValueError(self, function):
+        with self.assertRaises(ValueError):
+            function(self.values, 0)